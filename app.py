@@ -6,6 +6,8 @@ from routes.usuario_routes import usuario_bp
 from routes.reporte_routes import reporte_bp
 from routes.barcode_routes import barcode_bp
 from routes.categoria_routes import categoria_bp
+from database.cli import db_cli
+from database import instrumentation
 from dotenv import load_dotenv
 from flask_cors import CORS
 
@@ -25,6 +27,9 @@ app.register_blueprint(reporte_bp, url_prefix="/reportes")
 app.register_blueprint(barcode_bp, url_prefix="/barcode")
 app.register_blueprint(categoria_bp, url_prefix="/categorias")
 
+app.cli.add_command(db_cli)
+instrumentation.init_app(app)
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+Los benchmarks escriben en la base indicada en BENCH_MYSQL_DB (o, con
+DB_BACKEND=sqlite, en el archivo BENCH_SQLITE_PATH), que debe ser distinta
+de la de la aplicación: el seeder vacía las tablas antes de generar datos.
+"""
+import functools
+import os
+import statistics
+import subprocess
+import time
+
+from config import DB_BACKEND, MYSQL_CONFIG, SQLITE_CONFIG
+from database.backends import get_backend
+
+
+@functools.cache
+def bench_database():
+    # Se valida una sola vez: use_bench_database() cambia luego la configuración
+    if DB_BACKEND == "sqlite":
+        path = os.getenv("BENCH_SQLITE_PATH")
+        if not path or path == SQLITE_CONFIG["path"]:
+            raise SystemExit("Defina BENCH_SQLITE_PATH con un archivo distinto a SQLITE_PATH")
+        return path
+    database = os.getenv("BENCH_MYSQL_DB")
+    if not database or database == MYSQL_CONFIG["database"]:
+        raise SystemExit("Defina BENCH_MYSQL_DB con una base de pruebas distinta a MYSQL_DB")
+    return database
+
+
+def use_bench_database():
+    """
+    Apunta el pool de la aplicación (database.connection) a la base de
+    benchmarks, para medir los modelos y endpoints tal cual. Debe llamarse
+    antes de la primera conexión.
+    """
+    database = bench_database()
+    if DB_BACKEND == "sqlite":
+        SQLITE_CONFIG["path"] = database
+    else:
+        MYSQL_CONFIG["database"] = database
+    return database
+
+
+def connect():
+    """Conexión directa (fuera del pool) a la base de benchmarks."""
+    use_bench_database()
+    return get_backend().connect()
+
+
+def time_call(fn, repeat, before=None):
+    """
+    Ejecuta `fn` una vez de calentamiento y `repeat` veces medidas.
+    `before` se llama antes de cada ejecución (p. ej. para vaciar cachés).
+    """
+    if before:
+        before()
+    fn()
+    samples = []
+    for _ in range(repeat):
+        if before:
+            before()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)], 2),
+        "mean_ms": round(statistics.fmean(samples), 2),
+        "repeat": repeat,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
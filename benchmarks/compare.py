@@ -0,0 +1,49 @@
+"""
+Compara dos reportes de benchmarks.runner (p50 por escala y caso).
+
+Uso:
+    python -m benchmarks.compare bench-antes.json bench-despues.json
+"""
+import argparse
+import json
+
+
+def _index(report):
+    return {
+        (scale["movimientos"], bench["name"]): bench
+        for scale in report["scales"]
+        for bench in scale["benchmarks"]
+    }
+
+
+def compare(base, head):
+    """Filas (movimientos, caso, p50 base, p50 head, ratio head/base)."""
+    base_index, head_index = _index(base), _index(head)
+    rows = []
+    for key in sorted(set(base_index) & set(head_index)):
+        before = base_index[key].get("p50_ms")
+        after = head_index[key].get("p50_ms")
+        ratio = round(after / before, 2) if before and after is not None else None
+        rows.append((*key, before, after, ratio))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.head, encoding="utf-8") as f:
+        head = json.load(f)
+
+    print(f"{base.get('commit')} -> {head.get('commit')}")
+    print(f"{'movimientos':>12}  {'caso':<45} {'base ms':>10} {'head ms':>10} {'ratio':>7}")
+    for movimientos, name, before, after, ratio in compare(base, head):
+        print(f"{movimientos:>12}  {name:<45} {before!s:>10} {after!s:>10} {ratio!s:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark de la importación masiva de bienes (POST /bienes/import).
+
+Genera la base con el seeder, arma un CSV con `--rows` bienes nuevos y lo
+importa con ImportService, tal como lo hace el endpoint. Emite el reporte
+de la importación (filas_por_segundo incluido):
+
+    BENCH_MYSQL_DB=inventario_bench python -m benchmarks.import_benchmark \\
+        --movements 100000 --rows 20000
+"""
+import argparse
+import csv
+import io
+import json
+
+from werkzeug.datastructures import FileStorage
+
+from benchmarks.common import connect
+from benchmarks.seeder import Seeder, add_arguments, options_from
+
+COLUMNS = ("codigo_patrimonio", "codigo_interno", "detalle_bien", "descripcion", "categoria_id",
+           "marca", "estado", "fecha_asignacion", "ubicacion", "responsable")
+
+
+def build_csv(rows):
+    """CSV de `rows` bienes con códigos que el seeder no genera."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(COLUMNS)
+    for i in range(rows):
+        writer.writerow((f"99{i:010d}", "0001", "SILLA GIRATORIA", "SILLA GIRATORIA COLOR NEGRO", 1,
+                         "GENÉRICO", "BUENO", "2024-03-01", f"OFICINA {i % 40:02d}", f"RESPONSABLE {i % 300:03d}"))
+    return out.getvalue().encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        summary = Seeder(**options_from(args)).seed(conn)
+    finally:
+        conn.close()
+
+    from services.import_service import ImportService
+    file = FileStorage(io.BytesIO(build_csv(args.rows)), filename="bienes.csv")
+    report = ImportService.import_file(file)
+    report["errores"] = report["errores"][:10]
+    print(json.dumps({**summary, "import": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Velocidad de generación de etiquetas de códigos de barras (etiquetas/segundo).
+
+No usa la base de datos: los registros salen del seeder.
+
+    python -m benchmarks.labels --labels 500 --workers 1,4
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import git_commit
+from benchmarks.seeder import Seeder
+from utils.barcode_generator import generate_barcode, generate_barcodes_pdf
+
+TITLE = "INVENTARIO DRE HUÁNUCO - 2025"
+LOGO_PATH = "utils/logo.png"
+
+
+def records(count, offices=5):
+    """Tuplas (codigo, detalle_bien, tipo_registro, oficina) ordenadas por oficina."""
+    seeder = Seeder(offices=offices)
+    rows = []
+    for bien_id in range(1, count + 1):
+        bien = seeder.bien(bien_id)
+        rows.append((bien["codigo_completo"], bien["detalle_bien"], bien["tipo_origen"],
+                     seeder.rnd.choice(seeder.offices)))
+    return sorted(rows, key=lambda row: row[3])
+
+
+def _rate(count, seconds):
+    return {"etiquetas": count, "segundos": round(seconds, 3),
+            "etiquetas_por_segundo": round(count / seconds, 1) if seconds else None}
+
+
+def bench_labels(rows):
+    started = time.perf_counter()
+    for codigo, detalle, tipo, _ in rows:
+        generate_barcode(codigo, title=TITLE, logo_path=LOGO_PATH, detalle_bien=detalle, tipo_registro=tipo)
+    return _rate(len(rows), time.perf_counter() - started)
+
+
+def bench_pdf(rows, **options):
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        output = generate_barcodes_pdf(rows, output_filename=os.path.join(tmp, "etiquetas.pdf"), **options)
+        seconds = time.perf_counter() - started
+        return {**_rate(len(rows), seconds), "bytes": os.path.getsize(output)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", type=int, default=500)
+    parser.add_argument("--workers", default="1",
+                        help="Procesos de renderizado a medir en el PDF, separados por coma")
+    args = parser.parse_args()
+
+    rows = records(args.labels)
+    report = {
+        "commit": git_commit(),
+        "cpus": os.cpu_count(),
+        "generate_barcode": bench_labels(rows),
+        "generate_barcodes_pdf": {
+            f"workers={workers}": bench_pdf(rows, workers=int(workers))
+            for workers in args.workers.split(",")
+        },
+        "generate_barcodes_pdf[vector]": bench_pdf(rows, render_mode="vector"),
+        **{
+            f"generate_barcodes_pdf[{profile}]": bench_pdf(rows, workers=1, render_profile=profile)
+            for profile in ("bilevel", "draft")
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
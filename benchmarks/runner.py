@@ -0,0 +1,173 @@
+"""
+Benchmark de consultas de BienModel/MovimientoModel y de los endpoints.
+
+Para cada escala (número de movimientos) genera los datos con el seeder,
+mide cada caso y emite un JSON comparable entre commits:
+
+    BENCH_MYSQL_DB=inventario_bench python -m benchmarks.runner \\
+        --scales 10000,100000,1000000 --output bench-$(git rev-parse --short HEAD).json
+    python -m benchmarks.compare bench-antes.json bench-despues.json
+
+Los cachés en memoria se vacían antes de cada ejecución, de modo que se
+mide siempre el camino que llega a la base de datos.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+# El token de los endpoints protegidos se firma con SECRET_KEY
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from benchmarks.common import connect, git_commit, time_call, use_bench_database
+from benchmarks.seeder import Seeder, add_arguments, options_from
+
+
+def _clear_caches():
+    from services.count_service import CountService
+    from utils.cache import cache
+    cache.clear()
+    CountService._cache.clear()
+
+
+def _sample(conn):
+    """Valores reales de la base para parametrizar las consultas."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT b.id, b.codigo_completo, ea.ubicacion_actual
+            FROM bienes b JOIN bien_estado_actual ea ON ea.bien_id = b.id
+            WHERE b.deleted_at IS NULL
+            ORDER BY b.id DESC LIMIT 1
+        """)
+        row = cursor.fetchone()
+        cursor.execute("SELECT COUNT(*) AS total FROM bienes WHERE deleted_at IS NULL")
+        total = cursor.fetchone()["total"]
+    return {"bien_id": row["id"], "codigo": row["codigo_completo"],
+            "oficina": row["ubicacion_actual"], "last_page": max(1, total // 20)}
+
+
+def model_cases(sample):
+    from models.bien_model import BienModel
+    from models.movimiento_model import MovimientoModel
+
+    filtros = {"search": None, "categoria": None, "estado": None, "ubicacion": None}
+    return [
+        ("BienModel.get_all", lambda: BienModel.get_all()),
+        ("BienModel.get_stats", lambda: BienModel.get_stats(True)),
+        ("BienModel.get_paginated", lambda: BienModel.get_paginated(1, 20, filtros)),
+        ("BienModel.get_paginated[exact]", lambda: BienModel.get_paginated(1, 20, filtros, 'exact')),
+        ("BienModel.get_paginated[last_page]",
+         lambda: BienModel.get_paginated(sample["last_page"], 20, filtros)),
+        ("BienModel.get_paginated[search]",
+         lambda: BienModel.get_paginated(1, 20, {**filtros, "search": "impresora laser"})),
+        ("BienModel.get_paginated[estado]",
+         lambda: BienModel.get_paginated(1, 20, {**filtros, "estado": "MALO"})),
+        ("BienModel.get_paginated[ubicacion]",
+         lambda: BienModel.get_paginated(1, 20, {**filtros, "ubicacion": sample["oficina"]})),
+        ("BienModel.get_by_cursor", lambda: BienModel.get_by_cursor(None, 20, filtros)),
+        ("BienModel.get_by_id", lambda: BienModel.get_by_id(sample["bien_id"])),
+        ("BienModel.check_existence", lambda: BienModel.check_existence(sample["codigo"])),
+        ("BienModel.get_report_options", lambda: BienModel.get_report_options()),
+        ("BienModel.get_unique_detalles", lambda: BienModel.get_unique_detalles()),
+        ("BienModel.get_for_pdf_report", lambda: BienModel.get_for_pdf_report(estado="MALO")),
+        ("MovimientoModel.get_all", lambda: MovimientoModel.get_all()),
+        ("MovimientoModel.get_by_bien_id", lambda: MovimientoModel.get_by_bien_id(sample["bien_id"])),
+        ("MovimientoModel.get_recent_activity", lambda: MovimientoModel.get_recent_activity()),
+        ("MovimientoModel.get_movements_by_month", lambda: MovimientoModel.get_movements_by_month()),
+    ]
+
+
+def endpoint_cases(sample):
+    from app import app
+    from services.jwt_service import JWTService
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {JWTService.create_token({'id': 1, 'role_id': 1})}"}
+
+    def get(url, auth=True):
+        def call():
+            response = client.get(url, headers=headers if auth else None)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{url}: HTTP {response.status_code}")
+            response.get_data()
+        return call
+
+    oficina = sample["oficina"]
+    return [
+        ("GET /bienes", get("/bienes/")),
+        ("GET /bienes?stream=ndjson", get("/bienes/?stream=ndjson")),
+        ("GET /bienes?page=1", get("/bienes/?page=1&per_page=20")),
+        ("GET /bienes?page=1&search", get("/bienes/?page=1&per_page=20&search=camara")),
+        ("GET /bienes?cursor", get("/bienes/?cursor=&per_page=20")),
+        ("GET /bienes/stats", get("/bienes/stats?breakdown=1")),
+        ("GET /bienes/<id>", get(f"/bienes/{sample['bien_id']}")),
+        ("GET /bienes/verify-code", get(f"/bienes/verify-code?codigo={sample['codigo']}")),
+        ("GET /movimientos", get("/movimientos/")),
+        ("GET /barcode/offices", get("/barcode/offices", auth=False)),
+        ("GET /barcode/bienes", get(f"/barcode/bienes?office={oficina}&page=1&per_page=50", auth=False)),
+        ("GET /reportes/options", get("/reportes/options", auth=False)),
+        ("GET /reportes/movements-chart", get("/reportes/movements-chart", auth=False)),
+    ]
+
+
+def run_scale(movements, seed_options, repeat, only=None, skip_seed=False):
+    conn = connect()
+    try:
+        if skip_seed:
+            summary = {"movimientos": movements, "seed_seconds": None}
+        else:
+            summary = Seeder(**{**seed_options, "movements": movements}).seed(conn)
+        sample = _sample(conn)
+    finally:
+        conn.close()
+
+    results = []
+    for kind, cases in (("model", model_cases(sample)), ("endpoint", endpoint_cases(sample))):
+        for name, fn in cases:
+            if only and only not in name:
+                continue
+            print(f"  {name}...", file=sys.stderr)
+            try:
+                results.append({"name": name, "kind": kind, **time_call(fn, repeat, _clear_caches)})
+            except Exception as e:
+                results.append({"name": name, "kind": kind, "error": str(e)})
+    return {**summary, "benchmarks": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--scales", default="10000,100000,1000000",
+                        help="Movimientos por escala, separados por coma")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="Usa los datos ya cargados (una sola escala)")
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    use_bench_database()
+    seed_options = options_from(args)
+    report = {
+        "commit": git_commit(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "seed_options": seed_options,
+        "scales": [],
+    }
+    for movements in (int(scale) for scale in args.scales.split(",")):
+        print(f"⏱️ Escala {movements} movimientos", file=sys.stderr)
+        report["scales"].append(run_scale(movements, seed_options, args.repeat, args.only, args.skip_seed))
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark de la búsqueda de bienes: LIKE '%term%' vs índice FULLTEXT.
+
+Aplica las migraciones en una base de datos de pruebas (NUNCA la de producción),
+genera los datos con benchmarks.seeder y mide la latencia de ambas consultas.
+
+Uso:
+    BENCH_MYSQL_DB=inventario_bench python -m benchmarks.search_benchmark --movements 400000
+"""
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.common import connect
+from benchmarks.seeder import Seeder
+from database.migrator import Migrator
+from utils.search import search_subquery
+
+TERMS = ["camara", "impresora laser", "74089", "escritorio melamina", "SONY", "reunion"]
+
+
+def _time(cursor, sql, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        count = len(cursor.fetchall())
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "rows": count,
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(sorted(samples)[max(0, int(len(samples) * 0.95) - 1)], 2),
+    }
+
+
+def run(conn, repeat, limit=50):
+    results = []
+    with conn.cursor() as cursor:
+        for term in TERMS:
+            like = f"%{term}%"
+            like_sql = """
+                SELECT b.id FROM bienes b
+                WHERE b.deleted_at IS NULL AND (
+                    b.descripcion LIKE %s OR b.marca LIKE %s OR b.modelo LIKE %s OR
+                    b.codigo_patrimonio LIKE %s OR b.codigo_interno LIKE %s)
+                LIMIT %s
+            """
+            search_sql, search_params = search_subquery(term)
+            fulltext_sql = f"""
+                SELECT b.id FROM bienes b
+                JOIN ({search_sql}) s ON s.bien_id = b.id
+                WHERE b.deleted_at IS NULL
+                ORDER BY s.score DESC, b.id
+                LIMIT %s
+            """
+            results.append({
+                "term": term,
+                "like": _time(cursor, like_sql, [like] * 5 + [limit], repeat),
+                "fulltext": _time(cursor, fulltext_sql, search_params + [limit], repeat),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movements", type=int, default=400000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        if args.skip_seed:
+            Migrator.upgrade(conn)
+            summary = {}
+        else:
+            summary = Seeder(movements=args.movements).seed(conn)
+        print(json.dumps({**summary, "results": run(conn, args.repeat)}, indent=2))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Generador de datos sintéticos para la base de benchmarks.
+
+Crea bienes con un historial de movimientos de longitud variable (primer
+movimiento "Asignación" y luego traslados entre oficinas y responsables),
+y reconstruye las tablas derivadas como lo haría producción.
+
+Uso:
+    BENCH_MYSQL_DB=inventario_bench python -m benchmarks.seeder --movements 100000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import connect
+from database.migrator import Migrator
+from models.bien_estado_model import BienEstadoModel
+from models.bien_model import BienModel
+from models.contador_model import ContadorModel
+from models.data_version_model import DataVersionModel
+
+DETALLES = ["SILLA GIRATORIA", "ESCRITORIO DE MELAMINA", "COMPUTADORA PERSONAL", "IMPRESORA LÁSER",
+            "CÁMARA FOTOGRÁFICA", "ARMARIO METÁLICO", "MESA DE REUNIÓN", "PROYECTOR MULTIMEDIA",
+            "TELÉFONO IP", "ESTANTE DE MADERA", "VENTILADOR", "MÓDULO DE CÓMPUTO"]
+MARCAS = ["HP", "LENOVO", "EPSON", "SONY", "SAMSUNG", "LG", "CANON", "DELL", "GENÉRICO"]
+COLORES = ["NEGRO", "GRIS", "MARRÓN", "AZUL", "BLANCO"]
+CATEGORIAS = ["MOBILIARIO", "EQUIPO DE CÓMPUTO", "EQUIPO DE OFICINA", "AUDIOVISUAL",
+              "COMUNICACIONES", "ELECTRODOMÉSTICOS"]
+NOMBRES = ["LUIS", "MARÍA", "JOSÉ", "ROSA", "CARLOS", "ANA", "JORGE", "ELENA", "PEDRO", "LUCÍA"]
+APELLIDOS = ["QUISPE", "FLORES", "MAMANI", "HUAMÁN", "ROJAS", "NAVARRO", "TORRES", "ARIZA"]
+MODALIDADES = ["CAP", "CAS", "NO REGISTRADO"]
+
+DEFAULTS = {
+    "movements": 10000,
+    "movements_per_bien": 4.0,
+    "offices": 40,
+    "responsables": 300,
+    "estados": {"BUENO": 0.7, "REGULAR": 0.2, "MALO": 0.1},
+    "sobrante_ratio": 0.05,
+    "deleted_ratio": 0.02,
+    "seed": 42,
+}
+
+# Tablas que el seeder vacía (en orden seguro para las claves foráneas)
+_TABLES = ["bien_contadores", "bien_busqueda", "bien_estado_actual",
+           "movimientos", "bienes", "categorias"]
+
+
+class Seeder:
+
+    def __init__(self, **options):
+        unknown = set(options) - set(DEFAULTS)
+        if unknown:
+            raise TypeError(f"Opciones desconocidas: {', '.join(sorted(unknown))}")
+        self.options = {**DEFAULTS, **options}
+        self.rnd = random.Random(self.options["seed"])
+        self.offices = [f"OFICINA {i:03d}" for i in range(1, self.options["offices"] + 1)]
+        self.responsables = [
+            f"{self.rnd.choice(NOMBRES)} {self.rnd.choice(APELLIDOS)} {self.rnd.choice(APELLIDOS)} {i}"
+            for i in range(1, self.options["responsables"] + 1)
+        ]
+
+    def history_lengths(self):
+        """
+        Largo del historial de cada bien: 1 + geométrica, con media
+        `movements_per_bien`, hasta sumar exactamente `movements`.
+        """
+        remaining = self.options["movements"]
+        p = 1 / max(self.options["movements_per_bien"], 1)
+        while remaining > 0:
+            length = 1
+            while self.rnd.random() > p:
+                length += 1
+            length = min(length, remaining)
+            remaining -= length
+            yield length
+
+    def bien(self, bien_id):
+        detalle = self.rnd.choice(DETALLES)
+        sobrante = self.rnd.random() < self.options["sobrante_ratio"]
+        estados = self.options["estados"]
+        bien = {
+            "id": bien_id,
+            "codigo_patrimonio": f"7408{bien_id:08d}",
+            "codigo_interno": f"{self.rnd.randint(1, 9999):04d}",
+            "detalle_bien": detalle,
+            "descripcion": f"{detalle} COLOR {self.rnd.choice(COLORES)}",
+            "categoria_id": self.rnd.randint(1, len(CATEGORIAS)),
+            "marca": self.rnd.choice(MARCAS),
+            "modelo": f"M-{self.rnd.randint(100, 999)}",
+            "tipo_origen": "SOBRANTE" if sobrante else "SIGA",
+            "estado": self.rnd.choices(list(estados), weights=list(estados.values()))[0],
+            "fecha_asignacion": date(2015, 1, 1) + timedelta(days=self.rnd.randint(0, 3000)),
+            "deleted_at": "2024-01-01 00:00:00" if self.rnd.random() < self.options["deleted_ratio"] else None,
+        }
+        bien["codigo_completo"] = BienModel._codigo_completo(bien)
+        return bien
+
+    def history(self, bien, length, first_id):
+        fecha = bien["fecha_asignacion"]
+        rows = []
+        for i in range(length):
+            rows.append((
+                first_id + i,
+                bien["id"],
+                "Asignación" if i == 0 else "Traslado",
+                fecha,
+                self.rnd.choice(self.offices),
+                self.rnd.choice(self.responsables),
+                self.rnd.choice(MODALIDADES),
+                bien["estado"],
+            ))
+            fecha += timedelta(days=self.rnd.randint(0, 120))
+        return rows
+
+    def _reset(self, cursor):
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in _TABLES:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.executemany("INSERT INTO categorias (id, nombre) VALUES (%s, %s)",
+                           list(enumerate(CATEGORIAS, start=1)))
+        DataVersionModel.bump(cursor)
+
+    def _insert(self, cursor, bienes, movimientos):
+        cursor.executemany("""
+            INSERT INTO bienes (id, codigo_patrimonio, codigo_interno, codigo_completo,
+                                detalle_bien, descripcion, categoria_id, marca, modelo,
+                                tipo_origen, estado, fecha_asignacion, deleted_at)
+            VALUES (%(id)s, %(codigo_patrimonio)s, %(codigo_interno)s, %(codigo_completo)s,
+                    %(detalle_bien)s, %(descripcion)s, %(categoria_id)s, %(marca)s, %(modelo)s,
+                    %(tipo_origen)s, %(estado)s, %(fecha_asignacion)s, %(deleted_at)s)
+        """, bienes)
+        cursor.executemany("""
+            INSERT INTO movimientos (id, bien_id, tipo, fecha, ubicacion_actual, responsable,
+                                     modalidad_responsable, estado)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, movimientos)
+
+    def seed(self, conn, batch_size=5000):
+        """Vacía la base de benchmarks y la llena. Retorna un resumen."""
+        started = time.perf_counter()
+        Migrator.upgrade(conn)
+
+        total_bienes = 0
+        total_movimientos = 0
+        with conn.cursor() as cursor:
+            self._reset(cursor)
+            conn.commit()
+
+            bienes, movimientos = [], []
+            for length in self.history_lengths():
+                total_bienes += 1
+                bien = self.bien(total_bienes)
+                bienes.append(bien)
+                movimientos.extend(self.history(bien, length, total_movimientos + 1))
+                total_movimientos += length
+                if len(movimientos) >= batch_size:
+                    self._insert(cursor, bienes, movimientos)
+                    conn.commit()
+                    bienes, movimientos = [], []
+            if bienes:
+                self._insert(cursor, bienes, movimientos)
+                conn.commit()
+
+            # Tablas derivadas, como tras una carga real
+            BienEstadoModel.rebuild(cursor)
+            BienModel.rebuild_search(cursor)
+            ContadorModel.reconcile(cursor)
+            cursor.execute("ANALYZE TABLE bienes, movimientos, bien_estado_actual, bien_busqueda")
+            cursor.fetchall()
+        conn.commit()
+
+        return {
+            "bienes": total_bienes,
+            "movimientos": total_movimientos,
+            "seed_seconds": round(time.perf_counter() - started, 2),
+        }
+
+
+def add_arguments(parser):
+    parser.add_argument("--movements", type=int, default=DEFAULTS["movements"])
+    parser.add_argument("--movements-per-bien", type=float, default=DEFAULTS["movements_per_bien"],
+                        help="Largo medio del historial de cada bien")
+    parser.add_argument("--offices", type=int, default=DEFAULTS["offices"])
+    parser.add_argument("--responsables", type=int, default=DEFAULTS["responsables"])
+    parser.add_argument("--estados", type=json.loads, default=DEFAULTS["estados"],
+                        help='Pesos por estado, p. ej. \'{"BUENO": 0.6, "MALO": 0.4}\'')
+    parser.add_argument("--sobrante-ratio", type=float, default=DEFAULTS["sobrante_ratio"])
+    parser.add_argument("--deleted-ratio", type=float, default=DEFAULTS["deleted_ratio"])
+    parser.add_argument("--seed", type=int, default=DEFAULTS["seed"])
+
+
+def options_from(args):
+    return {key: getattr(args, key) for key in DEFAULTS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        print(json.dumps(Seeder(**options_from(args)).seed(conn), indent=2))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,78 @@ MYSQL_CONFIG = {
     'user': os.getenv('MYSQL_USER'),
     'password': os.getenv('MYSQL_PASSWORD'),
     'database': os.getenv('MYSQL_DB'),
-    'port': int(os.getenv('MYSQL_PORT')),
+    'port': int(os.getenv('MYSQL_PORT', 3306)),
     'cursorclass': 'DictCursor'
 }
 
+# Backend de base de datos: 'mysql' (producción) o 'sqlite' (pruebas, CI,
+# desarrollo local sin servidor). SQLITE_PATH admite ':memory:'.
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+SQLITE_CONFIG = {
+    'path': os.getenv('SQLITE_PATH', 'inventario.sqlite3'),
+}
+
+# Pool de conexiones (uno por proceso/worker de gunicorn)
+DB_POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+    'max_lifetime': int(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+    'ping_interval': float(os.getenv('DB_POOL_PING_INTERVAL', 5)),
+}
+
+# Caché en memoria de catálogos y opciones (por worker). Las opciones que
+# salen de bienes y movimientos llevan la versión de datos en la clave y no
+# quedan desactualizadas entre workers; roles y categorías (que la API no
+# modifica) solo expiran por TTL
+CACHE_CONFIG = {
+    'max_entries': int(os.getenv('CACHE_MAX_ENTRIES', 256)),
+    'ttl': int(os.getenv('CACHE_TTL_SECONDS', 300)),
+}
+
+# Métricas SQL por petición (header Server-Timing) y log de consultas lentas
+SQL_METRICS_CONFIG = {
+    'server_timing': os.getenv('SQL_SERVER_TIMING', '1') == '1',
+    'slow_query_ms': float(os.getenv('SQL_SLOW_QUERY_MS', 500)),
+    'slow_query_log': os.getenv('SQL_SLOW_QUERY_LOG'),
+}
+
+# Generación de etiquetas de códigos de barras: procesos que renderizan en
+# paralelo (0 = uno por CPU, 1 = en serie), etiquetas por tarea del pool,
+# bytes del buffer de envío del PDF que se guardan en memoria antes de
+# pasar a un archivo temporal y puntos por mm de las impresoras térmicas
+# para ZPL/EPL (8 = 203 DPI, 12 = 300 DPI)
+BARCODE_CONFIG = {
+    'workers': int(os.getenv('BARCODE_WORKERS', 0)),
+    'chunk_size': int(os.getenv('BARCODE_CHUNK_SIZE', 35)),
+    'spool_max_size': int(os.getenv('BARCODE_SPOOL_MAX_MB', 8)) * 1024 * 1024,
+    'printer_dpmm': int(os.getenv('LABEL_PRINTER_DPMM', 8)),
+}
+
+# Caché en disco de etiquetas ya renderizadas (compartido entre procesos).
+# LABEL_CACHE_MAX_MB=0 lo desactiva
+LABEL_CACHE_CONFIG = {
+    'directory': os.getenv('LABEL_CACHE_DIR', 'assets/label_cache'),
+    'max_bytes': int(os.getenv('LABEL_CACHE_MAX_MB', 256)) * 1024 * 1024,
+}
+
+# Caché en disco de PDFs de etiquetas completos, por petición y versión de
+# datos. PDF_CACHE_MAX_MB=0 lo desactiva
+PDF_CACHE_CONFIG = {
+    'directory': os.getenv('PDF_CACHE_DIR', 'assets/pdf_cache'),
+    'max_bytes': int(os.getenv('PDF_CACHE_MAX_MB', 512)) * 1024 * 1024,
+}
+
+# Trabajos asíncronos de PDF de códigos de barras: estado y resultado en
+# disco (compartidos entre workers), hilos por proceso, trabajos en cola o en
+# curso admitidos por proceso y vigencia del resultado en segundos
+BARCODE_JOBS_CONFIG = {
+    'directory': os.getenv('BARCODE_JOBS_DIR', 'assets/barcode_jobs'),
+    'workers': int(os.getenv('BARCODE_JOB_WORKERS', 2)),
+    'max_pending': int(os.getenv('BARCODE_JOB_MAX_PENDING', 20)),
+    'ttl': int(os.getenv('BARCODE_JOB_TTL', 3600)),
+}
+
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -1,31 +1,284 @@
-from flask import send_file, request, jsonify
+from flask import Response, send_file, request, jsonify, url_for
 from models.bien_model import BienModel
-from utils.barcode_generator import generate_barcodes_pdf
-from database.connection import get_connection
+from models.bien_estado_model import BienEstadoModel
+from utils.barcode_generator import RENDER_MODES, RENDER_PROFILES, stream_barcodes_pdf
+from utils.label_printer import generate_label_commands
+from database.connection import get_connection, stream_query
+from services.barcode_job_service import BarcodeJobService, JobQueueFullError
+from services.barcode_pdf_cache_service import BarcodePdfCacheService
+from services.count_service import CountService, InvalidCountModeError
+from utils.search import search_subquery
+from utils.pagination import InvalidCursorError, cursor_limit, cursor_page, decode_cursor, keyset_condition
+from utils.streaming import stream_download
 from datetime import datetime
 import os
 
 
 class BarcodeController:
+
+    # Formatos de salida (PDF o comandos para impresoras térmicas) y su
+    # Content-Type completo: se asigna tras crear la respuesta porque Flask
+    # agrega "charset=utf-8" a todo mimetype text/*
+    OUTPUT_FORMATS = {
+        'pdf': 'application/pdf',
+        'zpl': 'text/plain; charset=utf-8',
+        'epl': 'text/plain; charset=windows-1252',
+    }
+
+    @staticmethod
+    def _render_mode(data):
+        """Modo de dibujo pedido en el body ("raster" por defecto o "vector")."""
+        render_mode = (data.get('render_mode') or 'raster').lower()
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"render_mode debe ser uno de: {', '.join(RENDER_MODES)}")
+        return render_mode
+
+    @staticmethod
+    def _render_profile(data):
+        """
+        Perfil del modo raster pedido en el body: "standard" (defecto),
+        "bilevel" (1 bit, para imprimir) o "draft" (150 DPI, vista previa).
+        """
+        render_profile = (data.get('render_profile') or 'standard').lower()
+        if render_profile not in RENDER_PROFILES:
+            raise ValueError(f"render_profile debe ser uno de: {', '.join(RENDER_PROFILES)}")
+        return render_profile
+
+    @staticmethod
+    def _output_options(data):
+        """
+        Opciones de salida pedidas en el body, validadas: render_mode,
+        render_profile y output_format ("pdf" por defecto, "zpl" o "epl").
+        render_profile solo aplica al PDF raster y render_mode solo al PDF.
+        """
+        output_format = (data.get('output_format') or 'pdf').lower()
+        if output_format not in BarcodeController.OUTPUT_FORMATS:
+            raise ValueError(f"output_format debe ser uno de: {', '.join(BarcodeController.OUTPUT_FORMATS)}")
+        if output_format != 'pdf' and data.get('async'):
+            raise ValueError("Los formatos zpl y epl se generan en la petición: no admiten async")
+        render_mode = BarcodeController._render_mode(data)
+        render_profile = BarcodeController._render_profile(data)
+
+        # Opciones sin efecto en la salida pedida se normalizan a su valor
+        # por defecto: salidas idénticas comparten la entrada del caché
+        if output_format != 'pdf':
+            render_mode = 'raster'
+        if output_format != 'pdf' or render_mode != 'raster':
+            render_profile = 'standard'
+        return {
+            'render_mode': render_mode,
+            'render_profile': render_profile,
+            'output_format': output_format,
+        }
+
+    @staticmethod
+    def _job_response(state):
+        """JSON del estado de un trabajo, con las URLs de consulta y descarga."""
+        total = state['total']
+        job = {
+            'id': state['id'],
+            'status': state['status'],
+            'current': state['current'],
+            'total': total,
+            'percent': round(state['current'] * 100 / total, 1) if total else 0,
+            'error': state['error'],
+            'status_url': url_for('barcode_bp.get_barcode_job', job_id=state['id']),
+            'expires_at': datetime.fromtimestamp(state['expires_at']).isoformat(timespec='seconds')
+        }
+        if state['status'] == 'done':
+            job['download_url'] = url_for('barcode_bp.download_barcode_job', job_id=state['id'])
+        return job
+
+    # Columnas de los registros del PDF: (codigo, detalle_bien, tipo_registro, oficina)
+    _RECORD_SELECT = """
+        SELECT 
+            b.codigo_completo,
+            b.detalle_bien,
+            COALESCE(b.tipo_origen, 'SIGA') as tipo_registro,
+            COALESCE(ea.ubicacion_actual, 'SIN UBICACIÓN') as ubicacion_nombre
+    """
+
+    @staticmethod
+    def _offices_query(offices):
+        """(query, from_where) de los registros de `offices`; los parámetros son las oficinas."""
+        # Ubicación actual desde la proyección bien_estado_actual
+        placeholders = ','.join(['%s'] * len(offices))
+        from_where = f"""
+            FROM bienes b
+            LEFT JOIN bien_estado_actual ea ON ea.bien_id = b.id
+            WHERE b.deleted_at IS NULL
+              AND ea.ubicacion_actual IN ({placeholders})
+        """
+        query = BarcodeController._RECORD_SELECT + from_where + """
+            ORDER BY ubicacion_nombre, b.codigo_completo
+        """
+        return query, from_where
+
+    @staticmethod
+    def _filter_query(office, search):
+        """(query, from_where, params) de los registros por oficina y búsqueda."""
+        # Ubicación actual desde la proyección bien_estado_actual
+        from_where = """
+            FROM bienes b
+            LEFT JOIN bien_estado_actual ea ON ea.bien_id = b.id
+        """
+        params = []
+
+        # Búsqueda global (índices FULLTEXT y prefijo de código)
+        if search:
+            search_sql, search_params = search_subquery(search, include_location=True)
+            from_where += f" JOIN ({search_sql}) s ON s.bien_id = b.id"
+            params.extend(search_params)
+
+        from_where += " WHERE b.deleted_at IS NULL"
+
+        # Filtro por oficina
+        if office:
+            from_where += " AND ea.ubicacion_actual = %s"
+            params.append(office)
+
+        query = BarcodeController._RECORD_SELECT + from_where + """ ORDER BY 
+            ea.ubicacion_actual,
+            b.codigo_completo
+        """
+        return query, from_where, params
+
+    @staticmethod
+    def _stream_records(query, params):
+        """
+        Registros para el generador leídos con un cursor del servidor
+        (stream_query): las filas no se acumulan en memoria.
+        """
+        for row in stream_query(query, params):
+            yield (row['codigo_completo'], row['detalle_bien'],
+                   row['tipo_registro'] or 'SIGA', row['ubicacion_nombre'])
+
+    @staticmethod
+    def _count_labels(from_where, params):
+        """Etiquetas que tendrá el PDF: un bien por etiqueta y un separador por oficina."""
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT 
+                        COUNT(*) as bienes,
+                        COUNT(DISTINCT COALESCE(ea.ubicacion_actual, 'SIN UBICACIÓN')) as oficinas
+                    {from_where}
+                """, params)
+                row = cursor.fetchone()
+        finally:
+            conn.close()
+        return row['bienes'] + row['oficinas'] if row['bienes'] else 0
+
+    @staticmethod
+    def _cached_output(data, cache_key, output_filename, options):
+        """
+        Respuesta para un PDF (o ZPL/EPL) ya generado (ver
+        BarcodePdfCacheService): 304 si el cliente envía la misma clave en
+        If-None-Match, el archivo del caché si existe, o None si hay que
+        generarlo. Los trabajos asíncronos siempre generan.
+        """
+        if data.get('async'):
+            return None
+
+        # Estos POST solo consultan: el ETag se respeta como en un GET
+        if request.if_none_match.contains(cache_key):
+            response = Response(status=304)
+            response.set_etag(cache_key)
+            return response
+
+        cached = BarcodePdfCacheService.open(cache_key)
+        if cached is None:
+            return None
+        response = send_file(
+            cached,
+            as_attachment=True,
+            download_name=output_filename,
+            etag=cache_key
+        )
+        response.content_type = BarcodeController.OUTPUT_FORMATS[options['output_format']]
+        return response
+
+    @staticmethod
+    def _labels_response(data, records, output_filename, options, total=None, cache_key=None):
+        """
+        Con "async": true en el body encola un trabajo y responde 202 con su
+        estado; si no, genera el PDF (o los comandos ZPL/EPL) en la
+        petición y lo envía a medida que se escribe, sin archivos
+        compartidos. Con `cache_key` lo enviado se guarda también en el
+        caché de PDFs.
+
+        `records` es una lista o una función que abre el flujo de registros
+        (ver _stream_records), que se consume mientras se genera la salida.
+        """
+        if data.get('async'):
+            state = BarcodeJobService.submit(
+                records, output_filename, options['render_mode'], total, options['render_profile'])
+            return jsonify({
+                'success': True,
+                'job': BarcodeController._job_response(state)
+            }), 202
+
+        records = records() if callable(records) else records
+        if options['output_format'] == 'pdf':
+            chunks = stream_barcodes_pdf(
+                records,
+                render_mode=options['render_mode'],
+                total=total,
+                render_profile=options['render_profile']
+            )
+        else:
+            chunks = generate_label_commands(records, options['output_format'])
+
+        if cache_key is not None:
+            chunks = BarcodePdfCacheService.store(cache_key, chunks)
+        response = stream_download(chunks, output_filename)
+        response.content_type = BarcodeController.OUTPUT_FORMATS[options['output_format']]
+        if cache_key is not None:
+            response.set_etag(cache_key)
+        return response
+
+    @staticmethod
+    def get_job(job_id):
+        """Estado y progreso de un trabajo de generación de PDF."""
+        state = BarcodeJobService.get(job_id)
+        if state is None:
+            return jsonify({
+                'success': False,
+                'error': 'Trabajo no encontrado o vencido'
+            }), 404
+        return jsonify({
+            'success': True,
+            'job': BarcodeController._job_response(state)
+        }), 200
+
+    @staticmethod
+    def download_job(job_id):
+        """Descarga el PDF de un trabajo terminado."""
+        state = BarcodeJobService.get(job_id)
+        if state is None:
+            return jsonify({
+                'success': False,
+                'error': 'Trabajo no encontrado o vencido'
+            }), 404
+        if state['status'] != 'done':
+            return jsonify({
+                'success': False,
+                'error': 'El PDF aún no está listo',
+                'job': BarcodeController._job_response(state)
+            }), 409
+        return send_file(
+            os.path.abspath(BarcodeJobService.result_path(job_id)),
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=state['download_name']
+        )
     
     @staticmethod
     def get_offices():
-        """Obtiene lista única de oficinas desde movimientos.ubicacion_actual."""
+        """Obtiene lista única de oficinas actuales desde bien_estado_actual."""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Obtener ubicaciones únicas de los últimos movimientos
-            cursor.execute("""
-                SELECT DISTINCT ubicacion_actual
-                FROM movimientos
-                WHERE ubicacion_actual IS NOT NULL 
-                  AND ubicacion_actual != ''
-                ORDER BY ubicacion_actual ASC
-            """)
-            
-            offices = [row['ubicacion_actual'] for row in cursor.fetchall()]
-            conn.close()
+            offices = BienEstadoModel.get_offices()
             
             return jsonify({
                 'success': True,
@@ -48,95 +301,82 @@ class BarcodeController:
         - search: Búsqueda global
         - page: Página actual (opcional)
         - per_page: Items por página (opcional)
+        - cursor: Paginación por cursor (opcional). Vacío para la primera
+          página; luego el `next_cursor` de la respuesta anterior.
+        - count: Cálculo del total en modo página: cached (defecto), exact,
+          estimate o none.
         """
         try:
             office = request.args.get('office', '')
             search = request.args.get('search', '')
             page = int(request.args.get('page', 1))
             per_page = int(request.args.get('per_page', 50))
+            cursor_token = request.args.get('cursor')
+            if cursor_token is not None:
+                # Clave de orden: (oficina, código, id)
+                last = decode_cursor(cursor_token, (str, str, int))
+                limit = cursor_limit(per_page)
+            # Total según la estrategia pedida (?count=exact|cached|estimate|none)
+            count_mode = CountService.parse_mode(request.args.get('count'))
             
             conn = get_connection()
             cursor = conn.cursor()
             
-            # Query simplificada: obtener último movimiento por bien_id
-            base_query = """
+            # Ubicación actual desde la proyección bien_estado_actual
+            select_sql = """
                 SELECT 
+                    b.id,
+                    ea.ubicacion_actual,
                     b.codigo_completo,
                     b.codigo_patrimonio,
                     b.codigo_interno,
                     b.detalle_bien,
                     b.descripcion,
-                    COALESCE(
-                        (SELECT ubicacion_actual 
-                         FROM movimientos m 
-                         WHERE m.bien_id = b.id 
-                           AND m.ubicacion_actual IS NOT NULL
-                         ORDER BY m.id DESC 
-                         LIMIT 1),
-                        'SIN UBICACIÓN'
-                    ) as ubicacion_nombre,
+                    COALESCE(ea.ubicacion_actual, 'SIN UBICACIÓN') as ubicacion_nombre,
                     COALESCE(b.tipo_origen, 'SIGA') as fuente,
                     COALESCE(b.tipo_origen, 'SIGA') as tipo_registro
-                FROM bienes b
-                WHERE b.deleted_at IS NULL
             """
-            
-            params = []
-            
-            # Filtro por oficina
-            if office:
-                base_query += """ AND (
-                    SELECT ubicacion_actual 
-                    FROM movimientos m 
-                    WHERE m.bien_id = b.id 
-                      AND m.ubicacion_actual IS NOT NULL
-                    ORDER BY m.id DESC 
-                    LIMIT 1
-                ) = %s"""
-                params.append(office)
-            
-            # Búsqueda global
-            if search:
-                base_query += """ AND (
-                    b.codigo_completo LIKE %s OR
-                    b.codigo_patrimonio LIKE %s OR
-                    b.codigo_interno LIKE %s OR
-                    b.detalle_bien LIKE %s OR
-                    b.descripcion LIKE %s OR
-                    (SELECT ubicacion_actual 
-                     FROM movimientos m 
-                     WHERE m.bien_id = b.id 
-                       AND m.ubicacion_actual IS NOT NULL
-                     ORDER BY m.id DESC 
-                     LIMIT 1) LIKE %s
-                )"""
-                search_param = f"%{search}%"
-                params.extend([search_param] * 6)
-            
-            # Ordenar por ubicación y código
-            base_query += """ ORDER BY 
-                (SELECT ubicacion_actual 
-                 FROM movimientos m 
-                 WHERE m.bien_id = b.id 
-                   AND m.ubicacion_actual IS NOT NULL
-                 ORDER BY m.id DESC 
-                 LIMIT 1),
-                b.codigo_completo
-            """
-            
-            # Ejecutar query completa para contar total
-            cursor.execute(base_query, params)
-            all_results = cursor.fetchall()
-            total = len(all_results)
-            
-            # Paginación
-            offset = (page - 1) * per_page
-            paginated_query = base_query + f" LIMIT %s OFFSET %s"
-            params.extend([per_page, offset])
-            
-            cursor.execute(paginated_query, params)
-            rows = cursor.fetchall()
-            conn.close()
+            _, from_where, params = BarcodeController._filter_query(office, search)
+            
+            if cursor_token is not None:
+                # Keyset: continuar después de la última fila entregada
+                order_columns = ["COALESCE(ea.ubicacion_actual, '')", "COALESCE(b.codigo_completo, '')", "b.id"]
+                query = select_sql + from_where
+                if last is not None:
+                    keyset_sql, keyset_params = keyset_condition(order_columns, last)
+                    query += f" AND {keyset_sql}"
+                    params.extend(keyset_params)
+                query += f" ORDER BY {', '.join(order_columns)} LIMIT %s"
+                params.append(limit)
+
+                cursor.execute(query, params)
+                rows, pagination = cursor_page(
+                    cursor.fetchall(), per_page,
+                    key=lambda row: [row['ubicacion_actual'] or '', row['codigo_completo'] or '', row['id']])
+                conn.close()
+            else:
+                total = CountService.total(cursor, 'barcode_bienes', from_where, params, count_mode)
+                
+                # Paginación, ordenada por ubicación y código
+                offset = (page - 1) * per_page
+                paginated_query = select_sql + from_where + """ ORDER BY 
+                    ea.ubicacion_actual,
+                    b.codigo_completo,
+                    b.id
+                    LIMIT %s OFFSET %s
+                """
+                
+                cursor.execute(paginated_query, params + [per_page, offset])
+                rows = cursor.fetchall()
+                conn.close()
+
+                pagination = {
+                    'total': total,
+                    'page': page,
+                    'per_page': per_page,
+                    'total_pages': (total + per_page - 1) // per_page if total is not None else None,
+                    'count_mode': count_mode
+                }
             
             bienes = []
             for row in rows:
@@ -154,14 +394,14 @@ class BarcodeController:
             return jsonify({
                 'success': True,
                 'data': bienes,
-                'pagination': {
-                    'total': total,
-                    'page': page,
-                    'per_page': per_page,
-                    'total_pages': (total + per_page - 1) // per_page
-                }
+                'pagination': pagination
             }), 200
             
+        except (InvalidCursorError, InvalidCountModeError) as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -183,12 +423,17 @@ class BarcodeController:
                     "oficina": "..."
                 },
                 ...
-            ]
+            ],
+            "render_mode": "vector",  // opcional: raster (defecto) o vector
+            "render_profile": "bilevel",  // opcional (raster): standard, bilevel o draft
+            "output_format": "zpl",   // opcional: pdf (defecto), zpl o epl (impresoras térmicas)
+            "async": true             // opcional: responde 202 con un trabajo (ver get_job)
         }
         """
         try:
             data = request.json
             bienes = data.get('bienes', [])
+            options = BarcodeController._output_options(data)
             
             if not bienes:
                 return jsonify({
@@ -208,21 +453,27 @@ class BarcodeController:
             
             # Generar PDF
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"seleccion_personalizada_{timestamp}.pdf"
+            output_filename = f"seleccion_personalizada_{timestamp}.{options['output_format']}"
             
-            pdf_path = generate_barcodes_pdf(
-                records=records,
-                output_filename=output_filename,
-                selected_office="SELECCION_PERSONALIZADA"
-            )
+            # Los registros vienen completos en el body: no depende de la versión de datos
+            cache_key = BarcodePdfCacheService.key('selection', records, options, versioned=False)
+            cached = BarcodeController._cached_output(data, cache_key, output_filename, options)
+            if cached is not None:
+                return cached
             
-            return send_file(
-                pdf_path,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=output_filename
-            )
+            return BarcodeController._labels_response(
+                data, records, output_filename, options, cache_key=cache_key)
             
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        except JobQueueFullError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -236,12 +487,17 @@ class BarcodeController:
         
         POST body:
         {
-            "offices": ["Oficina 1", "Oficina 2", ...]
+            "offices": ["Oficina 1", "Oficina 2", ...],
+            "render_mode": "vector",  // opcional: raster (defecto) o vector
+            "render_profile": "bilevel",  // opcional (raster): standard, bilevel o draft
+            "output_format": "zpl",   // opcional: pdf (defecto), zpl o epl (impresoras térmicas)
+            "async": true             // opcional: responde 202 con un trabajo (ver get_job)
         }
         """
         try:
             data = request.json
             offices = data.get('offices', [])
+            options = BarcodeController._output_options(data)
             
             if not offices:
                 return jsonify({
@@ -249,69 +505,42 @@ class BarcodeController:
                     'error': 'No se proporcionaron oficinas para generar'
                 }), 400
             
-            conn = get_connection()
-            cursor = conn.cursor()
+            query, from_where = BarcodeController._offices_query(offices)
             
-            # Query con subconsulta para último movimiento
-            placeholders = ','.join(['%s'] * len(offices))
-            query = f"""
-                SELECT 
-                    b.codigo_completo,
-                    b.detalle_bien,
-                    COALESCE(b.tipo_origen, 'SIGA') as tipo_registro,
-                    COALESCE(
-                        (SELECT ubicacion_actual 
-                         FROM movimientos m 
-                         WHERE m.bien_id = b.id 
-                           AND m.ubicacion_actual IS NOT NULL
-                         ORDER BY m.id DESC 
-                         LIMIT 1),
-                        'SIN UBICACIÓN'
-                    ) as ubicacion_nombre
-                FROM bienes b
-                WHERE b.deleted_at IS NULL
-                  AND (SELECT ubicacion_actual 
-                       FROM movimientos m 
-                       WHERE m.bien_id = b.id 
-                         AND m.ubicacion_actual IS NOT NULL
-                       ORDER BY m.id DESC 
-                       LIMIT 1) IN ({placeholders})
-                ORDER BY ubicacion_nombre, b.codigo_completo
-            """
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            office_label = "_".join(offices[:3]) if len(offices) <= 3 else "SELECCION_MULTIPLE"
+            output_filename = f"oficinas_{office_label}_{timestamp}.{options['output_format']}"
             
-            cursor.execute(query, offices)
-            rows = cursor.fetchall()
-            conn.close()
+            # El orden de las oficinas en el body no cambia el PDF
+            cache_key = BarcodePdfCacheService.key('offices', sorted(set(offices)), options)
+            cached = BarcodeController._cached_output(data, cache_key, output_filename, options)
+            if cached is not None:
+                return cached
             
-            if not rows:
+            total = BarcodeController._count_labels(from_where, offices)
+            if not total:
                 return jsonify({
                     'success': False,
                     'error': 'No se encontraron bienes para las oficinas seleccionadas'
                 }), 404
             
-            # Preparar registros
-            records = [(row['codigo_completo'], row['detalle_bien'], 
-                       row['tipo_registro'] or 'SIGA', row['ubicacion_nombre']) 
-                      for row in rows]
-            
-            # Generar PDF
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            office_label = "_".join(offices[:3]) if len(offices) <= 3 else "SELECCION_MULTIPLE"
-            output_filename = f"oficinas_{office_label}_{timestamp}.pdf"
-            
-            pdf_path = generate_barcodes_pdf(
-                records=records,
-                output_filename=output_filename,
-                selected_office=office_label
-            )
+            # Los registros se leen recién al generar el PDF
+            def records():
+                return BarcodeController._stream_records(query, offices)
             
-            return send_file(
-                pdf_path,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=output_filename
-            )
+            return BarcodeController._labels_response(
+                data, records, output_filename, options, total, cache_key)
             
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        except JobQueueFullError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -326,109 +555,56 @@ class BarcodeController:
         POST body:
         {
             "office": "...",  // opcional
-            "search": "..."   // opcional
+            "search": "...",  // opcional
+            "render_mode": "vector",  // opcional: raster (defecto) o vector
+            "render_profile": "bilevel",  // opcional (raster): standard, bilevel o draft
+            "output_format": "zpl",   // opcional: pdf (defecto), zpl o epl (impresoras térmicas)
+            "async": true             // opcional: responde 202 con un trabajo (ver get_job)
         }
         """
         try:
             data = request.json
             office = data.get('office', '')
             search = data.get('search', '')
+            options = BarcodeController._output_options(data)
             
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Base query con subconsulta para último movimiento
-            query = """
-                SELECT 
-                    b.codigo_completo,
-                    b.detalle_bien,
-                    COALESCE(b.tipo_origen, 'SIGA') as tipo_registro,
-                    COALESCE(
-                        (SELECT ubicacion_actual 
-                         FROM movimientos m 
-                         WHERE m.bien_id = b.id 
-                           AND m.ubicacion_actual IS NOT NULL
-                         ORDER BY m.id DESC 
-                         LIMIT 1),
-                        'SIN UBICACIÓN'
-                    ) as ubicacion_nombre
-                FROM bienes b
-                WHERE b.deleted_at IS NULL
-            """
-            
-            params = []
-            
-            # Filtro por oficina
-            if office:
-                query += """ AND (
-                    SELECT ubicacion_actual 
-                    FROM movimientos m 
-                    WHERE m.bien_id = b.id 
-                      AND m.ubicacion_actual IS NOT NULL
-                    ORDER BY m.id DESC 
-                    LIMIT 1
-                ) = %s"""
-                params.append(office)
+            query, from_where, params = BarcodeController._filter_query(office, search)
             
-            # Búsqueda global
-            if search:
-                query += """ AND (
-                    b.codigo_completo LIKE %s OR
-                    b.detalle_bien LIKE %s OR
-                    b.descripcion LIKE %s OR
-                    (SELECT ubicacion_actual 
-                     FROM movimientos m 
-                     WHERE m.bien_id = b.id 
-                       AND m.ubicacion_actual IS NOT NULL
-                     ORDER BY m.id DESC 
-                     LIMIT 1) LIKE %s
-                )"""
-                search_param = f"%{search}%"
-                params.extend([search_param] * 4)
-            
-            query += """ ORDER BY 
-                (SELECT ubicacion_actual 
-                 FROM movimientos m 
-                 WHERE m.bien_id = b.id 
-                   AND m.ubicacion_actual IS NOT NULL
-                 ORDER BY m.id DESC 
-                 LIMIT 1),
-                b.codigo_completo
-            """
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            office_label = office if office else "TODOS"
+            output_filename = f"filtro_{office_label}_{timestamp}.{options['output_format']}"
             
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            conn.close()
+            # Los espacios al borde de la búsqueda no cambian el PDF
+            cache_key = BarcodePdfCacheService.key(
+                'filter', {'office': office, 'search': search.strip()}, options)
+            cached = BarcodeController._cached_output(data, cache_key, output_filename, options)
+            if cached is not None:
+                return cached
             
-            if not rows:
+            total = BarcodeController._count_labels(from_where, params)
+            if not total:
                 return jsonify({
                     'success': False,
                     'error': 'No se encontraron bienes con los filtros aplicados'
                 }), 404
             
-            # Preparar registros
-            records = [(row['codigo_completo'], row['detalle_bien'], 
-                       row['tipo_registro'] or 'SIGA', row['ubicacion_nombre']) 
-                      for row in rows]
-            
-            # Generar PDF
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            office_label = office if office else "TODOS"
-            output_filename = f"filtro_{office_label}_{timestamp}.pdf"
-            
-            pdf_path = generate_barcodes_pdf(
-                records=records,
-                output_filename=output_filename,
-                selected_office=office_label
-            )
+            # Los registros se leen recién al generar el PDF
+            def records():
+                return BarcodeController._stream_records(query, params)
             
-            return send_file(
-                pdf_path,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=output_filename
-            )
+            return BarcodeController._labels_response(
+                data, records, output_filename, options, total, cache_key)
             
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        except JobQueueFullError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 503
         except Exception as e:
             return jsonify({
                 'success': False,
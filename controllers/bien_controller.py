@@ -2,6 +2,11 @@ from flask import jsonify, request
 from models.bien_model import BienModel
 from models.movimiento_model import MovimientoModel
 from utils.auth_middleware import auth_required
+from utils.cache import cache
+from utils.pagination import InvalidCursorError
+from services.count_service import CountService, InvalidCountModeError
+from services.import_service import ImportService, ImportFormatError
+from utils.streaming import parse_stream_format, stream_rows
 
 class BienController:
 
@@ -10,6 +15,7 @@ class BienController:
     def index():
         page = request.args.get('page', type=int)
         per_page = request.args.get('per_page', default=10, type=int)
+        cursor = request.args.get('cursor')
         
         filters = {
             'search': request.args.get('search'),
@@ -18,9 +24,21 @@ class BienController:
             'ubicacion': request.args.get('ubicacion')
         }
 
-        if page:
-            bienes = BienModel.get_paginated(page, per_page, filters)
+        if cursor is not None:
+            try:
+                bienes = BienModel.get_by_cursor(cursor, per_page, filters)
+            except InvalidCursorError as e:
+                return jsonify({"message": str(e)}), 400
+        elif page:
+            try:
+                count_mode = CountService.parse_mode(request.args.get('count'))
+            except InvalidCountModeError as e:
+                return jsonify({"message": str(e)}), 400
+            bienes = BienModel.get_paginated(page, per_page, filters, count_mode)
         else:
+            stream_format = parse_stream_format(request.args.get('stream'))
+            if stream_format:
+                return stream_rows(BienModel.stream_all(), stream_format)
             bienes = BienModel.get_all()
             
         return jsonify(bienes)
@@ -43,7 +61,12 @@ class BienController:
     @staticmethod
     @auth_required(roles=[1, 2]) 
     def stats():
-        stats = BienModel.get_stats()
+        breakdown = request.args.get('breakdown', default=0, type=int) == 1
+        stats = BienModel.get_stats(breakdown)
+        # ?cache=1: aciertos, fallos e invalidaciones del caché en memoria
+        # de este worker, por namespace
+        if request.args.get('cache', default=0, type=int) == 1:
+            stats = {**stats, "cache": cache.stats()}
         return jsonify(stats)
 
     @staticmethod
@@ -63,6 +86,20 @@ class BienController:
         BienModel.create(data)
         return jsonify({"message": "Bien creado exitosamente"}), 201
     
+    @staticmethod
+    @auth_required(roles=[1, 2])
+    def import_bienes():
+        file = request.files.get('file')
+        if not file or not file.filename:
+            return jsonify({"message": "Archivo requerido (campo 'file')"}), 400
+
+        try:
+            report = ImportService.import_file(file)
+        except ImportFormatError as e:
+            return jsonify({"message": str(e)}), 400
+
+        return jsonify(report), 200
+
     @staticmethod    
     @auth_required(roles=[1, 2])
     def update(id):
@@ -1,12 +1,16 @@
 from flask import jsonify, request
 from models.movimiento_model import MovimientoModel
 from utils.auth_middleware import auth_required
+from utils.streaming import parse_stream_format, stream_rows
 
 class MovimientoController:
 
     @staticmethod
     @auth_required(roles=[1, 2]) 
     def index():
+        stream_format = parse_stream_format(request.args.get('stream'))
+        if stream_format:
+            return stream_rows(MovimientoModel.stream_all(), stream_format)
         movimientos = MovimientoModel.get_all()
         return jsonify(movimientos)
 
@@ -27,6 +31,22 @@ class MovimientoController:
             return jsonify({"message": result.get("message")}), 201
         return jsonify({"message": result.get("error")}), 500
     
+    @staticmethod
+    @auth_required(roles=[1, 2])
+    def store_bulk():
+        data = request.get_json() or {}
+        result = MovimientoModel.create_bulk(data)
+        if result.get("success"):
+            return jsonify({
+                "message": result.get("message"),
+                "total": result.get("total"),
+                "no_encontrados": result.get("no_encontrados")
+            }), 201
+        return jsonify({
+            "message": result.get("error"),
+            "no_encontrados": result.get("no_encontrados", [])
+        }), result.get("status", 500)
+
     @staticmethod    
     @auth_required(roles=[1, 2])
     def update(id):
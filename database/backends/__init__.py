@@ -0,0 +1,25 @@
+"""
+Backends de base de datos.
+
+Cada backend es un módulo con la misma interfaz:
+
+- NAME, SUPPORTS_FULLTEXT, SUPPORTS_EXPLAIN, LIKE_ESCAPE
+- connect(): conexión nueva con cursores que retornan diccionarios
+- stream_cursor(conn): cursor para iterar resultados grandes (stream_query)
+- pool_options(): ajustes del pool propios del backend
+- table_exists / column_exists / index_exists / drop_index_sql: usados
+  por las migraciones
+
+Los modelos escriben SQL de MySQL con parámetros %s; el backend SQLite lo
+traduce (ver database/backends/sqlite.py). Se elige con DB_BACKEND.
+"""
+
+from config import DB_BACKEND
+
+
+def get_backend():
+    if DB_BACKEND == 'sqlite':
+        from database.backends import sqlite as backend
+    else:
+        from database.backends import mysql as backend
+    return backend
@@ -0,0 +1,61 @@
+"""Backend de producción: MySQL/MariaDB vía PyMySQL."""
+
+import pymysql
+
+from config import MYSQL_CONFIG
+from database.instrumentation import InstrumentedDictCursor, InstrumentedSSDictCursor
+
+NAME = 'mysql'
+SUPPORTS_FULLTEXT = True
+SUPPORTS_EXPLAIN = True
+# En MySQL la barra invertida ya es el carácter de escape de LIKE
+LIKE_ESCAPE = ''
+
+
+def connect():
+    return pymysql.connect(
+        host=MYSQL_CONFIG["host"],
+        user=MYSQL_CONFIG["user"],
+        password=MYSQL_CONFIG["password"],
+        database=MYSQL_CONFIG["database"],
+        port=MYSQL_CONFIG["port"],
+        cursorclass=InstrumentedDictCursor
+    )
+
+
+def stream_cursor(conn):
+    """Cursor sin buffer: las filas se leen del socket a medida que se piden."""
+    return conn.cursor(InstrumentedSSDictCursor)
+
+
+def pool_options():
+    return {}
+
+
+def table_exists(cursor, table):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))
+    return cursor.fetchone() is not None
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone() is not None
+
+
+def index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index))
+    return cursor.fetchone() is not None
+
+
+def drop_index_sql(table, index):
+    return f"DROP INDEX {index} ON {table}"
@@ -0,0 +1,271 @@
+"""
+Backend local: SQLite (archivo o ':memory:'), sin servicios externos.
+
+Pensado para pruebas, CI y ejecutar la aplicación en una laptop. Los
+modelos siguen escribiendo SQL de MySQL; aquí se traduce lo necesario:
+
+- parámetros %s / %(nombre)s -> ? / :nombre
+- CREATE TABLE de las migraciones (AUTO_INCREMENT, ENGINE, KEY ...)
+- INSERT IGNORE, ON DUPLICATE KEY UPDATE, FOR UPDATE, TRUNCATE, ...
+- NOW(), YEAR(), MONTH() y CURRENT_DATE() como funciones registradas
+
+Sin FULLTEXT ni EXPLAIN de MySQL: la búsqueda usa LIKE por palabra (ver
+utils.search) y el conteo 'estimate' cae en 'cached'.
+"""
+
+import functools
+import re
+import sqlite3
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from config import SQLITE_CONFIG
+from database.instrumentation import record_statement
+
+NAME = 'sqlite'
+SUPPORTS_FULLTEXT = False
+SUPPORTS_EXPLAIN = False
+LIKE_ESCAPE = " ESCAPE '\\'"
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+sqlite3.register_adapter(Decimal, str)
+
+
+def _year(value):
+    return int(str(value)[:4]) if value else None
+
+
+def _month(value):
+    return int(str(value)[5:7]) if value else None
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+_FUNCTIONS = [('YEAR', 1, _year), ('MONTH', 1, _month), ('NOW', 0, _now)]
+
+
+# --- Traducción de SQL -----------------------------------------------------
+
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s|%s|%%")
+
+_REWRITES = [
+    (re.compile(r"\bCURRENT_DATE\(\)", re.I), "DATE('now', 'localtime')"),
+    (re.compile(r"\s+FOR UPDATE\b", re.I), ""),
+    (re.compile(r"\bINSERT IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"^\s*TRUNCATE TABLE\s+(\w+)", re.I), r"DELETE FROM \1"),
+    (re.compile(r"^\s*SET FOREIGN_KEY_CHECKS\s*=\s*0\s*$", re.I), "PRAGMA foreign_keys = OFF"),
+    (re.compile(r"^\s*SET FOREIGN_KEY_CHECKS\s*=\s*1\s*$", re.I), "PRAGMA foreign_keys = ON"),
+    (re.compile(r"^\s*ANALYZE TABLE\b.*$", re.I | re.S), "ANALYZE"),
+]
+
+_ON_DUPLICATE = re.compile(r"\bON DUPLICATE KEY UPDATE\b", re.I)
+_VALUES_REF = re.compile(r"\bVALUES\((\w+)\)", re.I)
+
+_CREATE_TABLE = re.compile(
+    r"^\s*CREATE TABLE (IF NOT EXISTS )?(\w+)\s*\((.*)\)\s*(ENGINE\b.*)?$", re.I | re.S)
+_TABLE_KEY = re.compile(r"^(UNIQUE |FULLTEXT )?KEY (\w+) \((.*)\)$", re.I | re.S)
+
+
+def _placeholder(match):
+    if match.group(1):
+        return f":{match.group(1)}"
+    return '?' if match.group(0) == '%s' else '%'
+
+
+def _split_top_level(body):
+    """Separa las definiciones de un CREATE TABLE por las comas de nivel 0."""
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        depth += (char == '(') - (char == ')')
+        current.append(char)
+    parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _create_table(match):
+    """CREATE TABLE de MySQL -> CREATE TABLE + CREATE INDEX de SQLite."""
+    if_not_exists, table, body = match.group(1) or '', match.group(2), match.group(3)
+    columns, indexes = [], []
+    for part in _split_top_level(body):
+        key = _TABLE_KEY.match(part)
+        if key:
+            kind = (key.group(1) or '').strip().upper()
+            if kind != 'FULLTEXT':
+                unique = 'UNIQUE ' if kind == 'UNIQUE' else ''
+                indexes.append(
+                    f"CREATE {unique}INDEX IF NOT EXISTS {key.group(2)} ON {table} ({key.group(3)})")
+            continue
+        part = re.sub(r"\bINT NOT NULL AUTO_INCREMENT PRIMARY KEY\b",
+                      "INTEGER PRIMARY KEY AUTOINCREMENT", part, flags=re.I)
+        part = re.sub(r"\s+ON UPDATE CURRENT_TIMESTAMP\b", "", part, flags=re.I)
+        columns.append(part)
+    return [f"CREATE TABLE {if_not_exists}{table} ({', '.join(columns)})"] + indexes
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(sql):
+    """Traduce una sentencia de MySQL a una o más sentencias de SQLite."""
+    create = _CREATE_TABLE.match(sql)
+    if create:
+        return tuple(_create_table(create))
+
+    sql = _PLACEHOLDER.sub(_placeholder, sql)
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+
+    duplicate = _ON_DUPLICATE.search(sql)
+    if duplicate:
+        updates = _VALUES_REF.sub(r"excluded.\1", sql[duplicate.end():])
+        sql = f"{sql[:duplicate.start()]}ON CONFLICT DO UPDATE SET{updates}"
+    return (sql,)
+
+
+def _params(params):
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return params
+    return tuple(params)
+
+
+# --- Conexión y cursor con la interfaz de PyMySQL --------------------------
+
+class Cursor:
+    """Cursor de SQLite que acepta el SQL de MySQL y retorna diccionarios."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    @property
+    def rowcount(self):
+        return self._raw.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._raw.lastrowid
+
+    @property
+    def description(self):
+        return self._raw.description
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            for statement in translate(query):
+                self._raw.execute(statement, _params(args))
+            return self._raw.rowcount
+        finally:
+            record_statement(query, time.perf_counter() - started, max(self._raw.rowcount, 0))
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            statement, = translate(query)
+            self._raw.executemany(statement, [_params(row) for row in args])
+            return self._raw.rowcount
+        finally:
+            record_statement(query, time.perf_counter() - started, max(self._raw.rowcount, 0))
+
+    def fetchone(self):
+        return self._raw.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._raw.fetchmany(size or self._raw.arraysize)
+
+    def fetchall(self):
+        return self._raw.fetchall()
+
+    def close(self):
+        self._raw.close()
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class Connection:
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self, cursorclass=None):
+        return Cursor(self._raw.cursor())
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        self._raw.close()
+
+    def ping(self, reconnect=False):
+        self._raw.execute("SELECT 1")
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _in_memory():
+    return SQLITE_CONFIG['path'] == ':memory:'
+
+
+def connect():
+    raw = sqlite3.connect(SQLITE_CONFIG['path'], timeout=30, check_same_thread=False)
+    raw.row_factory = _dict_row
+    for name, arity, func in _FUNCTIONS:
+        raw.create_function(name, arity, func)
+    raw.execute("PRAGMA foreign_keys = ON")
+    if not _in_memory():
+        raw.execute("PRAGMA journal_mode = WAL")
+    return Connection(raw)
+
+
+def stream_cursor(conn):
+    # Los cursores de SQLite ya leen las filas bajo demanda
+    return conn.cursor()
+
+
+def pool_options():
+    # Una base ':memory:' vive en su única conexión: no abrir otras ni reciclarla
+    if _in_memory():
+        return {'min_size': 1, 'max_size': 1, 'max_lifetime': 0}
+    return {}
+
+
+def table_exists(cursor, table):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+    return cursor.fetchone() is not None
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("SELECT 1 FROM pragma_table_info(%s) WHERE name = %s", (table, column))
+    return cursor.fetchone() is not None
+
+
+def index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = %s AND name = %s
+    """, (table, index))
+    return cursor.fetchone() is not None
+
+
+def drop_index_sql(table, index):
+    return f"DROP INDEX {index}"
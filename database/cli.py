@@ -0,0 +1,99 @@
+import click
+from flask.cli import AppGroup
+
+from database.backends import get_backend
+from database.connection import get_connection
+from database.explain_check import ExplainCheck
+from database.migrator import Migrator
+from models.bien_estado_model import BienEstadoModel
+from models.bien_model import BienModel
+from models.contador_model import ContadorModel
+
+db_cli = AppGroup('db', help='Tareas de mantenimiento de la base de datos.')
+
+
+def _echo_migration(verbo):
+    return lambda migration: click.echo(f"{verbo} {migration.version} {migration.nombre}")
+
+
+@db_cli.command('upgrade')
+@click.argument('target', required=False)
+def upgrade(target):
+    """Aplica las migraciones pendientes (hasta TARGET, p. ej. v002)."""
+    with get_connection() as conn:
+        done = Migrator.upgrade(conn, target, on_apply=_echo_migration("⬆️"))
+    click.echo(f"✅ Esquema actualizado ({len(done)} migraciones aplicadas)")
+
+
+@db_cli.command('downgrade')
+@click.argument('target', required=False)
+def downgrade(target):
+    """Revierte la última migración, o todas las posteriores a TARGET."""
+    with get_connection() as conn:
+        done = Migrator.downgrade(conn, target, on_apply=_echo_migration("⬇️"))
+    click.echo(f"✅ {len(done)} migraciones revertidas")
+
+
+@db_cli.command('status')
+def status():
+    """Lista las migraciones y si están aplicadas."""
+    with get_connection() as conn:
+        for migration, applied in Migrator.status(conn):
+            click.echo(f"{'✅' if applied else '⏳'} {migration.version} {migration.nombre}")
+
+
+@db_cli.command('explain-check')
+@click.option('--verbose', is_flag=True, help='Muestra el plan de cada consulta.')
+def explain_check(verbose):
+    """Verifica con EXPLAIN que las consultas frecuentes usan índices."""
+    if not get_backend().SUPPORTS_EXPLAIN:
+        click.echo(f"⚠️ explain-check solo está disponible con MySQL (backend actual: {get_backend().NAME})")
+        return
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            results = ExplainCheck.run(cursor)
+
+    for result in results:
+        if result['ok']:
+            click.echo(f"✅ {result['nombre']}")
+        else:
+            click.echo(f"❌ {result['nombre']}: recorrido completo de {', '.join(result['full_scans'])}")
+        if verbose:
+            for row in result['plan']:
+                click.echo(f"     {row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')}")
+
+    if not all(result['ok'] for result in results):
+        raise SystemExit(1)
+
+
+@db_cli.command('rebuild-estado')
+def rebuild_estado():
+    """Reconstruye bien_estado_actual desde la tabla movimientos."""
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            total = BienEstadoModel.rebuild(cursor)
+            ContadorModel.reconcile(cursor)
+        conn.commit()
+    click.echo(f"✅ bien_estado_actual reconstruida: {total} bienes")
+
+
+@db_cli.command('rebuild-search')
+def rebuild_search():
+    """Recalcula el índice de búsqueda (bien_busqueda) de todos los bienes."""
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            total = BienModel.rebuild_search(cursor)
+        conn.commit()
+    click.echo(f"✅ bien_busqueda reconstruida: {total} bienes")
+
+
+@db_cli.command('reconcile-stats')
+def reconcile_stats():
+    """Recalcula los contadores del dashboard y corrige desviaciones."""
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            drift = ContadorModel.reconcile(cursor)
+        conn.commit()
+    for d in drift:
+        click.echo(f"⚠️ {d['dimension']}[{d['clave']}]: {d['actual']} -> {d['esperado']}")
+    click.echo(f"✅ Contadores reconciliados ({len(drift)} corregidos)")
@@ -1,12 +1,278 @@
-import pymysql
-from config import MYSQL_CONFIG
+import os
+import threading
+import time
+from collections import deque
+
+from config import DB_POOL_CONFIG
+from database.backends import get_backend
+from database.instrumentation import record_connection
+
+
+class PoolTimeoutError(Exception):
+    """No se pudo obtener una conexión del pool dentro del tiempo de espera."""
+
+
+def _connect():
+    return get_backend().connect()
+
+
+class PooledConnection:
+    """
+    Conexión prestada por el pool.
+
+    Ofrece la misma interfaz que la conexión del backend (cursor, commit,
+    rollback, ...), pero `close()` la devuelve al pool en lugar de cerrarla.
+    También puede usarse como context manager:
+
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                ...
+            conn.commit()
+
+    Al salir del bloque con una excepción se hace rollback, y en todos los
+    casos la conexión vuelve al pool.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._last_used = time.monotonic()
+        self._in_use = False
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        if self._in_use:
+            self._in_use = False
+            self._pool.release(self)
+
+    def discard(self):
+        """Cierra el socket en vez de devolverlo (p. ej. un cursor sin leer)."""
+        if self._in_use:
+            self._in_use = False
+            self._pool.discard(self)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            try:
+                self._raw.rollback()
+            except Exception:
+                pass
+        self.close()
+        return False
+
+    def __del__(self):
+        # Red de seguridad: si alguien olvidó cerrar la conexión, liberar el cupo
+        if getattr(self, "_in_use", False):
+            self._in_use = False
+            self._pool.discard(self)
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones thread-safe (las crea el backend configurado).
+
+    - min_size: conexiones que se abren al crear el pool.
+    - max_size: máximo de conexiones abiertas (en uso + libres).
+    - max_lifetime: segundos tras los cuales una conexión se recicla.
+    - timeout: segundos a esperar por una conexión libre antes de fallar.
+    - ping_interval: si la conexión estuvo libre más de estos segundos,
+      se verifica con un ping antes de entregarla.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=10, max_lifetime=1800,
+                 timeout=10, ping_interval=5):
+        self._factory = factory
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size)
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._idle = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+
+        for _ in range(min(self.min_size, self.max_size)):
+            self._size += 1
+            try:
+                conn = self._create()
+            except Exception as e:
+                print("⚠️ No se pudo precargar el pool de conexiones:", e)
+                break
+            self._idle.append(conn)
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def _create(self):
+        """Abre una conexión nueva; el cupo en `_size` ya debe estar reservado."""
+        try:
+            return PooledConnection(self, self._factory(), time.monotonic())
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _expired(self, conn, now):
+        return self.max_lifetime and now - conn._created_at > self.max_lifetime
+
+    def _close_raw(self, conn):
+        try:
+            conn._raw.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            conn = None
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"Sin conexiones disponibles tras {self.timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if conn is None:
+                conn = self._create()
+            elif not self._healthy(conn):
+                self.discard(conn)
+                continue
+
+            conn._in_use = True
+            return conn
+
+    def _healthy(self, conn):
+        now = time.monotonic()
+        if self._expired(conn, now):
+            return False
+        if now - conn._last_used >= self.ping_interval:
+            try:
+                conn._raw.ping(reconnect=False)
+            except Exception:
+                return False
+        return True
+
+    def release(self, conn):
+        # Descartar cualquier transacción abierta (incluido el snapshot de lectura)
+        try:
+            conn._raw.rollback()
+        except Exception:
+            self.discard(conn)
+            return
+
+        if self._expired(conn, time.monotonic()):
+            self.discard(conn)
+            return
+
+        conn._last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def discard(self, conn):
+        self._close_raw(conn)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for conn in idle:
+            self._close_raw(conn)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Retorna el pool del proceso actual.
+
+    Con gunicorn cada worker es un proceso distinto (fork): si el pool fue
+    creado en otro PID se crea uno nuevo, sin reutilizar los sockets heredados.
+    """
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ConnectionPool(_connect, **{**DB_POOL_CONFIG, **get_backend().pool_options()})
+                _pool_pid = pid
+    return _pool
+
+
+def reset_pool():
+    """Cierra las conexiones libres y descarta el pool (p. ej. entre pruebas)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool = None
+        _pool_pid = None
+
 
 def get_connection():
-    return pymysql.connect(
-        host=MYSQL_CONFIG["host"],
-        user=MYSQL_CONFIG["user"],
-        password=MYSQL_CONFIG["password"],
-        database=MYSQL_CONFIG["database"],
-        port=MYSQL_CONFIG["port"],
-        cursorclass=pymysql.cursors.DictCursor
-    )
+    """Obtiene una conexión del pool. `close()` la devuelve al pool."""
+    conn = get_pool().acquire()
+    record_connection()
+    return conn
+
+
+def stream_query(sql, params=(), batch_size=500):
+    """
+    Itera las filas de `sql` con un cursor sin buffer (SSDictCursor en MySQL),
+    leyendo de a `batch_size` filas: la memoria no crece con la tabla.
+
+    La conexión queda ocupada mientras dure la iteración. Si el consumidor
+    abandona el generador antes del final (cliente desconectado), la
+    conexión se descarta: devolverla al pool obligaría a leer el resto.
+    """
+    conn = get_connection()
+    finished = False
+    try:
+        # Sin `with`: cerrar un SSCursor lee todas las filas pendientes
+        cursor = get_backend().stream_cursor(conn)
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+        cursor.close()
+        finished = True
+    finally:
+        if finished:
+            conn.close()
+        else:
+            conn.discard()
@@ -0,0 +1,82 @@
+"""
+Verificación con EXPLAIN de que las consultas frecuentes de los modelos
+usan índices (ver la migración v003_indices_consultas).
+
+Conviene ejecutarla sobre una base con volumen realista: con pocas filas
+el optimizador puede preferir un recorrido completo aunque exista el
+índice.
+"""
+
+from controllers.barcode_controller import BarcodeController
+from models.bien_estado_model import BienEstadoModel
+from models.bien_model import BienModel
+from models.movimiento_model import MovimientoModel
+from models.user_model import UserModel
+
+# Catálogos pequeños (tabla o alias en EXPLAIN): recorrerlos completos es lo esperado
+FULL_SCAN_ALLOWED = {'categorias', 'roles', 'data_version', 'data_version_slots'}
+
+
+def queries():
+    """
+    [(nombre, sql, params)] con las consultas que ejecutan los modelos y
+    controladores, armadas con sus propios helpers y valores de ejemplo:
+    si una consulta cambia, la verificación revisa la versión nueva.
+    """
+    paginated_from, paginated_sql, paginated_params = BienModel._paginated_queries({'estado': 'MALO'})
+    search_from, search_sql, search_params = BienModel._paginated_queries({'search': 'computadora'})
+    cursor_sql, cursor_params = BienModel._cursor_query(None, None)
+    offices_sql, _ = BarcodeController._offices_query(['PATRIMONIO'])
+    filter_sql, _, filter_params = BarcodeController._filter_query('PATRIMONIO', '')
+
+    return [
+        ("BienModel.check_existence", BienModel._CHECK_EXISTENCE, ('000000000000',)),
+        ("BienEstadoModel.refresh", f"""
+            {BienEstadoModel._LATEST_SELECT}
+              AND m.bien_id IN (%s, %s)
+        """, (1, 2)),
+        ("MovimientoModel.get_by_bien_id", MovimientoModel._BY_BIEN, (1,)),
+        ("UserModel.find_by_dni", UserModel._FIND_BY_DNI, ('00000000',)),
+        ("BienModel.get_paginated (estado)", paginated_sql, tuple(paginated_params + [10, 0])),
+        ("BienModel.get_paginated (conteo, estado)", f"SELECT COUNT(*) {paginated_from}",
+         tuple(paginated_params)),
+        ("BienModel.get_paginated (búsqueda)", search_sql, tuple(search_params + [10, 0])),
+        ("BienModel.get_paginated (conteo, búsqueda)", f"SELECT COUNT(*) {search_from}",
+         tuple(search_params)),
+        ("BienModel.get_by_cursor", cursor_sql, tuple(cursor_params + [11])),
+        ("BarcodeController (oficinas)", offices_sql, ('PATRIMONIO',)),
+        ("BarcodeController (filtro)", filter_sql, tuple(filter_params)),
+    ]
+
+
+class ExplainCheck:
+
+    @staticmethod
+    def full_scans(plan):
+        """Tablas del plan que se recorren completas (type = ALL)."""
+        return sorted({
+            row['table'] for row in plan
+            if row.get('type') == 'ALL'
+            and row.get('table')
+            and not row['table'].startswith('<')
+            and row['table'] not in FULL_SCAN_ALLOWED
+        })
+
+    @staticmethod
+    def run(cursor, checked=None):
+        """
+        Retorna [{nombre, ok, full_scans, plan}] para cada consulta
+        (por defecto, las de queries()).
+        """
+        results = []
+        for nombre, sql, params in checked if checked is not None else queries():
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = cursor.fetchall()
+            scans = ExplainCheck.full_scans(plan)
+            results.append({
+                "nombre": nombre,
+                "ok": not scans,
+                "full_scans": scans,
+                "plan": plan
+            })
+        return results
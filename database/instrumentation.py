@@ -0,0 +1,159 @@
+import logging
+import re
+import time
+
+from flask import g, has_app_context
+from pymysql.cursors import DictCursor, SSDictCursor
+
+from config import SQL_METRICS_CONFIG
+
+slow_query_log = logging.getLogger('inventory.sql.slow')
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+# Largo máximo de la sentencia en el header Server-Timing
+SERVER_TIMING_SQL_CHARS = 200
+
+
+class RequestMetrics:
+    """Consultas, tiempo y filas de base de datos acumulados en una petición."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.connections = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = None
+
+    def record(self, sql, elapsed, rows):
+        self.queries += 1
+        self.db_time += elapsed
+        self.rows += max(rows, 0)
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_sql = sql
+
+    def server_timing(self):
+        """Valor del header Server-Timing (duraciones en milisegundos)."""
+        total = (time.perf_counter() - self.started) * 1000
+        parts = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries, {self.rows} rows"',
+            f'db-conn;desc="{self.connections} connections"',
+        ]
+        if self.slowest_sql is not None:
+            parts.append(f'db-slowest;dur={self.slowest_time * 1000:.1f};'
+                         f'desc="{_header_text(_redacted(self.slowest_sql))}"')
+        parts.append(f'app;dur={total:.1f}')
+        return ', '.join(parts)
+
+
+def current_metrics():
+    """Métricas de la petición en curso, o None fuera de una petición."""
+    if not has_app_context():
+        return None
+    return g.get('sql_metrics')
+
+
+def record_connection():
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.connections += 1
+
+
+def _statement(sql):
+    """SQL en una línea, tal como se escribió (con %s): sin valores."""
+    return _WHITESPACE.sub(' ', sql if isinstance(sql, str) else sql.decode(errors='replace')).strip()
+
+
+def _redacted(sql):
+    """
+    Plantilla de la sentencia sin literales: los textos y números escritos
+    en el SQL se reemplazan por ?, igual que los parámetros %s.
+    """
+    sql = _STRING_LITERAL.sub('?', _statement(sql))
+    return _NUMBER_LITERAL.sub('?', sql.replace('%s', '?'))
+
+
+def _header_text(text):
+    """Texto apto para el `desc` de Server-Timing: ASCII, sin comillas, acotado."""
+    text = text.encode('ascii', 'replace').decode('ascii').replace('"', "'").replace('\\', '/')
+    if len(text) > SERVER_TIMING_SQL_CHARS:
+        text = text[:SERVER_TIMING_SQL_CHARS - 3] + '...'
+    return text
+
+
+def record_statement(sql, elapsed, rows):
+    """Suma la sentencia a la petición en curso y la registra si es lenta."""
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.record(sql, elapsed, rows)
+
+    threshold = SQL_METRICS_CONFIG['slow_query_ms']
+    if threshold and elapsed * 1000 >= threshold:
+        # Sin valores: los parámetros y literales pueden tener datos personales
+        slow_query_log.warning("%.1f ms | rows=%s | %s", elapsed * 1000, rows, _redacted(sql))
+
+
+class InstrumentedCursorMixin:
+    """Mide cada sentencia del cursor (ver record_statement)."""
+
+    # executemany de PyMySQL ejecuta sentencias ya interpoladas con los
+    # valores; mientras dura se registra la plantilla original
+    _template = None
+    # Los cursores sin buffer no conocen el total de filas al ejecutar
+    _rows_on_execute = True
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            rows = self.rowcount if self._rows_on_execute else 0
+            record_statement(self._template or query, time.perf_counter() - started, rows)
+
+    def executemany(self, query, args):
+        self._template = query
+        try:
+            return super().executemany(query, args)
+        finally:
+            self._template = None
+
+
+class InstrumentedDictCursor(InstrumentedCursorMixin, DictCursor):
+    pass
+
+
+class InstrumentedSSDictCursor(InstrumentedCursorMixin, SSDictCursor):
+    """Cursor sin buffer: las filas se cuentan a medida que se leen."""
+
+    _rows_on_execute = False
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size)
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.rows += len(rows)
+        return rows
+
+
+def init_app(app):
+    """Registra la medición por petición y el header Server-Timing."""
+    if SQL_METRICS_CONFIG['slow_query_log'] and not slow_query_log.handlers:
+        handler = logging.FileHandler(SQL_METRICS_CONFIG['slow_query_log'])
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        slow_query_log.addHandler(handler)
+
+    @app.before_request
+    def start_sql_metrics():
+        g.sql_metrics = RequestMetrics()
+
+    @app.after_request
+    def add_server_timing(response):
+        metrics = g.get('sql_metrics')
+        if metrics is not None and SQL_METRICS_CONFIG['server_timing']:
+            response.headers['Server-Timing'] = metrics.server_timing()
+        return response
@@ -0,0 +1 @@
+"""Migraciones del esquema: ver database/migrator.py."""
@@ -0,0 +1,105 @@
+"""
+Esquema base: las tablas que usan los modelos, tal como las consultan.
+
+Usa CREATE TABLE IF NOT EXISTS, así que sobre una base existente (creada
+antes de las migraciones) no cambia nada y solo queda registrada.
+"""
+
+from database.migrator import IrreversibleMigrationError
+
+ROLES = """
+    CREATE TABLE IF NOT EXISTS roles (
+        id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(50) NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+USUARIOS = """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(255) NOT NULL,
+        usuario VARCHAR(100) NULL,
+        correo VARCHAR(255) NULL,
+        contrasena VARCHAR(255) NOT NULL,
+        rol_id INT NOT NULL,
+        dni VARCHAR(20) NULL,
+        activo TINYINT(1) NOT NULL DEFAULT 1,
+        creado_en TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT fk_usuarios_rol FOREIGN KEY (rol_id) REFERENCES roles (id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+CATEGORIAS = """
+    CREATE TABLE IF NOT EXISTS categorias (
+        id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(255) NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+BIENES = """
+    CREATE TABLE IF NOT EXISTS bienes (
+        id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        codigo_patrimonio VARCHAR(50) NULL,
+        codigo_interno VARCHAR(50) NULL,
+        codigo_completo VARCHAR(100) NULL,
+        detalle_bien VARCHAR(255) NULL,
+        descripcion TEXT NULL,
+        categoria_id INT NULL,
+        marca VARCHAR(100) NULL,
+        modelo VARCHAR(100) NULL,
+        numero_serie VARCHAR(100) NULL,
+        dimension VARCHAR(100) NULL,
+        color VARCHAR(50) NULL,
+        fecha_adquisicion DATE NULL,
+        fecha_asignacion DATE NULL,
+        fecha_retiro DATE NULL,
+        tipo_origen VARCHAR(20) NULL DEFAULT 'SIGA',
+        ubicacion_id INT NULL,
+        estado VARCHAR(20) NULL DEFAULT 'BUENO',
+        responsable_id INT NULL,
+        tipo_modalidad VARCHAR(50) NULL,
+        inventariador_id INT NULL,
+        observacion TEXT NULL,
+        codigo_barras VARCHAR(100) NULL,
+        codigo_patrimonial VARCHAR(100) NULL,
+        oficina VARCHAR(255) NULL,
+        fuente VARCHAR(50) NULL,
+        tipo_registro VARCHAR(50) NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP NULL,
+        deleted_at DATETIME NULL,
+        KEY idx_bienes_categoria (categoria_id),
+        CONSTRAINT fk_bienes_categoria FOREIGN KEY (categoria_id) REFERENCES categorias (id),
+        CONSTRAINT fk_bienes_inventariador FOREIGN KEY (inventariador_id) REFERENCES usuarios (id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+MOVIMIENTOS = """
+    CREATE TABLE IF NOT EXISTS movimientos (
+        id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        bien_id INT NOT NULL,
+        tipo VARCHAR(50) NOT NULL,
+        fecha DATE NOT NULL,
+        ubicacion_actual VARCHAR(255) NULL,
+        responsable VARCHAR(255) NULL,
+        modalidad_responsable VARCHAR(50) NULL,
+        inventariador_id INT NULL,
+        documento_id INT NULL,
+        observaciones TEXT NULL,
+        estado VARCHAR(20) NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        deleted_at DATETIME NULL,
+        CONSTRAINT fk_movimientos_bien FOREIGN KEY (bien_id) REFERENCES bienes (id),
+        CONSTRAINT fk_movimientos_inventariador FOREIGN KEY (inventariador_id) REFERENCES usuarios (id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+def up(cursor):
+    for statement in (ROLES, USUARIOS, CATEGORIAS, BIENES, MOVIMIENTOS):
+        cursor.execute(statement)
+
+
+def down(cursor):
+    raise IrreversibleMigrationError(
+        "El esquema base no se revierte: borraría los datos del inventario")
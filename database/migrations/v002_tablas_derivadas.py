@@ -0,0 +1,158 @@
+"""
+Tablas derivadas que el backend mantiene por su cuenta: proyección del
+estado actual, versión de datos, índice de búsqueda y contadores.
+
+Sobre una base existente las tablas se llenan al crearlas, con el mismo
+resultado que `flask db rebuild-estado`, `rebuild-search` y
+`reconcile-stats`. El SQL del llenado queda fijo aquí, según el esquema de
+esta versión: no usa los modelos, que pueden cambiar en migraciones
+posteriores.
+"""
+
+import re
+import unicodedata
+
+from database.migrator import create_index, drop_table
+
+BIEN_ESTADO_ACTUAL = """
+    CREATE TABLE IF NOT EXISTS bien_estado_actual (
+        bien_id INT NOT NULL PRIMARY KEY,
+        movimiento_id INT NULL,
+        ubicacion_actual VARCHAR(255) NULL,
+        responsable VARCHAR(255) NULL,
+        fecha DATE NULL,
+        actualizado_en TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        KEY idx_estado_ubicacion (ubicacion_actual, bien_id),
+        KEY idx_estado_responsable (responsable, bien_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+DATA_VERSION = """
+    CREATE TABLE IF NOT EXISTS data_version (
+        nombre VARCHAR(50) NOT NULL PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+DATA_VERSION_SEED = """
+    INSERT IGNORE INTO data_version (nombre, version) VALUES ('inventario', 0)
+"""
+
+BIEN_BUSQUEDA = """
+    CREATE TABLE IF NOT EXISTS bien_busqueda (
+        bien_id INT NOT NULL PRIMARY KEY,
+        search_text TEXT NOT NULL,
+        FULLTEXT KEY ft_bien_busqueda (search_text)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+BIEN_CONTADORES = """
+    CREATE TABLE IF NOT EXISTS bien_contadores (
+        dimension VARCHAR(20) NOT NULL,
+        clave VARCHAR(255) NOT NULL,
+        total INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, clave)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+BACKFILL_ESTADO = """
+    INSERT INTO bien_estado_actual
+        (bien_id, movimiento_id, ubicacion_actual, responsable, fecha)
+    SELECT m.bien_id, m.id, m.ubicacion_actual, m.responsable, m.fecha
+    FROM movimientos m
+    WHERE m.deleted_at IS NULL
+      AND m.id = (
+          SELECT m2.id
+          FROM movimientos m2
+          WHERE m2.bien_id = m.bien_id
+            AND m2.deleted_at IS NULL
+          ORDER BY m2.fecha DESC, m2.id DESC
+          LIMIT 1
+      )
+"""
+
+# Claves '' para los valores nulos, como ContadorModel
+BACKFILL_CONTADORES = [
+    """
+    INSERT INTO bien_contadores (dimension, clave, total)
+    SELECT 'total', '', COUNT(*) FROM bienes WHERE deleted_at IS NULL
+    """,
+    """
+    INSERT INTO bien_contadores (dimension, clave, total)
+    SELECT 'estado', COALESCE(estado, ''), COUNT(*)
+    FROM bienes WHERE deleted_at IS NULL
+    GROUP BY COALESCE(estado, '')
+    """,
+    """
+    INSERT INTO bien_contadores (dimension, clave, total)
+    SELECT 'categoria', COALESCE(CAST(categoria_id AS CHAR), ''), COUNT(*)
+    FROM bienes WHERE deleted_at IS NULL
+    GROUP BY COALESCE(CAST(categoria_id AS CHAR), '')
+    """,
+    """
+    INSERT INTO bien_contadores (dimension, clave, total)
+    SELECT 'oficina', COALESCE(ea.ubicacion_actual, ''), COUNT(*)
+    FROM bien_estado_actual ea
+    JOIN bienes b ON b.id = ea.bien_id
+    WHERE b.deleted_at IS NULL
+    GROUP BY COALESCE(ea.ubicacion_actual, '')
+    """,
+]
+
+# Campos y normalización de `search_text` en esta versión
+SEARCH_FIELDS = ('codigo_completo', 'codigo_patrimonio', 'codigo_interno',
+                 'detalle_bien', 'descripcion', 'marca', 'modelo')
+_NON_WORD = re.compile(r'[^0-9A-Z]+')
+
+
+def _search_text(row):
+    seen = []
+    for field in SEARCH_FIELDS:
+        text = row[field]
+        if not text:
+            continue
+        decomposed = unicodedata.normalize('NFKD', str(text))
+        folded = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+        for token in _NON_WORD.sub(' ', folded.upper()).split():
+            if token not in seen:
+                seen.append(token)
+    return ' '.join(seen)
+
+
+def _backfill_search(cursor, batch_size=1000):
+    last_id = 0
+    while True:
+        cursor.execute(
+            f"SELECT id, {', '.join(SEARCH_FIELDS)} FROM bienes WHERE id > %s ORDER BY id LIMIT %s",
+            (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        cursor.executemany(
+            "INSERT INTO bien_busqueda (bien_id, search_text) VALUES (%s, %s)",
+            [(row['id'], _search_text(row)) for row in rows])
+        last_id = rows[-1]['id']
+
+
+def up(cursor):
+    cursor.execute(BIEN_ESTADO_ACTUAL)
+    create_index(cursor, 'bien_estado_actual', 'ft_estado_ubicacion',
+                 ['ubicacion_actual'], kind='FULLTEXT')
+    cursor.execute(DATA_VERSION)
+    cursor.execute(DATA_VERSION_SEED)
+    cursor.execute(BIEN_BUSQUEDA)
+    cursor.execute(BIEN_CONTADORES)
+
+    # Una ejecución interrumpida puede haber dejado las tablas a medio llenar
+    for table in ('bien_estado_actual', 'bien_busqueda', 'bien_contadores'):
+        cursor.execute(f"DELETE FROM {table}")
+    cursor.execute(BACKFILL_ESTADO)
+    _backfill_search(cursor)
+    for sql in BACKFILL_CONTADORES:
+        cursor.execute(sql)
+
+
+def down(cursor):
+    for table in ('bien_contadores', 'bien_busqueda', 'data_version', 'bien_estado_actual'):
+        drop_table(cursor, table)
@@ -0,0 +1,29 @@
+"""
+Índices compuestos que necesitan las consultas frecuentes (ver
+`flask db explain-check`).
+"""
+
+from database.migrator import create_index, drop_index
+
+INDEXES = [
+    # Último movimiento por bien (BienEstadoModel._LATEST_SELECT)
+    ('movimientos', 'idx_movimientos_bien_fecha', ['bien_id', 'fecha', 'id']),
+    # Historial de un bien y desempate por id
+    ('movimientos', 'idx_movimientos_bien_id', ['bien_id', 'id']),
+    # verify-code, importación masiva y búsqueda por prefijo de código
+    ('bienes', 'idx_bienes_codigo_completo', ['codigo_completo']),
+    # Listados y conteos de bienes no eliminados por estado
+    ('bienes', 'idx_bienes_deleted_estado', ['deleted_at', 'estado']),
+    # Login por DNI
+    ('usuarios', 'idx_usuarios_dni', ['dni']),
+]
+
+
+def up(cursor):
+    for table, index, columns in INDEXES:
+        create_index(cursor, table, index, columns)
+
+
+def down(cursor):
+    for table, index, _ in reversed(INDEXES):
+        drop_index(cursor, table, index)
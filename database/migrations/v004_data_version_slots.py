@@ -0,0 +1,37 @@
+"""
+Versión de datos repartida en varias filas (ver DataVersionModel).
+
+Con una sola fila, cada transacción de escritura esperaba el bloqueo de
+la anterior sobre `data_version`. Ahora cada escritura incrementa una fila
+al azar de `data_version_slots` y la versión es la suma de todas. La fila
+0 arranca con la versión que ya tenía `data_version`: la suma nunca
+retrocede, y las claves de caché en disco que la incluyen siguen siendo
+válidas.
+"""
+
+from database.migrator import drop_table
+
+DATA_VERSION_SLOTS = """
+    CREATE TABLE IF NOT EXISTS data_version_slots (
+        nombre VARCHAR(50) NOT NULL,
+        slot SMALLINT NOT NULL,
+        version BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (nombre, slot)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+def up(cursor):
+    cursor.execute(DATA_VERSION_SLOTS)
+    cursor.execute("""
+        INSERT IGNORE INTO data_version_slots (nombre, slot, version)
+        SELECT nombre, 0, version FROM data_version
+    """)
+
+
+def down(cursor):
+    # Conservar en `data_version` la versión alcanzada
+    cursor.execute("SELECT nombre, SUM(version) AS version FROM data_version_slots GROUP BY nombre")
+    cursor.executemany("UPDATE data_version SET version = %s WHERE nombre = %s",
+                       [(int(row['version']), row['nombre']) for row in cursor.fetchall()])
+    drop_table(cursor, 'data_version_slots')
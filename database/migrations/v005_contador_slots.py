@@ -0,0 +1,67 @@
+"""
+Contadores del dashboard repartidos en varias filas (ver ContadorModel).
+
+Cada alta, edición o baja de un bien sumaba sobre la misma fila
+('total', '') de `bien_contadores` y la mantenía bloqueada hasta el
+commit: todas las escrituras de bienes se esperaban entre sí. Ahora la
+clave primaria incluye `slot`, cada transacción suma en una fila al azar
+y el valor de un contador es la suma de sus filas. Los valores actuales
+quedan en el slot 0.
+
+Cambiar la clave primaria requiere recrear la tabla (SQLite no lo admite
+con ALTER TABLE): se copia a `bien_contadores_nueva` y se renombra.
+"""
+
+from database.migrator import column_exists, drop_table, table_exists
+
+CON_SLOT = """
+    CREATE TABLE IF NOT EXISTS bien_contadores_nueva (
+        dimension VARCHAR(20) NOT NULL,
+        clave VARCHAR(255) NOT NULL,
+        slot SMALLINT NOT NULL DEFAULT 0,
+        total INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, clave, slot)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+SIN_SLOT = """
+    CREATE TABLE IF NOT EXISTS bien_contadores_nueva (
+        dimension VARCHAR(20) NOT NULL,
+        clave VARCHAR(255) NOT NULL,
+        total INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, clave)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+def _replace(cursor, create_sql, copy_sql):
+    """
+    Recrea `bien_contadores` con `create_sql` (que crea bien_contadores_nueva)
+    copiando las filas con `copy_sql`. Se puede volver a ejecutar si se
+    interrumpió: MySQL confirma cada DDL por separado.
+    """
+    if table_exists(cursor, 'bien_contadores'):
+        drop_table(cursor, 'bien_contadores_nueva')
+        cursor.execute(create_sql)
+        cursor.execute(copy_sql)
+        drop_table(cursor, 'bien_contadores')
+    cursor.execute("ALTER TABLE bien_contadores_nueva RENAME TO bien_contadores")
+
+
+def up(cursor):
+    if table_exists(cursor, 'bien_contadores') and column_exists(cursor, 'bien_contadores', 'slot'):
+        return
+    _replace(cursor, CON_SLOT, """
+        INSERT INTO bien_contadores_nueva (dimension, clave, slot, total)
+        SELECT dimension, clave, 0, total FROM bien_contadores
+    """)
+
+
+def down(cursor):
+    if table_exists(cursor, 'bien_contadores') and not column_exists(cursor, 'bien_contadores', 'slot'):
+        return
+    _replace(cursor, SIN_SLOT, """
+        INSERT INTO bien_contadores_nueva (dimension, clave, total)
+        SELECT dimension, clave, SUM(total) FROM bien_contadores
+        GROUP BY dimension, clave
+    """)
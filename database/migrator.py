@@ -0,0 +1,170 @@
+"""
+Migraciones versionadas del esquema.
+
+Cada migración es un módulo `database/migrations/vNNN_descripcion.py` con
+las funciones `up(cursor)` y `down(cursor)`. Las aplicadas se registran en
+la tabla `schema_migrations`, de modo que `flask db upgrade` solo ejecuta
+las pendientes, en orden.
+
+MySQL confirma implícitamente cada sentencia DDL, así que una migración no
+es atómica: los helpers de este módulo (create_index, drop_index, ...)
+consultan el catálogo del backend antes de actuar, para que volver a
+ejecutar una migración interrumpida no falle. Las migraciones escriben DDL
+de MySQL; el backend SQLite lo traduce.
+"""
+
+import importlib
+import pkgutil
+
+from database import migrations
+from database.backends import get_backend
+
+SCHEMA_MIGRATIONS = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(20) NOT NULL PRIMARY KEY,
+        nombre VARCHAR(255) NOT NULL,
+        aplicada_en TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+class IrreversibleMigrationError(Exception):
+    """La migración no se puede deshacer (p. ej. el esquema base)."""
+
+
+# --- Helpers para las migraciones ------------------------------------------
+
+def table_exists(cursor, table):
+    return get_backend().table_exists(cursor, table)
+
+
+def column_exists(cursor, table, column):
+    return get_backend().column_exists(cursor, table, column)
+
+
+def index_exists(cursor, table, index):
+    return get_backend().index_exists(cursor, table, index)
+
+
+def create_index(cursor, table, index, columns, kind=''):
+    """
+    Crea el índice si no existe. `kind` puede ser '', 'UNIQUE' o 'FULLTEXT'
+    (este último se omite si el backend no lo soporta). Retorna True si lo creó.
+    """
+    if kind == 'FULLTEXT' and not get_backend().SUPPORTS_FULLTEXT:
+        return False
+    if index_exists(cursor, table, index):
+        return False
+    prefix = f"{kind} " if kind else ''
+    cursor.execute(f"CREATE {prefix}INDEX {index} ON {table} ({', '.join(columns)})")
+    return True
+
+
+def drop_index(cursor, table, index):
+    if not index_exists(cursor, table, index):
+        return False
+    cursor.execute(get_backend().drop_index_sql(table, index))
+    return True
+
+
+def drop_table(cursor, table):
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+# --- Runner ----------------------------------------------------------------
+
+class Migration:
+
+    def __init__(self, version, nombre, module):
+        self.version = version
+        self.nombre = nombre
+        self.module = module
+
+    def up(self, cursor):
+        self.module.up(cursor)
+
+    def down(self, cursor):
+        self.module.down(cursor)
+
+
+class Migrator:
+
+    @staticmethod
+    def discover():
+        """Migraciones disponibles, ordenadas por versión (v001, v002, ...)."""
+        found = []
+        for info in pkgutil.iter_modules(migrations.__path__):
+            version, _, nombre = info.name.partition('_')
+            if not version.startswith('v') or not version[1:].isdigit():
+                continue
+            module = importlib.import_module(f"{migrations.__name__}.{info.name}")
+            found.append(Migration(version, nombre, module))
+        return sorted(found, key=lambda m: int(m.version[1:]))
+
+    @staticmethod
+    def applied(cursor):
+        cursor.execute(SCHEMA_MIGRATIONS)
+        cursor.execute("SELECT version FROM schema_migrations")
+        return {row['version'] for row in cursor.fetchall()}
+
+    @staticmethod
+    def status(conn):
+        """Lista de (migración, aplicada)."""
+        with conn.cursor() as cursor:
+            applied = Migrator.applied(cursor)
+        return [(m, m.version in applied) for m in Migrator.discover()]
+
+    @staticmethod
+    def upgrade(conn, target=None, on_apply=None):
+        """
+        Aplica las migraciones pendientes hasta `target` (inclusive; todas si
+        es None). Retorna las aplicadas.
+        """
+        done = []
+        with conn.cursor() as cursor:
+            applied = Migrator.applied(cursor)
+            for migration in Migrator.discover():
+                if target and int(migration.version[1:]) > int(target.lstrip('v')):
+                    break
+                if migration.version in applied:
+                    continue
+                if on_apply:
+                    on_apply(migration)
+                migration.up(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, nombre) VALUES (%s, %s)",
+                    (migration.version, migration.nombre))
+                conn.commit()
+                done.append(migration)
+        return done
+
+    @staticmethod
+    def downgrade(conn, target=None, on_apply=None):
+        """
+        Revierte las migraciones aplicadas posteriores a `target`. Sin
+        `target` revierte solo la última. Se detiene en la primera
+        irreversible (IrreversibleMigrationError), que queda aplicada.
+        Retorna las revertidas.
+        """
+        done = []
+        with conn.cursor() as cursor:
+            applied = Migrator.applied(cursor)
+            pending = [m for m in reversed(Migrator.discover()) if m.version in applied]
+            if target is None:
+                pending = pending[:1]
+            else:
+                pending = [m for m in pending if int(m.version[1:]) > int(target.lstrip('v'))]
+
+            for migration in pending:
+                if on_apply:
+                    on_apply(migration)
+                try:
+                    migration.down(cursor)
+                except IrreversibleMigrationError as e:
+                    print(f"⚠️ {migration.version} {migration.nombre} no se puede revertir: {e}")
+                    break
+                cursor.execute("DELETE FROM schema_migrations WHERE version = %s",
+                               (migration.version,))
+                conn.commit()
+                done.append(migration)
+        return done
@@ -0,0 +1,111 @@
+from database.connection import get_connection
+from models.contador_model import ContadorModel
+from models.data_version_model import DataVersionModel
+from utils.cache import cached
+
+
+class BienEstadoModel:
+    """
+    Proyección materializada del estado actual de cada bien (tabla
+    `bien_estado_actual`): ubicación y responsable del último movimiento
+    vigente, según el mismo criterio que usaban las subconsultas
+    (ORDER BY fecha DESC, id DESC; los movimientos eliminados no cuentan).
+
+    Los métodos reciben un cursor para ejecutarse dentro de la transacción
+    que modificó los movimientos; el commit lo hace quien llama.
+    """
+
+    _LATEST_SELECT = """
+        SELECT m.bien_id, m.id, m.ubicacion_actual, m.responsable, m.fecha
+        FROM movimientos m
+        WHERE m.deleted_at IS NULL
+          AND m.id = (
+              SELECT m2.id
+              FROM movimientos m2
+              WHERE m2.bien_id = m.bien_id
+                AND m2.deleted_at IS NULL
+              ORDER BY m2.fecha DESC, m2.id DESC
+              LIMIT 1
+          )
+    """
+
+    @staticmethod
+    def current_offices(cursor, bien_ids):
+        """{bien_id: ubicacion_actual} de los bienes no eliminados indicados."""
+        if not bien_ids:
+            return {}
+        placeholders = ','.join(['%s'] * len(bien_ids))
+        cursor.execute(f"""
+            SELECT ea.bien_id, ea.ubicacion_actual
+            FROM bien_estado_actual ea
+            JOIN bienes b ON b.id = ea.bien_id
+            WHERE b.deleted_at IS NULL
+              AND ea.bien_id IN ({placeholders})
+        """, list(bien_ids))
+        return {row['bien_id']: row['ubicacion_actual'] for row in cursor.fetchall()}
+
+    @staticmethod
+    def refresh(cursor, bien_ids):
+        """
+        Recalcula la proyección para los bienes indicados y ajusta los
+        contadores por oficina según el cambio de ubicación.
+        """
+        bien_ids = sorted({int(bien_id) for bien_id in bien_ids if bien_id})
+        if not bien_ids:
+            return
+
+        before = BienEstadoModel.current_offices(cursor, bien_ids)
+        placeholders = ','.join(['%s'] * len(bien_ids))
+        cursor.execute(
+            f"DELETE FROM bien_estado_actual WHERE bien_id IN ({placeholders})",
+            bien_ids)
+        cursor.execute(f"""
+            INSERT INTO bien_estado_actual
+                (bien_id, movimiento_id, ubicacion_actual, responsable, fecha)
+            {BienEstadoModel._LATEST_SELECT}
+              AND m.bien_id IN ({placeholders})
+        """, bien_ids)
+
+        after = BienEstadoModel.current_offices(cursor, bien_ids)
+        ContadorModel.adjust(cursor, ContadorModel.oficina_deltas(before, after))
+
+    @staticmethod
+    def refresh_for_movimiento(cursor, movimiento_id):
+        """Recalcula la proyección del bien al que pertenece un movimiento."""
+        cursor.execute("SELECT bien_id FROM movimientos WHERE id = %s", (movimiento_id,))
+        row = cursor.fetchone()
+        if row:
+            BienEstadoModel.refresh(cursor, [row['bien_id']])
+
+    @staticmethod
+    def rebuild(cursor):
+        """
+        Reconstruye la proyección completa desde `movimientos`. Retorna el
+        número de filas. Los contadores por oficina deben reconciliarse
+        después (ContadorModel.reconcile).
+        """
+        cursor.execute("DELETE FROM bien_estado_actual")
+        cursor.execute(f"""
+            INSERT INTO bien_estado_actual
+                (bien_id, movimiento_id, ubicacion_actual, responsable, fecha)
+            {BienEstadoModel._LATEST_SELECT}
+        """)
+        cursor.execute("SELECT COUNT(*) AS total FROM bien_estado_actual")
+        return cursor.fetchone()['total']
+
+    @staticmethod
+    @cached('oficinas', version=DataVersionModel.current)
+    def get_offices():
+        """Oficinas (ubicaciones) donde hay bienes actualmente."""
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT DISTINCT ubicacion_actual
+                FROM bien_estado_actual
+                WHERE ubicacion_actual IS NOT NULL 
+                  AND ubicacion_actual != ''
+                ORDER BY ubicacion_actual ASC
+            """)
+            result = [row['ubicacion_actual'] for row in cursor.fetchall()]
+        conn.close()
+        return result
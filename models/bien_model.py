@@ -1,109 +1,161 @@
-from database.connection import get_connection
+from database.connection import get_connection, stream_query
+from models.bien_estado_model import BienEstadoModel
+from models.data_version_model import DataVersionModel
+from models.contador_model import ContadorModel
+from services.count_service import CountService
+from utils.cache import cached, invalidate
+from utils.search import SEARCH_FIELDS, build_search_text, search_subquery
+from utils.pagination import cursor_limit, cursor_page, decode_cursor, keyset_condition
 from datetime import datetime
 
 
 class BienModel:
 
+    # Listados cacheados que dependen de bienes/movimientos (ver utils.cache)
+    CACHE_NAMESPACES = ('detalles', 'opciones_reporte', 'oficinas')
+
+    _ALL_SELECT = '''
+        SELECT 
+            b.*,
+            c.nombre AS categoria_nombre,
+            u.nombre AS inventariador_nombre,
+            ea.responsable AS responsable_nombre,
+            b.estado AS estado_nombre,
+            ea.ubicacion_actual AS ubicacion_nombre
+        FROM bienes b
+        LEFT JOIN categorias c 
+            ON b.categoria_id = c.id
+        LEFT JOIN usuarios u
+            ON b.inventariador_id = u.id
+        LEFT JOIN bien_estado_actual ea
+            ON ea.bien_id = b.id
+        WHERE b.deleted_at IS NULL;
+        '''
+
     @staticmethod
     def get_all():
         conn = get_connection()
         with conn.cursor() as cursor:
-            cursor.execute(
-                '''
-                SELECT 
-                    b.*,
-                    c.nombre AS categoria_nombre,
-                    u.nombre AS inventariador_nombre,
-                    (SELECT m.responsable FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS responsable_nombre,
-                    b.estado AS estado_nombre,
-                    (SELECT m.ubicacion_actual FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS ubicacion_nombre
-                FROM bienes b
-                LEFT JOIN categorias c 
-                    ON b.categoria_id = c.id
-                LEFT JOIN usuarios u
-                    ON b.inventariador_id = u.id
-                WHERE b.deleted_at IS NULL;
-                ''')
+            cursor.execute(BienModel._ALL_SELECT)
             result = cursor.fetchall()
         conn.close()
         return result
 
     @staticmethod
-    def get_stats():
+    def stream_all(batch_size=500):
+        """Igual que get_all, pero fila a fila con un cursor sin buffer."""
+        return stream_query(BienModel._ALL_SELECT, batch_size=batch_size)
+
+    @staticmethod
+    def get_stats(breakdown=False):
+        """
+        Totales del dashboard desde `bien_contadores` (mantenidos por las
+        escrituras), sin recorrer la tabla de bienes.
+        """
+        dimensions = ['total', 'estado']
+        if breakdown:
+            dimensions += ['categoria', 'oficina']
+
         conn = get_connection()
         with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN estado = 'BUENO' THEN 1 ELSE 0 END) as buenos,
-                    SUM(CASE WHEN estado = 'REGULAR' THEN 1 ELSE 0 END) as regulares,
-                    SUM(CASE WHEN estado = 'MALO' THEN 1 ELSE 0 END) as malos
-                FROM bienes
-                WHERE deleted_at IS NULL
-            """)
-            result = cursor.fetchone()
+            counters = ContadorModel.get(cursor, dimensions)
         conn.close()
-        
-        # Ensure values are integers (handle None if no records)
-        return {
-            "total": int(result['total']) if result['total'] else 0,
-            "buenos": int(result['buenos']) if result['buenos'] else 0,
-            "regulares": int(result['regulares']) if result['regulares'] else 0,
-            "malos": int(result['malos']) if result['malos'] else 0
+
+        por_estado = counters['estado']
+        stats = {
+            "total": counters['total'].get('', 0),
+            "buenos": por_estado.get('BUENO', 0),
+            "regulares": por_estado.get('REGULAR', 0),
+            "malos": por_estado.get('MALO', 0)
         }
+        if breakdown:
+            stats["por_estado"] = por_estado
+            stats["por_categoria"] = counters['categoria']
+            stats["por_oficina"] = counters['oficina']
+        return stats
+
+    _LISTING_SELECT = """
+        SELECT 
+            b.*,
+            c.nombre AS categoria_nombre,
+            u.nombre AS inventariador_nombre,
+            ea.responsable AS responsable_nombre,
+            b.estado AS estado_nombre,
+            ea.ubicacion_actual AS ubicacion_nombre
+        FROM bienes b
+        LEFT JOIN categorias c 
+            ON b.categoria_id = c.id
+        LEFT JOIN usuarios u
+            ON b.inventariador_id = u.id
+        LEFT JOIN bien_estado_actual ea
+            ON ea.bien_id = b.id
+    """
 
     @staticmethod
-    def get_paginated(page, per_page, filters=None):
-        offset = (page - 1) * per_page
-        conn = get_connection()
-        
+    def _filter_clauses(filters):
+        """
+        Retorna (search_join, where_clauses, params).
+
+        La búsqueda se resuelve con un JOIN a la subconsulta de coincidencias
+        (alias `s`, con su `score`); sus parámetros van primero en `params`.
+        """
+        search_join = ""
         where_clauses = ["b.deleted_at IS NULL"]
         params = []
 
         if filters:
             if filters.get('search'):
-                search_term = f"%{filters['search']}%"
-                where_clauses.append("(b.descripcion LIKE %s OR b.marca LIKE %s OR b.modelo LIKE %s OR b.codigo_patrimonio LIKE %s OR b.codigo_interno LIKE %s)")
-                params.extend([search_term] * 5)
+                search_sql, search_params = search_subquery(filters['search'])
+                search_join = f"JOIN ({search_sql}) s ON s.bien_id = b.id"
+                params.extend(search_params)
             
             if filters.get('estado'):
                 where_clauses.append("b.estado = %s")
                 params.append(filters['estado'])
 
             if filters.get('ubicacion'):
-                 where_clauses.append("(SELECT m.ubicacion_actual FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) = %s")
+                 where_clauses.append("ea.ubicacion_actual = %s")
                  params.append(filters['ubicacion'])
 
+        return search_join, where_clauses, params
+
+    @staticmethod
+    def _paginated_queries(filters):
+        """
+        Retorna (count_from, data_query, params) del listado paginado: el
+        FROM/WHERE que cuenta CountService y la consulta de la página, que
+        recibe `params` más LIMIT y OFFSET.
+        """
+        search_join, where_clauses, params = BienModel._filter_clauses(filters)
         where_str = " AND ".join(where_clauses)
+        # Con búsqueda, los resultados más relevantes primero
+        order_by = "ORDER BY s.score DESC, b.id ASC" if search_join else ""
+
+        # La proyección solo se une al conteo si algún filtro la usa
+        count_join = "LEFT JOIN bien_estado_actual ea ON ea.bien_id = b.id" if "ea." in where_str else ""
+        count_from = f"""
+            FROM bienes b
+            {search_join}
+            {count_join}
+            WHERE {where_str}
+        """
+        data_query = f"""
+            {BienModel._LISTING_SELECT}
+            {search_join}
+            WHERE {where_str}
+            {order_by}
+            LIMIT %s OFFSET %s;
+        """
+        return count_from, data_query, params
+
+    @staticmethod
+    def get_paginated(page, per_page, filters=None, count_mode=CountService.DEFAULT_MODE):
+        offset = (page - 1) * per_page
+        conn = get_connection()
+        count_from, data_query, params = BienModel._paginated_queries(filters)
 
         with conn.cursor() as cursor:
-            # Get total count
-            count_query = f"""
-                SELECT COUNT(*) as total
-                FROM bienes b
-                LEFT JOIN categorias c ON b.categoria_id = c.id
-                WHERE {where_str}
-            """
-            cursor.execute(count_query, tuple(params))
-            total = cursor.fetchone()['total']
-
-            # Get paginated items
-            data_query = f"""
-                SELECT 
-                    b.*,
-                    c.nombre AS categoria_nombre,
-                    u.nombre AS inventariador_nombre,
-                    (SELECT m.responsable FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS responsable_nombre,
-                    b.estado AS estado_nombre,
-                    (SELECT m.ubicacion_actual FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS ubicacion_nombre
-                FROM bienes b
-                LEFT JOIN categorias c 
-                    ON b.categoria_id = c.id
-                LEFT JOIN usuarios u
-                    ON b.inventariador_id = u.id
-                WHERE {where_str}
-                LIMIT %s OFFSET %s;
-            """
+            total = CountService.total(cursor, 'bienes', count_from, params, count_mode)
             cursor.execute(data_query, tuple(params + [per_page, offset]))
             result = cursor.fetchall()
         conn.close()
@@ -114,10 +166,52 @@ class BienModel:
                 "page": page,
                 "per_page": per_page,
                 "total": total,
-                "total_pages": (total + per_page - 1) // per_page if per_page > 0 else 0
+                "total_pages": (total + per_page - 1) // per_page if per_page > 0 and total is not None else None,
+                "count_mode": count_mode
             }
         }
 
+    @staticmethod
+    def _cursor_query(cursor_token, filters):
+        """Retorna (query, params) de get_by_cursor; la consulta recibe además LIMIT."""
+        last = decode_cursor(cursor_token, (int,))
+        search_join, where_clauses, params = BienModel._filter_clauses(filters)
+
+        if last is not None:
+            keyset_sql, keyset_params = keyset_condition(["b.id"], last)
+            where_clauses.append(keyset_sql)
+            params.extend(keyset_params)
+
+        where_str = " AND ".join(where_clauses)
+        query = f"""
+            {BienModel._LISTING_SELECT}
+            {search_join}
+            WHERE {where_str}
+            ORDER BY b.id ASC
+            LIMIT %s;
+        """
+        return query, params
+
+    @staticmethod
+    def get_by_cursor(cursor_token, per_page, filters=None):
+        """
+        Paginación por cursor (keyset) ordenada por b.id.
+
+        `cursor_token` es el `next_cursor` de la página anterior (vacío para
+        la primera). El costo de cada página no depende de su profundidad.
+        Lanza InvalidCursorError si el cursor o `per_page` no son válidos.
+        """
+        query, params = BienModel._cursor_query(cursor_token, filters)
+        limit = cursor_limit(per_page)
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            cursor.execute(query, tuple(params + [limit]))
+            rows = cursor.fetchall()
+        conn.close()
+
+        data, pagination = cursor_page(rows, per_page, key=lambda row: [row['id']])
+        return {"data": data, "pagination": pagination}
+
     @staticmethod
     def get_by_id(id):
         conn = get_connection()
@@ -127,143 +221,162 @@ class BienModel:
         conn.close()
         return result
 
+    _CHECK_EXISTENCE = """
+        SELECT 
+            b.id,
+            b.descripcion,
+            b.detalle_bien,
+            b.codigo_patrimonio,
+            b.codigo_interno,
+            b.codigo_completo,
+            b.tipo_origen,
+            ea.responsable AS responsable,
+            ea.ubicacion_actual AS ubicacion
+        FROM bienes b
+        LEFT JOIN bien_estado_actual ea ON ea.bien_id = b.id
+        WHERE b.codigo_completo = %s
+        AND b.deleted_at IS NULL
+    """
+
     @staticmethod
     def check_existence(codigo_completo):
         conn = get_connection()
         with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    b.id,
-                    b.descripcion,
-                    b.detalle_bien,
-                    b.codigo_patrimonio,
-                    b.codigo_interno,
-                    b.codigo_completo,
-                    b.tipo_origen,
-                    (SELECT m.responsable FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS responsable,
-                    (SELECT m.ubicacion_actual FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS ubicacion
-                FROM bienes b
-                WHERE b.codigo_completo = %s
-                AND b.deleted_at IS NULL
-            """, (codigo_completo,))
+            cursor.execute(BienModel._CHECK_EXISTENCE, (codigo_completo,))
             result = cursor.fetchone()
         conn.close()
         return result
 
+    _INSERT_BIEN = """
+        INSERT INTO bienes (
+            codigo_patrimonio, 
+            codigo_interno,
+            codigo_completo,
+            detalle_bien, 
+            descripcion, 
+            categoria_id, 
+            marca, 
+            modelo, 
+            numero_serie,
+            dimension, 
+            color, 
+            fecha_adquisicion, 
+            fecha_asignacion, 
+            fecha_retiro, 
+            tipo_origen, 
+            ubicacion_id, 
+            estado, 
+            responsable_id, 
+            tipo_modalidad,
+            inventariador_id, 
+            observacion, 
+            codigo_barras,
+            codigo_patrimonial,
+            oficina,
+            fuente,
+            tipo_registro
+        ) 
+        VALUES (
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 
+            %s, %s, %s, %s, %s, %s
+        )
+    """
+
+    _INSERT_MOVIMIENTO_INICIAL = """
+        INSERT INTO movimientos (
+            bien_id, tipo, fecha, ubicacion_actual, responsable, 
+            modalidad_responsable, inventariador_id, observaciones, estado
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+
+    @staticmethod
+    def _codigo_completo(data):
+        codigo_completo = f"{data.get('codigo_patrimonio', '')}{data.get('codigo_interno', '')}"
+        if data.get("tipo_origen", "SIGA") == 'SOBRANTE':
+            codigo_completo += "S"
+        return codigo_completo
+
+    @staticmethod
+    def _bien_values(data):
+        return (
+            data.get("codigo_patrimonio", ""),
+            data.get("codigo_interno", ""),
+            BienModel._codigo_completo(data),
+            data.get("detalle_bien", ""),
+            data.get("descripcion", ""),
+            data.get("categoria_id") or None,
+            data.get("marca", ""),
+            data.get("modelo", ""),
+            data.get("numero_serie", ""),
+            data.get("dimension", ""),
+            data.get("color", ""),
+            data.get("fecha_adquisicion") or None,
+            data.get("fecha_asignacion") or None,
+            data.get("fecha_retiro") or None,
+            data.get("tipo_origen", "SIGA"),
+            None, # ubicacion_id
+            data.get("estado", "BUENO"),
+            None, # responsable_id
+            data.get("tipo_modalidad"),
+            data.get("inventariador_id") or None,
+            data.get("observacion"),
+            data.get("codigo_barras", ""),
+            data.get("codigo_patrimonial", ""),
+            data.get("oficina", ""),
+            data.get("fuente", ""),
+            data.get("tipo_registro", "")
+        )
+
+    @staticmethod
+    def _movimiento_inicial_values(bien_id, data):
+        fecha_mov = data.get("fecha_asignacion")
+        if not fecha_mov:
+            fecha_mov = datetime.now().strftime("%Y-%m-%d")
+
+        return (
+            bien_id,
+            'Asignación',
+            fecha_mov,
+            data.get("ubicacion"),
+            data.get("responsable"),
+            data.get("modalidad"),
+            data.get("inventariador_id"),
+            data.get("observacion"),
+            data.get("estado", "BUENO")
+        )
+
+    @staticmethod
+    def _search_fields(data):
+        return {
+            **data,
+            "codigo_patrimonio": data.get("codigo_patrimonio", ""),
+            "codigo_interno": data.get("codigo_interno", ""),
+            "codigo_completo": BienModel._codigo_completo(data)
+        }
+
     @staticmethod
     def create(data):
         conn = None
         try:
             conn = get_connection()
             with conn.cursor() as cursor:
-
-                # Generar codigo_completo
-                codigo_patrimonio = data.get("codigo_patrimonio", "")
-                codigo_interno = data.get("codigo_interno", "")
-                tipo_origen = data.get("tipo_origen", "SIGA")
-                
-                codigo_completo = f"{codigo_patrimonio}{codigo_interno}"
-                if tipo_origen == 'SOBRANTE':
-                    codigo_completo += "S"
-
-                query = """
-                    INSERT INTO bienes (
-                        codigo_patrimonio, 
-                        codigo_interno,
-                        codigo_completo,
-                        detalle_bien, 
-                        descripcion, 
-                        categoria_id, 
-                        marca, 
-                        modelo, 
-                        numero_serie,
-                        dimension, 
-                        color, 
-                        fecha_adquisicion, 
-                        fecha_asignacion, 
-                        fecha_retiro, 
-                        tipo_origen, 
-                        ubicacion_id, 
-                        estado, 
-                        responsable_id, 
-                        tipo_modalidad,
-                        inventariador_id, 
-                        observacion, 
-                        codigo_barras,
-                        codigo_patrimonial,
-                        oficina,
-                        fuente,
-                        tipo_registro
-                    ) 
-                    VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 
-                        %s, %s, %s, %s, %s, %s
-                    );
-                """
-
-                values = (
-                    codigo_patrimonio,
-                    codigo_interno,
-                    codigo_completo,
-                    data.get("detalle_bien", ""),
-                    data.get("descripcion", ""),
-                    data.get("categoria_id") or None,
-                    data.get("marca", ""),
-                    data.get("modelo", ""),
-                    data.get("numero_serie", ""),
-                    data.get("dimension", ""),
-                    data.get("color", ""),
-                    data.get("fecha_adquisicion") or None,
-                    data.get("fecha_asignacion") or None,
-                    data.get("fecha_retiro") or None,
-                    tipo_origen,
-                    None, # ubicacion_id
-                    data.get("estado", "BUENO"),
-                    None, # responsable_id
-                    data.get("tipo_modalidad"),
-                    data.get("inventariador_id") or None,
-                    data.get("observacion"),
-                    data.get("codigo_barras", ""),
-                    data.get("codigo_patrimonial", ""),
-                    data.get("oficina", ""),
-                    data.get("fuente", ""),
-                    data.get("tipo_registro", "")
-                )
-
-                cursor.execute(query, values)
+                cursor.execute(BienModel._INSERT_BIEN, BienModel._bien_values(data))
                 bien_id = cursor.lastrowid
+                ContadorModel.adjust(cursor, ContadorModel.bien_deltas({
+                    "estado": data.get("estado", "BUENO"),
+                    "categoria_id": data.get("categoria_id") or None
+                }, +1))
 
                 # Registrar movimiento inicial
-                responsable_nombre = data.get("responsable")
-                ubicacion_nombre = data.get("ubicacion")
-                estado_bien = data.get("estado", "BUENO")
-
-                query_mov = """
-                    INSERT INTO movimientos (
-                        bien_id, tipo, fecha, ubicacion_actual, responsable, 
-                        modalidad_responsable, inventariador_id, observaciones, estado
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                
-                fecha_mov = data.get("fecha_asignacion")
-                if not fecha_mov:
-                    fecha_mov = datetime.now().strftime("%Y-%m-%d")
-
-                values_mov = (
-                    bien_id,
-                    'Asignación',
-                    fecha_mov,
-                    ubicacion_nombre,
-                    responsable_nombre,
-                    data.get("modalidad"),
-                    data.get("inventariador_id"),
-                    data.get("observacion"),
-                    estado_bien
-                )
-                cursor.execute(query_mov, values_mov)
+                cursor.execute(BienModel._INSERT_MOVIMIENTO_INICIAL,
+                               BienModel._movimiento_inicial_values(bien_id, data))
+                BienEstadoModel.refresh(cursor, [bien_id])
+                BienModel._refresh_search(cursor, bien_id, BienModel._search_fields(data))
+                DataVersionModel.bump(cursor)
 
                 conn.commit()
+                invalidate(*BienModel.CACHE_NAMESPACES)
                 return {"success": True, "message": "Bien registrado exitosamente"}
 
         except Exception as e:
@@ -274,13 +387,117 @@ class BienModel:
             if conn:
                 conn.close()
 
+    @staticmethod
+    def _existing_codes(cursor, codigos):
+        """
+        Subconjunto de `codigos` que ya pertenece a un bien no eliminado.
+        FOR UPDATE bloquea esos códigos en el índice hasta el commit: otra
+        transacción no puede registrar el mismo código mientras tanto.
+        """
+        placeholders = ','.join(['%s'] * len(codigos))
+        cursor.execute(f"""
+            SELECT codigo_completo FROM bienes
+            WHERE codigo_completo IN ({placeholders}) AND deleted_at IS NULL
+            FOR UPDATE
+        """, codigos)
+        return {row['codigo_completo'] for row in cursor.fetchall()}
+
+    # Filas por sentencia INSERT en create_many (parámetros por sentencia
+    # dentro del límite de SQLite)
+    _INSERT_MANY_ROWS = 100
+
+    @staticmethod
+    def _insert_bienes(cursor, items):
+        """
+        Inserta los bienes con INSERT de varias filas y retorna sus ids en
+        el orden de `items`. Los ids se vuelven a leer por codigo_completo
+        (único y ya bloqueado por _existing_codes): con
+        innodb_autoinc_lock_mode=2 o auto_increment_increment > 1 los ids
+        de una misma sentencia no son necesariamente consecutivos.
+        """
+        head, row = BienModel._INSERT_BIEN.rsplit('VALUES', 1)
+        bien_ids = []
+        for start in range(0, len(items), BienModel._INSERT_MANY_ROWS):
+            chunk = items[start:start + BienModel._INSERT_MANY_ROWS]
+            params = [value for data in chunk for value in BienModel._bien_values(data)]
+            cursor.execute(f"{head} VALUES {', '.join([row.strip()] * len(chunk))}", params)
+
+            codigos = [BienModel._codigo_completo(data) for data in chunk]
+            placeholders = ','.join(['%s'] * len(codigos))
+            cursor.execute(f"""
+                SELECT id, codigo_completo FROM bienes
+                WHERE codigo_completo IN ({placeholders}) AND deleted_at IS NULL
+            """, codigos)
+            ids = {row['codigo_completo']: row['id'] for row in cursor.fetchall()}
+            bien_ids.extend(ids[codigo] for codigo in codigos)
+        return bien_ids
+
+    @staticmethod
+    def create_many(items):
+        """
+        Registra un lote de bienes, cada uno con su movimiento inicial de
+        Asignación, en una sola transacción.
+
+        Los `items` deben venir validados y con `codigo_completo` únicos
+        entre sí (ver ImportService). Los que ya pertenecen a un bien no
+        eliminado se omiten; la comprobación ocurre en la misma
+        transacción (ver _existing_codes). Si algo falla se hace rollback
+        del lote y se propaga la excepción.
+
+        Retorna los ids en el orden de `items`, con None en los omitidos.
+        """
+        if not items:
+            return []
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                codigos = [BienModel._codigo_completo(data) for data in items]
+                existentes = BienModel._existing_codes(cursor, codigos)
+                nuevos = [data for codigo, data in zip(codigos, items) if codigo not in existentes]
+                if not nuevos:
+                    conn.rollback()
+                    return [None] * len(items)
+
+                bien_ids = BienModel._insert_bienes(cursor, nuevos)
+
+                cursor.executemany(BienModel._INSERT_MOVIMIENTO_INICIAL, [
+                    BienModel._movimiento_inicial_values(bien_id, data)
+                    for bien_id, data in zip(bien_ids, nuevos)
+                ])
+                cursor.executemany(
+                    "REPLACE INTO bien_busqueda (bien_id, search_text) VALUES (%s, %s)",
+                    [(bien_id, build_search_text(BienModel._search_fields(data)))
+                     for bien_id, data in zip(bien_ids, nuevos)])
+
+                ContadorModel.adjust(cursor, ContadorModel.combine(*(
+                    ContadorModel.bien_deltas({
+                        "estado": data.get("estado", "BUENO"),
+                        "categoria_id": data.get("categoria_id") or None
+                    }, +1)
+                    for data in nuevos)))
+                BienEstadoModel.refresh(cursor, bien_ids)
+                DataVersionModel.bump(cursor)
+
+            conn.commit()
+            invalidate(*BienModel.CACHE_NAMESPACES)
+            ids = iter(bien_ids)
+            return [None if codigo in existentes else next(ids) for codigo in codigos]
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
     @staticmethod
     def update(id, data):
+        conn = None
         try:
             conn = get_connection()
             
             # 1. Obtener datos actuales para auditoría y validación
-            current_bien = BienModel.get_by_id(id)
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT * FROM bienes WHERE id = %s", (id,))
+                current_bien = cursor.fetchone()
             if not current_bien:
                 return {"success": False, "message": "Bien no encontrado"}
             
@@ -365,29 +582,83 @@ class BienModel:
                 )
 
                 cursor.execute(query, values)
+                if current_bien['deleted_at'] is None:
+                    ContadorModel.adjust(cursor, ContadorModel.combine(
+                        ContadorModel.bien_deltas(current_bien, -1),
+                        ContadorModel.bien_deltas({
+                            "estado": data.get("estado"),
+                            "categoria_id": data.get("categoria_id") or None
+                        }, +1)))
+                BienModel._refresh_search(cursor, id, {
+                    **data,
+                    **{field: current_bien[field] for field in immutable_fields}
+                })
+                DataVersionModel.bump(cursor)
                 conn.commit()
+                invalidate(*BienModel.CACHE_NAMESPACES)
+
+                # 5. Retornar el objeto actualizado (misma conexión)
+                cursor.execute("SELECT * FROM bienes WHERE id = %s", (id,))
+                updated_bien = cursor.fetchone()
 
-            conn.close()
-            
-            # 5. Retornar el objeto actualizado
-            updated_bien = BienModel.get_by_id(id)
             return {"success": True, "message": "Bien actualizado correctamente", "data": updated_bien}
 
         except Exception as e:
             print(f"❌ Error al actualizar bien: {e}")
             return {"success": False, "error": str(e)}
 
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def _refresh_search(cursor, bien_id, bien):
+        """Actualiza el texto de búsqueda normalizado del bien (tabla bien_busqueda)."""
+        cursor.execute(
+            "REPLACE INTO bien_busqueda (bien_id, search_text) VALUES (%s, %s)",
+            (bien_id, build_search_text(bien)))
+
+    @staticmethod
+    def rebuild_search(cursor, batch_size=1000):
+        """Recalcula `bien_busqueda` para todos los bienes. Retorna el número de filas."""
+        fields = ', '.join(('id',) + SEARCH_FIELDS)
+        cursor.execute("DELETE FROM bien_busqueda")
+        total = 0
+        last_id = 0
+        while True:
+            cursor.execute(
+                f"SELECT {fields} FROM bienes WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return total
+            cursor.executemany(
+                "INSERT INTO bien_busqueda (bien_id, search_text) VALUES (%s, %s)",
+                [(row['id'], build_search_text(row)) for row in rows])
+            total += len(rows)
+            last_id = rows[-1]['id']
+
     @staticmethod
     def destroy(id):
         conn = get_connection()
         with conn.cursor() as cursor:
+            cursor.execute("SELECT estado, categoria_id FROM bienes WHERE id = %s AND deleted_at IS NULL", (id,))
+            bien = cursor.fetchone()
+            oficinas = BienEstadoModel.current_offices(cursor, [id])
             cursor.execute("""
                 UPDATE bienes
                 SET deleted_at = %s
                 WHERE id = %s
+                AND deleted_at IS NULL
             """, (datetime.now(), id))
+            if bien and cursor.rowcount:
+                ContadorModel.adjust(cursor, ContadorModel.combine(
+                    ContadorModel.bien_deltas(bien, -1),
+                    ContadorModel.oficina_deltas(oficinas, {})))
+            DataVersionModel.bump(cursor)
         conn.commit()
         conn.close()
+        invalidate(*BienModel.CACHE_NAMESPACES)
 
     @staticmethod
     def get_for_report(filters):
@@ -397,11 +668,11 @@ class BienModel:
         params = []
 
         if filters.get('responsable'):
-            where_clauses.append("(SELECT m.responsable FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) = %s")
+            where_clauses.append("ea.responsable = %s")
             params.append(filters['responsable'])
             
         if filters.get('area'):
-             where_clauses.append("(SELECT m.ubicacion_actual FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) = %s")
+             where_clauses.append("ea.ubicacion_actual = %s")
              params.append(filters['area'])
 
         where_str = " AND ".join(where_clauses)
@@ -417,8 +688,9 @@ class BienModel:
                 b.dimension,
                 b.color,
                 b.estado,
-                (SELECT m.ubicacion_actual FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS ubicacion_nombre
+                ea.ubicacion_actual AS ubicacion_nombre
             FROM bienes b
+            LEFT JOIN bien_estado_actual ea ON ea.bien_id = b.id
             WHERE {where_str}
             ORDER BY b.codigo_patrimonio ASC
         """
@@ -430,6 +702,7 @@ class BienModel:
         return result
 
     @staticmethod
+    @cached('opciones_reporte', version=DataVersionModel.current)
     def get_report_options():
         conn = get_connection()
         with conn.cursor() as cursor:
@@ -463,6 +736,7 @@ class BienModel:
         }
 
     @staticmethod
+    @cached('detalles', version=DataVersionModel.current)
     def get_unique_detalles():
         conn = get_connection()
         with conn.cursor() as cursor:
@@ -503,8 +777,9 @@ class BienModel:
                 b.marca,
                 b.modelo,
                 b.estado,
-                (SELECT m.ubicacion_actual FROM movimientos m WHERE m.bien_id = b.id ORDER BY m.fecha DESC, m.id DESC LIMIT 1) AS ubicacion_actual
+                ea.ubicacion_actual AS ubicacion_actual
             FROM bienes b
+            LEFT JOIN bien_estado_actual ea ON ea.bien_id = b.id
             WHERE {where_str}
             ORDER BY b.detalle_bien ASC, b.codigo_patrimonio ASC
         """
@@ -1,8 +1,10 @@
 from database.connection import get_connection
+from utils.cache import cached
 
 
 class CategoriaModel:
     @staticmethod
+    @cached('categorias')
     def get_all():
         """Obtiene todas las categorías"""
         conn = get_connection()
@@ -0,0 +1,151 @@
+import random
+from collections import Counter
+
+
+class ContadorModel:
+    """
+    Contadores del dashboard (tabla `bien_contadores`), mantenidos de forma
+    incremental por las rutas de escritura de bienes y movimientos.
+
+    Dimensiones: 'total' (clave ''), 'estado', 'categoria' (id como texto)
+    y 'oficina' (ubicación actual). Solo cuentan los bienes no eliminados;
+    los valores nulos se guardan con clave ''.
+
+    Cada contador se reparte en hasta SLOTS filas (columna `slot`) y su
+    valor es la suma de ellas: cada transacción suma en una fila al azar,
+    así las escrituras de bienes no esperan todas por la fila
+    ('total', '').
+
+    Como cualquier contador incremental puede desviarse (escrituras fuera de
+    la aplicación, errores parciales), `reconcile` lo recalcula desde cero,
+    corrige las diferencias y junta las filas de cada contador en una.
+    """
+
+    DIMENSIONS = ('total', 'estado', 'categoria', 'oficina')
+
+    # Filas entre las que se reparte cada contador (ver DataVersionModel.SLOTS)
+    SLOTS = 16
+
+    @staticmethod
+    def _clave(value):
+        return '' if value is None else str(value)
+
+    @staticmethod
+    def bien_deltas(bien, sign):
+        """Deltas de total, estado y categoría al sumar (+1) o restar (-1) un bien."""
+        return Counter({
+            ('total', ''): sign,
+            ('estado', ContadorModel._clave(bien.get('estado'))): sign,
+            ('categoria', ContadorModel._clave(bien.get('categoria_id'))): sign,
+        })
+
+    @staticmethod
+    def oficina_deltas(before, after):
+        """Deltas por oficina entre dos mapas {bien_id: ubicacion}."""
+        deltas = Counter()
+        for ubicacion in before.values():
+            deltas[('oficina', ContadorModel._clave(ubicacion))] -= 1
+        for ubicacion in after.values():
+            deltas[('oficina', ContadorModel._clave(ubicacion))] += 1
+        return deltas
+
+    @staticmethod
+    def combine(*deltas):
+        """Suma varios deltas conservando los negativos (Counter + los descarta)."""
+        total = Counter()
+        for delta in deltas:
+            total.update(delta)
+        return total
+
+    @staticmethod
+    def adjust(cursor, deltas):
+        """
+        Aplica los deltas dentro de la transacción del llamador, todos en
+        un mismo slot elegido al azar.
+        """
+        slot = random.randrange(ContadorModel.SLOTS)
+        rows = [(dimension, clave, slot, delta)
+                for (dimension, clave), delta in sorted(deltas.items()) if delta]
+        if not rows:
+            return
+        cursor.executemany("""
+            INSERT INTO bien_contadores (dimension, clave, slot, total)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE total = total + VALUES(total)
+        """, rows)
+
+    @staticmethod
+    def get(cursor, dimensions):
+        placeholders = ','.join(['%s'] * len(dimensions))
+        cursor.execute(f"""
+            SELECT dimension, clave, SUM(total) AS total
+            FROM bien_contadores
+            WHERE dimension IN ({placeholders})
+            GROUP BY dimension, clave
+            HAVING SUM(total) != 0
+        """, tuple(dimensions))
+        result = {dimension: {} for dimension in dimensions}
+        for row in cursor.fetchall():
+            result[row['dimension']][row['clave']] = int(row['total'])
+        return result
+
+    @staticmethod
+    def _expected(cursor):
+        expected = Counter()
+        cursor.execute("SELECT COUNT(*) AS total FROM bienes WHERE deleted_at IS NULL")
+        expected[('total', '')] = int(cursor.fetchone()['total'])
+
+        for dimension, column in (('estado', 'estado'), ('categoria', 'categoria_id')):
+            cursor.execute(f"""
+                SELECT {column} AS clave, COUNT(*) AS total
+                FROM bienes
+                WHERE deleted_at IS NULL
+                GROUP BY {column}
+            """)
+            for row in cursor.fetchall():
+                expected[(dimension, ContadorModel._clave(row['clave']))] = int(row['total'])
+
+        cursor.execute("""
+            SELECT ea.ubicacion_actual AS clave, COUNT(*) AS total
+            FROM bien_estado_actual ea
+            JOIN bienes b ON b.id = ea.bien_id
+            WHERE b.deleted_at IS NULL
+            GROUP BY ea.ubicacion_actual
+        """)
+        for row in cursor.fetchall():
+            expected[('oficina', ContadorModel._clave(row['clave']))] = int(row['total'])
+        return expected
+
+    @staticmethod
+    def reconcile(cursor):
+        """
+        Recalcula todos los contadores, corrige los que difieran y deja cada
+        uno en una sola fila (slot 0).
+
+        Bloquea las filas de `bien_contadores` (FOR UPDATE) antes de contar,
+        para que ninguna escritura concurrente quede a medio camino.
+        Retorna la lista de diferencias corregidas.
+        """
+        cursor.execute("SELECT dimension, clave, total FROM bien_contadores FOR UPDATE")
+        current = Counter()
+        for row in cursor.fetchall():
+            current[(row['dimension'], row['clave'])] += int(row['total'])
+        expected = ContadorModel._expected(cursor)
+
+        drift = []
+        for key in sorted(set(current) | set(expected)):
+            if current[key] != expected[key]:
+                drift.append({
+                    "dimension": key[0],
+                    "clave": key[1],
+                    "actual": current[key],
+                    "esperado": expected[key]
+                })
+
+        cursor.execute("DELETE FROM bien_contadores")
+        cursor.executemany("""
+            INSERT INTO bien_contadores (dimension, clave, slot, total)
+            VALUES (%s, %s, 0, %s)
+        """, [(dimension, clave, total)
+              for (dimension, clave), total in sorted(expected.items()) if total])
+        return drift
@@ -0,0 +1,86 @@
+import random
+import threading
+import time
+
+from database.connection import get_connection
+
+
+class DataVersionModel:
+    """
+    Contadores de versión de datos (tabla `data_version_slots`).
+
+    Cada escritura sobre bienes o movimientos incrementa la versión al
+    final de su transacción (ver bump); los cachés que dependen de esos
+    datos incluyen la versión en su clave, de modo que quedan invalidados
+    en todos los workers sin coordinación adicional.
+    """
+
+    INVENTARIO = 'inventario'
+
+    # Filas entre las que se reparten los incrementos (data_version_slots)
+    SLOTS = 16
+
+    # Segundos que current() reutiliza la versión leída en este proceso
+    CURRENT_TTL = 1.0
+
+    _current = {}
+    _current_lock = threading.Lock()
+
+    @staticmethod
+    def bump(cursor, nombre=INVENTARIO):
+        """
+        Incrementa la versión. Llamar al final de la transacción, justo
+        antes del commit: el bloqueo de la fila dura hasta el commit, y
+        repartir los incrementos entre SLOTS filas evita que todas las
+        escrituras esperen por la misma.
+        """
+        cursor.execute("""
+            INSERT INTO data_version_slots (nombre, slot, version) VALUES (%s, %s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+        """, (nombre, random.randrange(DataVersionModel.SLOTS)))
+
+    @staticmethod
+    def get(cursor, nombre=INVENTARIO):
+        cursor.execute(
+            "SELECT COALESCE(SUM(version), 0) AS version FROM data_version_slots WHERE nombre = %s",
+            (nombre,))
+        return int(cursor.fetchone()['version'])
+
+    @staticmethod
+    def current(nombre=INVENTARIO):
+        """
+        Versión actual para claves de caché, leída con una conexión propia
+        como mucho cada CURRENT_TTL segundos por proceso: un acierto del
+        caché no consulta la base. Una escritura en otro worker se nota
+        tras ese segundo, como máximo.
+
+        Si la base no responde se sigue usando la última versión leída.
+        """
+        now = time.monotonic()
+        with DataVersionModel._current_lock:
+            memo = DataVersionModel._current.get(nombre)
+        if memo is not None and memo[0] > now:
+            return memo[1]
+
+        try:
+            conn = get_connection()
+            try:
+                with conn.cursor() as cursor:
+                    version = DataVersionModel.get(cursor, nombre)
+            finally:
+                conn.close()
+        except Exception as e:
+            if memo is None:
+                raise
+            print("⚠️ No se pudo leer la versión de datos, se usa la anterior:", e)
+            version = memo[1]
+
+        with DataVersionModel._current_lock:
+            DataVersionModel._current[nombre] = (now + DataVersionModel.CURRENT_TTL, version)
+        return version
+
+    @staticmethod
+    def forget():
+        """Descarta las versiones recordadas por current() (p. ej. en pruebas)."""
+        with DataVersionModel._current_lock:
+            DataVersionModel._current.clear()
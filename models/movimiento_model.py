@@ -1,27 +1,39 @@
-from database.connection import get_connection
+from database.connection import get_connection, stream_query
+from models.bien_estado_model import BienEstadoModel
+from models.data_version_model import DataVersionModel
+from utils.cache import invalidate
 from datetime import datetime
 
 
 class MovimientoModel:
 
+    # Listados cacheados que dependen de los movimientos (ver utils.cache)
+    CACHE_NAMESPACES = ('opciones_reporte', 'oficinas')
+
+    _ALL_SELECT = '''
+        SELECT 
+            m.*,
+            u.nombre as inventariador_nombre,
+            m.estado as estado_movimiento
+        FROM movimientos m
+        LEFT JOIN usuarios u ON m.inventariador_id = u.id
+        ORDER BY m.fecha DESC, m.id DESC
+        '''
+
     @staticmethod
     def get_all():
         conn = get_connection()
         with conn.cursor() as cursor:
-            cursor.execute(
-                '''
-                SELECT 
-                    m.*,
-                    u.nombre as inventariador_nombre,
-                    m.estado as estado_movimiento
-                FROM movimientos m
-                LEFT JOIN usuarios u ON m.inventariador_id = u.id
-                ORDER BY m.fecha DESC, m.id DESC
-                ''')
+            cursor.execute(MovimientoModel._ALL_SELECT)
             result = cursor.fetchall()
         conn.close()
         return result
 
+    @staticmethod
+    def stream_all(batch_size=500):
+        """Igual que get_all, pero fila a fila con un cursor sin buffer."""
+        return stream_query(MovimientoModel._ALL_SELECT, batch_size=batch_size)
+
     @staticmethod
     def get_by_id(id):
         conn = get_connection()
@@ -42,21 +54,22 @@ class MovimientoModel:
 
         return result
 
+    _BY_BIEN = '''
+        SELECT 
+            m.*,
+            u.nombre as inventariador_nombre,
+            m.estado as estado_movimiento
+        FROM movimientos m
+        LEFT JOIN usuarios u ON m.inventariador_id = u.id
+        WHERE m.bien_id = %s
+        ORDER BY m.created_at ASC
+    '''
+
     @staticmethod
     def get_by_bien_id(bien_id):
         conn = get_connection()
         with conn.cursor() as cursor:
-            cursor.execute(
-                '''
-                SELECT 
-                    m.*,
-                    u.nombre as inventariador_nombre,
-                    m.estado as estado_movimiento
-                FROM movimientos m
-                LEFT JOIN usuarios u ON m.inventariador_id = u.id
-                WHERE m.bien_id = %s
-                ORDER BY m.created_at ASC
-                ''', (bien_id,))
+            cursor.execute(MovimientoModel._BY_BIEN, (bien_id,))
             result = cursor.fetchall()
         conn.close()
         return result
@@ -153,7 +166,10 @@ class MovimientoModel:
                 )
 
                 cursor.execute(query, values)
+                BienEstadoModel.refresh(cursor, [data.get("bien_id")])
+                DataVersionModel.bump(cursor)
                 conn.commit()
+                invalidate(*MovimientoModel.CACHE_NAMESPACES)
                 return {"success": True, "message": "Movimiento registrado exitosamente"}
 
         except Exception as e:
@@ -164,6 +180,111 @@ class MovimientoModel:
             if conn:
                 conn.close()
 
+    @staticmethod
+    def create_bulk(data):
+        """
+        Registra el mismo movimiento (p. ej. un Traslado) para muchos bienes
+        en una sola transacción: los de `bien_ids` o todos los que están hoy
+        en `ubicacion_origen`.
+
+        Los movimientos se insertan con un único INSERT ... SELECT y la
+        proyección `bien_estado_actual` se recalcula una sola vez para todo
+        el lote. Si el movimiento no indica `estado`, cada fila conserva el
+        estado actual de su bien.
+
+        Los errores de validación incluyen `status` (400/404) para el controlador.
+        """
+        conn = None
+        try:
+            bien_ids = data.get("bien_ids") or []
+            ubicacion_origen = data.get("ubicacion_origen")
+            ubicacion_destino = data.get("ubicacion_actual") or data.get("ubicacion_destino")
+
+            if not bien_ids and not ubicacion_origen:
+                return {"success": False, "error": "Indique bien_ids o ubicacion_origen", "status": 400}
+            if not ubicacion_destino:
+                return {"success": False, "error": "La ubicación de destino es obligatoria", "status": 400}
+            # Un string como "12" se iteraría carácter por carácter
+            if not isinstance(bien_ids, list) or not all(
+                    isinstance(bien_id, int) and not isinstance(bien_id, bool) for bien_id in bien_ids):
+                return {"success": False, "error": "bien_ids debe ser una lista de ids", "status": 400}
+            bien_ids = sorted(set(bien_ids))
+
+            conn = get_connection()
+            with conn.cursor() as cursor:
+                # Bloquear los bienes del lote para que el conjunto no cambie
+                if bien_ids:
+                    placeholders = ','.join(['%s'] * len(bien_ids))
+                    cursor.execute(f"""
+                        SELECT b.id FROM bienes b
+                        WHERE b.id IN ({placeholders}) AND b.deleted_at IS NULL
+                        FOR UPDATE
+                    """, bien_ids)
+                else:
+                    cursor.execute("""
+                        SELECT b.id FROM bienes b
+                        JOIN bien_estado_actual ea ON ea.bien_id = b.id
+                        WHERE ea.ubicacion_actual = %s AND b.deleted_at IS NULL
+                        FOR UPDATE
+                    """, (ubicacion_origen,))
+                found = [row['id'] for row in cursor.fetchall()]
+                no_encontrados = sorted(set(bien_ids) - set(found))
+
+                if not found:
+                    return {"success": False, "error": "No hay bienes para mover",
+                            "no_encontrados": no_encontrados, "status": 404}
+
+                placeholders = ','.join(['%s'] * len(found))
+                cursor.execute(f"""
+                    INSERT INTO movimientos
+                    (
+                        bien_id, 
+                        tipo, 
+                        fecha, 
+                        ubicacion_actual, 
+                        responsable, 
+                        modalidad_responsable,
+                        inventariador_id,
+                        documento_id,
+                        observaciones,
+                        estado
+                    )
+                    SELECT b.id, %s, %s, %s, %s, %s, %s, %s, %s, COALESCE(%s, b.estado)
+                    FROM bienes b
+                    WHERE b.id IN ({placeholders})
+                """, (
+                    data.get("tipo", "Traslado"),
+                    data.get("fecha") or datetime.now().strftime("%Y-%m-%d"),
+                    ubicacion_destino,
+                    data.get("responsable") or data.get("responsable_nuevo"),
+                    data.get("modalidad_responsable") or data.get("modalidad_responsable_nuevo") or data.get("modalidad"),
+                    data.get("inventariador_id") or None,
+                    data.get("documento_id") or None,
+                    data.get("observaciones"),
+                    data.get("estado") or None,
+                    *found
+                ))
+                total = cursor.rowcount
+
+                BienEstadoModel.refresh(cursor, found)
+                DataVersionModel.bump(cursor)
+                conn.commit()
+                invalidate(*MovimientoModel.CACHE_NAMESPACES)
+                return {
+                    "success": True,
+                    "message": f"{total} movimientos registrados exitosamente",
+                    "total": total,
+                    "no_encontrados": no_encontrados
+                }
+
+        except Exception as e:
+            print("❌ Error al registrar movimientos masivos:", e)
+            return {"success": False, "error": str(e)}
+
+        finally:
+            if conn:
+                conn.close()
+
     @staticmethod
     def update(id, data):
         try:
@@ -206,9 +327,12 @@ class MovimientoModel:
                 )
 
                 cursor.execute(query, values)
+                BienEstadoModel.refresh_for_movimiento(cursor, id)
+                DataVersionModel.bump(cursor)
                 conn.commit()
 
             conn.close()
+            invalidate(*MovimientoModel.CACHE_NAMESPACES)
             return True
 
         except Exception as e:
@@ -224,5 +348,8 @@ class MovimientoModel:
                 SET deleted_at = %s
                 WHERE id = %s
             """, (datetime.now(), id))
+            BienEstadoModel.refresh_for_movimiento(cursor, id)
+            DataVersionModel.bump(cursor)
         conn.commit()
         conn.close()
+        invalidate(*MovimientoModel.CACHE_NAMESPACES)
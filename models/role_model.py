@@ -1,7 +1,9 @@
 from database.connection import get_connection
+from utils.cache import cached
 
 class RoleModel:
     @staticmethod
+    @cached('roles')
     def get_all():
         conn = get_connection()
         with conn.cursor() as cursor:
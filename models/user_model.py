@@ -41,15 +41,17 @@ class UserModel:
         conn.close()
         return user
 
+    _FIND_BY_DNI = """
+        SELECT id, contrasena, nombre, rol_id, dni, activo 
+        FROM usuarios 
+        WHERE dni = %s
+    """
+
     @staticmethod
     def find_by_dni(dni):
         conn = get_connection()
         with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT id, contrasena, nombre, rol_id, dni, activo 
-                FROM usuarios 
-                WHERE dni = %s
-            """, (dni,))
+            cursor.execute(UserModel._FIND_BY_DNI, (dni,))
             user = cursor.fetchone()
         conn.close()
         return user
@@ -62,3 +62,20 @@ def generate_pdf_by_filter():
     }
     """
     return BarcodeController.generate_pdf_by_filter()
+
+
+# Estado de un trabajo asíncrono de generación
+@barcode_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_barcode_job(job_id):
+    """
+    GET /api/barcode/jobs/<job_id>
+    Estado y progreso (current/total) de un PDF pedido con "async": true
+    """
+    return BarcodeController.get_job(job_id)
+
+
+# Descarga del PDF de un trabajo terminado
+@barcode_bp.route('/jobs/<job_id>/download', methods=['GET'])
+def download_barcode_job(job_id):
+    """GET /api/barcode/jobs/<job_id>/download - PDF del trabajo (409 si aún no termina)"""
+    return BarcodeController.download_job(job_id)
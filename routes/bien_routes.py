@@ -8,5 +8,6 @@ bien_bp.route('/verify-code', methods=['GET'])(BienController.verify_code)
 bien_bp.route('/stats', methods=['GET'])(BienController.stats)
 bien_bp.route('/<int:id>', methods=['GET'])(BienController.show)
 bien_bp.route('/', methods=['POST'])(BienController.store)
+bien_bp.route('/import', methods=['POST'])(BienController.import_bienes)
 bien_bp.route('/<int:id>', methods=['PUT'])(BienController.update)
 bien_bp.route('/<int:id>', methods=['DELETE'])(BienController.destroy)
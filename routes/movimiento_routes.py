@@ -6,5 +6,6 @@ movimiento_bp = Blueprint('movimiento_bp', __name__)
 movimiento_bp.route('/', methods=['GET'])(MovimientoController.index)
 movimiento_bp.route('/<int:id>', methods=['GET'])(MovimientoController.show)
 movimiento_bp.route('/', methods=['POST'])(MovimientoController.store)
+movimiento_bp.route('/bulk', methods=['POST'])(MovimientoController.store_bulk)
 movimiento_bp.route('/<int:id>', methods=['PUT'])(MovimientoController.update)
 movimiento_bp.route('/<int:id>', methods=['DELETE'])(MovimientoController.destroy)
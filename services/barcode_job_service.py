@@ -0,0 +1,193 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from config import BARCODE_JOBS_CONFIG
+from utils.barcode_generator import generate_barcodes_pdf
+
+
+class JobQueueFullError(RuntimeError):
+    """Hay demasiados trabajos pendientes en este proceso."""
+
+
+class BarcodeJobService:
+    """
+    Trabajos asíncronos de generación de PDF de códigos de barras.
+
+    `submit` responde de inmediato con un id y el PDF se genera en un pool
+    acotado de hilos del proceso. El estado de cada trabajo vive en disco
+    (`<directorio>/<id>/state.json`, escrito con os.replace), así que
+    cualquier worker de gunicorn puede informar el progreso y entregar el
+    resultado. Los trabajos vencidos (BARCODE_JOB_TTL) se borran.
+
+    Estados: queued -> running -> done | error.
+    """
+
+    RESULT_NAME = 'result.pdf'
+    # Un trabajo 'running' sin progreso por este tiempo murió con su proceso.
+    # Uno 'queued' no escribe nada mientras espera: solo vence por TTL
+    STALE_SECONDS = 300
+    # Escrituras de progreso a disco como máximo cada PROGRESS_INTERVAL segundos
+    PROGRESS_INTERVAL = 0.5
+
+    _executor = None
+    _executor_pid = None
+    _pending = 0
+    _lock = threading.Lock()
+
+    _JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+    @staticmethod
+    def _job_dir(job_id):
+        return os.path.join(BARCODE_JOBS_CONFIG['directory'], job_id)
+
+    @staticmethod
+    def _state_path(job_id):
+        return os.path.join(BarcodeJobService._job_dir(job_id), 'state.json')
+
+    @staticmethod
+    def result_path(job_id):
+        return os.path.join(BarcodeJobService._job_dir(job_id), BarcodeJobService.RESULT_NAME)
+
+    @staticmethod
+    def _read_state(job_id):
+        try:
+            with open(BarcodeJobService._state_path(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_state(job_id, state):
+        state = {**state, 'updated_at': time.time()}
+        job_dir = BarcodeJobService._job_dir(job_id)
+        fd, tmp_path = tempfile.mkstemp(dir=job_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, BarcodeJobService._state_path(job_id))
+        return state
+
+    @staticmethod
+    def _get_executor():
+        """Pool de hilos de trabajos del proceso actual (uno nuevo tras un fork)."""
+        pid = os.getpid()
+        if BarcodeJobService._executor is None or BarcodeJobService._executor_pid != pid:
+            BarcodeJobService._executor = ThreadPoolExecutor(
+                max_workers=BARCODE_JOBS_CONFIG['workers'], thread_name_prefix='barcode-job')
+            BarcodeJobService._executor_pid = pid
+            BarcodeJobService._pending = 0
+        return BarcodeJobService._executor
+
+    @staticmethod
+    def submit(records, download_name, render_mode='raster', total=None, render_profile='standard'):
+        """
+        Encola la generación del PDF de `records` y retorna el estado inicial
+        del trabajo. Lanza JobQueueFullError si el proceso ya tiene
+        BARCODE_JOB_MAX_PENDING trabajos en cola o en curso.
+
+        `records` es una lista o una función que retorna el iterable de
+        registros: se llama recién en el hilo del trabajo, así un trabajo en
+        cola no retiene una conexión de la base. `total` son las etiquetas
+        a imprimir, si se conocen (para el porcentaje).
+        """
+        BarcodeJobService.cleanup_expired()
+
+        with BarcodeJobService._lock:
+            executor = BarcodeJobService._get_executor()
+            if BarcodeJobService._pending >= BARCODE_JOBS_CONFIG['max_pending']:
+                raise JobQueueFullError("Hay demasiados trabajos de generación en curso, intente más tarde")
+            BarcodeJobService._pending += 1
+
+        try:
+            job_id = uuid.uuid4().hex
+            os.makedirs(BarcodeJobService._job_dir(job_id))
+            now = time.time()
+            state = BarcodeJobService._write_state(job_id, {
+                'id': job_id,
+                'status': 'queued',
+                'download_name': download_name,
+                'render_mode': render_mode,
+                'render_profile': render_profile,
+                'current': 0,
+                'total': total,
+                'error': None,
+                'created_at': now,
+                'expires_at': now + BARCODE_JOBS_CONFIG['ttl'],
+            })
+            executor.submit(BarcodeJobService._run, job_id, records, state)
+        except Exception:
+            # El trabajo no llegó al pool: _run no liberará su lugar
+            with BarcodeJobService._lock:
+                BarcodeJobService._pending -= 1
+            shutil.rmtree(BarcodeJobService._job_dir(job_id), ignore_errors=True)
+            raise
+        return state
+
+    @staticmethod
+    def _run(job_id, records, state):
+        last_write = 0.0
+
+        def progress(current, total):
+            nonlocal state, last_write
+            now = time.monotonic()
+            if current == total or now - last_write >= BarcodeJobService.PROGRESS_INTERVAL:
+                state = BarcodeJobService._write_state(job_id, {**state, 'current': current, 'total': total})
+                last_write = now
+
+        try:
+            state = BarcodeJobService._write_state(job_id, {**state, 'status': 'running'})
+            generate_barcodes_pdf(
+                records() if callable(records) else records,
+                output_filename=os.path.abspath(BarcodeJobService.result_path(job_id)),
+                progress_callback=progress,
+                render_mode=state['render_mode'],
+                total=state['total'],
+                render_profile=state['render_profile']
+            )
+            BarcodeJobService._write_state(job_id, {**state, 'status': 'done'})
+        except Exception as e:
+            print(f"❌ Error en el trabajo de códigos de barras {job_id}:", e)
+            try:
+                BarcodeJobService._write_state(job_id, {**state, 'status': 'error', 'error': str(e)})
+            except OSError:
+                pass
+        finally:
+            with BarcodeJobService._lock:
+                BarcodeJobService._pending -= 1
+
+    @staticmethod
+    def get(job_id):
+        """Estado del trabajo, o None si no existe o ya venció."""
+        if not BarcodeJobService._JOB_ID.match(job_id or ''):
+            return None
+        state = BarcodeJobService._read_state(job_id)
+        if state is None:
+            return None
+        now = time.time()
+        if state['expires_at'] < now:
+            shutil.rmtree(BarcodeJobService._job_dir(job_id), ignore_errors=True)
+            return None
+        if state['status'] == 'running' and now - state['updated_at'] > BarcodeJobService.STALE_SECONDS:
+            state = {**state, 'status': 'error', 'error': 'El trabajo se interrumpió'}
+        return state
+
+    @staticmethod
+    def cleanup_expired():
+        """Borra los trabajos vencidos. Retorna cuántos se borraron."""
+        directory = BARCODE_JOBS_CONFIG['directory']
+        if not os.path.isdir(directory):
+            return 0
+        removed = 0
+        now = time.time()
+        for job_id in os.listdir(directory):
+            state = BarcodeJobService._read_state(job_id)
+            if state is not None and state['expires_at'] < now:
+                shutil.rmtree(BarcodeJobService._job_dir(job_id), ignore_errors=True)
+                removed += 1
+        return removed
@@ -0,0 +1,45 @@
+from config import BARCODE_CONFIG, PDF_CACHE_CONFIG
+from models.data_version_model import DataVersionModel
+from utils.barcode_generator import LABEL_LAYOUT_VERSION
+from utils.cache import DiskCache
+
+
+class BarcodePdfCacheService:
+    """
+    Caché en disco de PDFs de etiquetas (o sus comandos ZPL/EPL) ya
+    generados.
+
+    La clave se arma con la petición normalizada (oficinas, filtro o
+    selección), las opciones de salida (modo, perfil y formato), la
+    versión del diseño de etiqueta y la versión de datos
+    (DataVersionModel), que sube con cada escritura sobre bienes o
+    movimientos: un PDF en caché nunca queda desactualizado y no hace
+    falta invalidarlo. La clave sirve también de ETag.
+
+    Tamaño acotado por PDF_CACHE_MAX_MB con desalojo LRU (ver DiskCache).
+    """
+
+    _cache = DiskCache(**PDF_CACHE_CONFIG)
+
+    @staticmethod
+    def key(kind, params, options, versioned=True):
+        """
+        Clave de la salida para la petición `kind` ('offices', 'filter' o
+        'selection') con sus parámetros ya normalizados y sus opciones de
+        salida. Con versioned=False (selección: los registros vienen en el
+        body) no se consulta la versión de datos.
+        """
+        version = DataVersionModel.current() if versioned else None
+        # ZPL/EPL dependen además de la resolución de la impresora
+        printer_dpmm = BARCODE_CONFIG['printer_dpmm'] if options['output_format'] != 'pdf' else None
+        return DiskCache.key('pdf', kind, params, options, printer_dpmm, LABEL_LAYOUT_VERSION, version)
+
+    @staticmethod
+    def open(key):
+        """Archivo del PDF en caché abierto en modo binario, o None."""
+        return BarcodePdfCacheService._cache.open_entry(key)
+
+    @staticmethod
+    def store(key, chunks):
+        """Reenvía los fragmentos del PDF y lo guarda si se generó completo."""
+        return BarcodePdfCacheService._cache.tee(key, chunks)
@@ -0,0 +1,87 @@
+from database.backends import get_backend
+from models.data_version_model import DataVersionModel
+from utils.cache import TTLCache
+
+
+class InvalidCountModeError(ValueError):
+    """El parámetro `count` no es uno de CountService.MODES."""
+
+
+class CountService:
+    """
+    Estrategias para obtener el total de un listado paginado.
+
+    - exact: COUNT(*) en cada petición.
+    - cached: COUNT(*) exacto, reutilizado mientras no cambien los filtros
+      ni la versión de datos (ver DataVersionModel). Es el modo por defecto.
+    - estimate: estimación del optimizador vía EXPLAIN, sin recorrer filas
+      (solo MySQL; en otros backends se comporta como 'cached').
+    - none: no se calcula el total.
+    """
+
+    MODES = ('exact', 'cached', 'estimate', 'none')
+    DEFAULT_MODE = 'cached'
+    # La versión de datos forma parte de la clave: el TTL solo acota memoria
+    _cache = TTLCache(max_entries=512, ttl=3600)
+
+    @staticmethod
+    def parse_mode(value):
+        """Modo pedido en `?count=`; DEFAULT_MODE si no se indicó."""
+        value = (value or '').strip().lower()
+        if not value:
+            return CountService.DEFAULT_MODE
+        if value not in CountService.MODES:
+            raise InvalidCountModeError(f"count debe ser uno de: {', '.join(CountService.MODES)}")
+        return value
+
+    @staticmethod
+    def total(cursor, namespace, from_where, params, mode=DEFAULT_MODE):
+        """
+        Retorna el total de filas de `SELECT ... {from_where}` según `mode`.
+
+        `from_where` es el fragmento "FROM ... WHERE ..." del listado y
+        `namespace` identifica el listado en la clave del caché.
+        """
+        if mode == 'none':
+            return None
+        if mode == 'estimate':
+            estimate = CountService._estimate(cursor, from_where, params)
+            if estimate is not None:
+                return estimate
+            mode = 'cached'
+        if mode == 'exact':
+            return CountService._exact(cursor, from_where, params)
+
+        key = (namespace, from_where, tuple(params), DataVersionModel.get(cursor))
+        hit, total = CountService._cache.get(key)
+        if hit:
+            return total
+
+        total = CountService._exact(cursor, from_where, params)
+        CountService._cache.set(key, total)
+        return total
+
+    @staticmethod
+    def _exact(cursor, from_where, params):
+        cursor.execute(f"SELECT COUNT(*) AS total {from_where}", tuple(params))
+        return int(cursor.fetchone()['total'])
+
+    @staticmethod
+    def _estimate(cursor, from_where, params):
+        """Filas estimadas: producto de rows * filtered de cada tabla del plan."""
+        if not get_backend().SUPPORTS_EXPLAIN:
+            return None
+        try:
+            cursor.execute(f"EXPLAIN SELECT 1 {from_where}", tuple(params))
+            plan = cursor.fetchall()
+        except Exception as e:
+            print("⚠️ No se pudo estimar el total:", e)
+            return None
+
+        estimate = None
+        for row in plan:
+            if row.get('rows') is None:
+                continue
+            filtered = float(row.get('filtered') or 100)
+            estimate = (estimate or 1.0) * float(row['rows']) * filtered / 100
+        return int(round(estimate)) if estimate is not None else None
@@ -0,0 +1,183 @@
+"""
+Pruebas de los trabajos asíncronos de PDF de códigos de barras
+(BarcodeJobService y los endpoints /barcode/jobs).
+
+    python -m pytest -q test_barcode_jobs.py
+"""
+import json
+import os
+import threading
+import time
+
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ.setdefault("SECRET_KEY", "pruebas")
+
+import pytest
+
+import services.barcode_job_service as job_module
+from app import app
+from config import BARCODE_JOBS_CONFIG
+from services.barcode_job_service import BarcodeJobService, JobQueueFullError
+
+RECORDS = [
+    {"codigo": f"7408{i:08d}", "detalle_bien": "SILLA GIRATORIA", "tipo_registro": "SIGA",
+     "oficina": "OFICINA DE LOGÍSTICA"}
+    for i in range(12)
+]
+
+
+@pytest.fixture(autouse=True)
+def directorio_trabajos(tmp_path, monkeypatch):
+    monkeypatch.setitem(BARCODE_JOBS_CONFIG, "directory", str(tmp_path / "jobs"))
+    os.makedirs(BARCODE_JOBS_CONFIG["directory"])
+    # Pool nuevo por prueba: _get_executor reinicia también _pending
+    monkeypatch.setattr(BarcodeJobService, "_executor", None)
+    yield
+    if BarcodeJobService._executor is not None:
+        BarcodeJobService._executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def generacion_bloqueada(monkeypatch):
+    """Los trabajos quedan 'running' hasta que se llame a .set()."""
+    liberar = threading.Event()
+
+    def generate(records, **kwargs):
+        list(records)
+        liberar.wait(10)
+
+    monkeypatch.setattr(job_module, "generate_barcodes_pdf", generate)
+    yield liberar
+    liberar.set()
+
+
+def _esperar(job_id, status, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = BarcodeJobService.get(job_id)
+        if state and state["status"] == status:
+            return state
+        time.sleep(0.05)
+    raise AssertionError(f"el trabajo no llegó a '{status}': {BarcodeJobService.get(job_id)}")
+
+
+def _esperar_lugares(timeout=30):
+    """Espera a que los trabajos liberen su lugar en la cola ('done' se escribe antes)."""
+    deadline = time.monotonic() + timeout
+    while BarcodeJobService._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert BarcodeJobService._pending == 0
+
+
+def _envejecer(job_id, **cambios):
+    """Reescribe el estado en disco tal cual, sin tocar updated_at."""
+    state = {**BarcodeJobService._read_state(job_id), **cambios}
+    path = BarcodeJobService._state_path(job_id)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+def test_trabajo_completo_y_descarga():
+    client = app.test_client()
+    response = client.post("/barcode/generate/selection", json={"bienes": RECORDS, "async": True})
+    assert response.status_code == 202
+    job = response.get_json()["job"]
+    assert job["status"] in ("queued", "running", "done")
+
+    state = _esperar(job["id"], "done")
+    # Las etiquetas más el separador de la oficina
+    assert state["current"] == state["total"] == len(RECORDS) + 1
+
+    job = client.get(job["status_url"]).get_json()["job"]
+    assert job["percent"] == 100
+    download = client.get(job["download_url"])
+    assert download.status_code == 200
+    assert download.mimetype == "application/pdf"
+    assert download.data.startswith(b"%PDF")
+    download.close()
+
+
+def test_descarga_antes_de_terminar(generacion_bloqueada):
+    client = app.test_client()
+    job = client.post("/barcode/generate/selection", json={"bienes": RECORDS, "async": True}).get_json()["job"]
+    _esperar(job["id"], "running")
+
+    response = client.get(f"/barcode/jobs/{job['id']}/download")
+    assert response.status_code == 409
+    assert response.get_json()["job"]["status"] == "running"
+
+    generacion_bloqueada.set()
+    _esperar(job["id"], "done")
+
+
+def test_trabajo_vencido():
+    state = BarcodeJobService.submit(RECORDS[:1], "etiquetas.pdf")
+    _esperar(state["id"], "done")
+    _envejecer(state["id"], expires_at=time.time() - 1)
+
+    response = app.test_client().get(f"/barcode/jobs/{state['id']}")
+    assert response.status_code == 404
+    assert not os.path.exists(BarcodeJobService._job_dir(state["id"]))
+
+
+def test_limpieza_de_vencidos():
+    state = BarcodeJobService.submit(RECORDS[:1], "etiquetas.pdf")
+    _esperar(state["id"], "done")
+    _envejecer(state["id"], expires_at=time.time() - 1)
+
+    assert BarcodeJobService.cleanup_expired() == 1
+    assert os.listdir(BARCODE_JOBS_CONFIG["directory"]) == []
+
+
+def test_limite_de_la_cola(generacion_bloqueada, monkeypatch):
+    monkeypatch.setitem(BARCODE_JOBS_CONFIG, "max_pending", 2)
+    primeros = [BarcodeJobService.submit(RECORDS, "etiquetas.pdf") for _ in range(2)]
+
+    response = app.test_client().post("/barcode/generate/selection", json={"bienes": RECORDS, "async": True})
+    assert response.status_code == 503
+    with pytest.raises(JobQueueFullError):
+        BarcodeJobService.submit(RECORDS, "etiquetas.pdf")
+
+    # Al terminar los trabajos se liberan sus lugares
+    generacion_bloqueada.set()
+    for state in primeros:
+        _esperar(state["id"], "done")
+    _esperar_lugares()
+    _esperar(BarcodeJobService.submit(RECORDS[:1], "etiquetas.pdf")["id"], "done")
+
+
+def test_fallo_al_encolar_libera_el_lugar(monkeypatch):
+    monkeypatch.setitem(BARCODE_JOBS_CONFIG, "max_pending", 1)
+
+    def write_state(job_id, state):
+        raise OSError("disco lleno")
+
+    with monkeypatch.context() as m:
+        m.setattr(BarcodeJobService, "_write_state", staticmethod(write_state))
+        for _ in range(3):
+            with pytest.raises(OSError):
+                BarcodeJobService.submit(RECORDS, "etiquetas.pdf")
+
+    assert BarcodeJobService._pending == 0
+    assert os.listdir(BARCODE_JOBS_CONFIG["directory"]) == []
+    _esperar(BarcodeJobService.submit(RECORDS[:1], "etiquetas.pdf")["id"], "done")
+
+
+def test_en_cola_no_se_marca_interrumpido(generacion_bloqueada, monkeypatch):
+    monkeypatch.setitem(BARCODE_JOBS_CONFIG, "workers", 1)
+    en_curso = BarcodeJobService.submit(RECORDS, "etiquetas.pdf")
+    en_cola = BarcodeJobService.submit(RECORDS, "etiquetas.pdf")
+    _esperar(en_curso["id"], "running")
+
+    viejo = time.time() - BarcodeJobService.STALE_SECONDS - 1
+    _envejecer(en_cola["id"], updated_at=viejo)
+    assert BarcodeJobService.get(en_cola["id"])["status"] == "queued"
+
+    # Un trabajo 'running' sin progreso sí murió con su proceso
+    _envejecer(en_curso["id"], updated_at=viejo)
+    state = BarcodeJobService.get(en_curso["id"])
+    assert state["status"] == "error"
+    assert state["error"] == "El trabajo se interrumpió"
+
+    generacion_bloqueada.set()
+    _esperar(en_cola["id"], "done")
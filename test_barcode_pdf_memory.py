@@ -0,0 +1,62 @@
+"""
+Memoria del PDF de etiquetas: el pico no debe crecer con el número de
+etiquetas (registros, render y páginas fluyen hasta el archivo).
+
+    python -m pytest -q test_barcode_pdf_memory.py
+"""
+import gc
+import os
+import tracemalloc
+
+# Sin base de datos; igual que en test_models_sqlite, para que el orden de
+# importación entre archivos de prueba no fije la configuración
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ.setdefault("SECRET_KEY", "pruebas")
+
+import pytest
+from PIL import Image
+
+import utils.barcode_generator as barcode_generator
+
+MB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def etiqueta_fija(monkeypatch):
+    # El render real (~30 ms por etiqueta) no cambia la memoria del flujo:
+    # se reemplaza por un PNG pequeño para que 20 mil etiquetas tarden poco
+    png = barcode_generator._png_bytes(Image.new("L", (64, 32), 255))
+    monkeypatch.setattr(barcode_generator, "_render_item", lambda template, item, profile="standard": png)
+
+
+def _records(count, per_office=500):
+    """Generador de registros: ninguna lista con todas las filas."""
+    for i in range(count):
+        yield (f"7408{i:08d}", "SILLA GIRATORIA", "SIGA", f"OFICINA {i // per_office:03d}")
+
+
+def _peak(tmp_path, count):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        barcode_generator.generate_barcodes_pdf(
+            _records(count),
+            output_filename=str(tmp_path / f"etiquetas_{count}.pdf"),
+            workers=1
+        )
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_memoria_acotada(tmp_path):
+    small = _peak(tmp_path, 2_000)
+    large = _peak(tmp_path, 20_000)
+
+    assert large < 8 * MB
+    # 10 veces más etiquetas: solo crece la tabla xref (8 bytes por objeto)
+    assert large - small < 1 * MB, (small, large)
+
+    with open(tmp_path / "etiquetas_20000.pdf", "rb") as f:
+        f.seek(-6, 2)
+        assert f.read() == b"%%EOF\n"
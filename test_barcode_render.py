@@ -0,0 +1,113 @@
+"""
+Renderizado de etiquetas en paralelo: si el pool de procesos falla, la
+continuación en serie debe producir exactamente las mismas etiquetas.
+
+    python -m pytest -q test_barcode_render.py
+"""
+import os
+from concurrent.futures import CancelledError, Future
+from concurrent.futures.process import BrokenProcessPool
+
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ.setdefault("SECRET_KEY", "pruebas")
+
+import pytest
+
+import utils.barcode_generator as barcode_generator
+
+
+class _FakePool:
+    """
+    Pool en el mismo proceso que falla con `error` en el result() o
+    submit() número `fail_at`.
+    """
+
+    def __init__(self, fail_at, fail_on="result", error=BrokenProcessPool("pool roto")):
+        self.fail_at = fail_at
+        self.fail_on = fail_on
+        self.error = error
+        self.calls = 0
+        self._broken = False
+        self.shutdowns = []
+
+    def _fail(self, kind):
+        if kind == self.fail_on:
+            self.calls += 1
+            return self.calls == self.fail_at
+        return False
+
+    def submit(self, fn, *args):
+        if self._fail("submit"):
+            raise self.error
+        future = Future()
+        if self._fail("result"):
+            future.set_exception(self.error)
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns.append(cancel_futures)
+
+
+@pytest.fixture(autouse=True)
+def render_rapido(monkeypatch):
+    # El contenido de cada PNG identifica su item: se comparan órdenes
+    monkeypatch.setattr(barcode_generator, "_render_item",
+                        lambda template, item, profile="standard": repr(item).encode())
+    monkeypatch.setattr(barcode_generator, "_reset_executor", lambda executor: None)
+    monkeypatch.setitem(barcode_generator.BARCODE_CONFIG, "chunk_size", 2)
+
+
+def _items(count=20):
+    return [("label", f"7408{i:08d}", "SILLA", "SIGA") for i in range(count)]
+
+
+@pytest.mark.parametrize("fail_on, fail_at", [
+    ("result", 1),   # primer bloque entregado
+    ("result", 3),   # bloque intermedio
+    ("submit", 1),   # el primer envío al pool
+    ("submit", 6),   # un envío con bloques ya en curso
+])
+def test_falla_del_pool_continua_en_serie(monkeypatch, fail_on, fail_at):
+    expected = list(barcode_generator.render_labels(_items(), workers=1))
+
+    monkeypatch.setattr(barcode_generator, "_get_executor", lambda workers: _FakePool(fail_at, fail_on))
+    assert list(barcode_generator.render_labels(_items(), workers=2)) == expected
+
+
+def test_pool_sin_fallas(monkeypatch):
+    expected = list(barcode_generator.render_labels(_items(), workers=1))
+
+    monkeypatch.setattr(barcode_generator, "_get_executor", lambda workers: _FakePool(0))
+    assert list(barcode_generator.render_labels(_items(), workers=2)) == expected
+
+
+@pytest.mark.parametrize("fail_on, error", [
+    # Otro hilo cerró el pool compartido
+    ("result", CancelledError()),
+    ("submit", RuntimeError("cannot schedule new futures after shutdown")),
+])
+def test_pool_cerrado_por_otro_hilo_continua_en_serie(monkeypatch, fail_on, error):
+    expected = list(barcode_generator.render_labels(_items(), workers=1))
+
+    pool = _FakePool(2, fail_on, error)
+    monkeypatch.setattr(barcode_generator, "_get_executor", lambda workers: pool)
+    assert list(barcode_generator.render_labels(_items(), workers=2)) == expected
+
+
+def test_reset_solo_descarta_pool_roto(monkeypatch):
+    monkeypatch.undo()
+    sano, roto = _FakePool(0), _FakePool(0)
+    roto._broken = "un proceso murió"
+
+    monkeypatch.setattr(barcode_generator, "_executor", sano)
+    barcode_generator._reset_executor(sano)
+    assert barcode_generator._executor is sano
+    assert sano.shutdowns == []
+
+    monkeypatch.setattr(barcode_generator, "_executor", roto)
+    barcode_generator._reset_executor(roto)
+    assert barcode_generator._executor is None
+    # Sin cancelar tareas de otros hilos
+    assert roto.shutdowns == [False]
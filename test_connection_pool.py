@@ -0,0 +1,209 @@
+"""
+Pruebas del pool de conexiones (database.connection) con conexiones
+falsas: límite y espera, reciclaje, ping, rollback al devolver y
+descarte de los flujos sin terminar.
+
+    python -m pytest -q test_connection_pool.py
+"""
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import database.connection as connection
+from database.connection import ConnectionPool, PoolTimeoutError, stream_query
+
+
+class _FakeRaw:
+    """Conexión del backend que registra lo que el pool hace con ella."""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.rollbacks = 0
+        self.pings = 0
+        self.fail_ping = False
+        self.fail_rollback = False
+
+    def close(self):
+        self.closed = True
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.fail_rollback:
+            raise OSError("conexión perdida")
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if self.fail_ping:
+            raise OSError("el servidor cerró la conexión")
+
+
+class _Factory:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        raw = _FakeRaw(len(self.created))
+        self.created.append(raw)
+        return raw
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def factory():
+    return _Factory()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(connection, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _pool(factory, **options):
+    options = {"min_size": 0, "max_size": 2, "timeout": 0.1, "ping_interval": 60, **options}
+    return ConnectionPool(factory, **options)
+
+
+def test_max_size_y_timeout(factory):
+    pool = _pool(factory)
+    first, second = pool.acquire(), pool.acquire()
+    assert pool.size == 2
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    # Un hilo en espera recibe la conexión que se devuelve
+    pool.timeout = 5
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    first.close()
+    waiter.join(5)
+    assert got and got[0].raw is first.raw
+    assert pool.size == 2
+    assert len(factory.created) == 2
+    second.close()
+
+
+def test_reciclaje_por_max_lifetime(factory, clock):
+    pool = _pool(factory, max_lifetime=1800)
+    conn = pool.acquire()
+    old = conn.raw
+    conn.close()
+    assert pool.idle == 1
+
+    # Libre más allá de max_lifetime: se cierra y se abre otra
+    clock.now += 1801
+    conn = pool.acquire()
+    assert conn.raw is not old
+    assert old.closed
+    assert pool.size == 1
+
+    # Vencida mientras estaba en uso: al devolverla se cierra
+    clock.now += 1801
+    raw = conn.raw
+    conn.close()
+    assert raw.closed
+    assert pool.size == 0
+    assert pool.idle == 0
+
+
+def test_ping_fallido_descarta_la_conexion(factory, clock):
+    pool = _pool(factory, ping_interval=5)
+    conn = pool.acquire()
+    old = conn.raw
+    conn.close()
+
+    # Usada hace poco: se entrega sin ping
+    conn = pool.acquire()
+    assert conn.raw is old and old.pings == 0
+    conn.close()
+
+    # Libre más de ping_interval y el ping falla: se cierra y se abre otra
+    clock.now += 10
+    old.fail_ping = True
+    conn = pool.acquire()
+    assert old.pings == 1
+    assert old.closed
+    assert conn.raw is not old
+    assert pool.size == 1
+    conn.close()
+
+
+def test_rollback_al_devolver(factory):
+    pool = _pool(factory)
+    conn = pool.acquire()
+    conn.close()
+    assert conn.raw.rollbacks == 1
+    assert pool.idle == 1
+
+    # Un error dentro del bloque hace rollback antes de devolverla
+    with pytest.raises(ValueError):
+        with pool.acquire() as conn:
+            raise ValueError("falla en la transacción")
+    assert conn.raw.rollbacks == 3
+    assert pool.idle == 1
+
+    # Si el rollback falla, la conexión no vuelve al pool
+    conn = pool.acquire()
+    conn.raw.fail_rollback = True
+    conn.close()
+    assert conn.raw.closed
+    assert pool.size == 0 and pool.idle == 0
+
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.closed = False
+
+    def execute(self, sql, params=()):
+        pass
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool_de_flujo(factory, monkeypatch):
+    pool = _pool(factory)
+    monkeypatch.setattr(connection, "_pool", pool)
+    monkeypatch.setattr(connection, "_pool_pid", os.getpid())
+    backend = SimpleNamespace(stream_cursor=lambda conn: _FakeCursor({"id": i} for i in range(10)))
+    monkeypatch.setattr(connection, "get_backend", lambda: backend)
+    return pool
+
+
+def test_stream_query_completo_devuelve_la_conexion(pool_de_flujo, factory):
+    rows = list(stream_query("SELECT id FROM bienes", batch_size=3))
+    assert [row["id"] for row in rows] == list(range(10))
+    assert pool_de_flujo.idle == 1
+    assert not factory.created[0].closed
+
+
+def test_stream_query_abandonado_descarta_la_conexion(pool_de_flujo, factory):
+    rows = stream_query("SELECT id FROM bienes", batch_size=3)
+    assert next(rows) == {"id": 0}
+    rows.close()
+
+    # Quedaron filas sin leer: la conexión se cierra en vez de volver al pool
+    assert factory.created[0].closed
+    assert pool_de_flujo.size == 0
+    assert pool_de_flujo.idle == 0
@@ -0,0 +1,90 @@
+"""
+Pruebas de DiskCache: desalojo LRU por mtime y publicación de `tee` solo
+cuando el flujo se consume completo.
+
+    python -m pytest -q test_disk_cache.py
+"""
+import os
+import time
+
+import pytest
+
+from utils.cache import DiskCache
+
+ENTRY = b"x" * 100
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return DiskCache(str(tmp_path / "cache"), max_bytes=1000, prune_every=1000)
+
+
+def _files(disk_cache):
+    return sorted(name for _, _, names in os.walk(disk_cache.directory) for name in names)
+
+
+def _fill(disk_cache, count):
+    """`count` entradas de 100 bytes, de la más antigua (k0) a la más nueva."""
+    keys = [DiskCache.key("k", i) for i in range(count)]
+    old = time.time() - 1000
+    for i, key in enumerate(keys):
+        disk_cache.set(key, ENTRY)
+        os.utime(disk_cache.path(key), (old + i, old + i))
+    return keys
+
+
+def test_desalojo_hasta_el_90_por_ciento(disk_cache):
+    keys = _fill(disk_cache, 10)
+    assert disk_cache.stats()["evictions"] == 0
+
+    # 1100 bytes > 1000: se borran las más antiguas hasta 900
+    nueva = DiskCache.key("nueva")
+    disk_cache.set(nueva, ENTRY)
+
+    assert disk_cache.get(keys[0]) is None
+    assert disk_cache.get(keys[1]) is None
+    assert all(disk_cache.get(key) == ENTRY for key in keys[2:] + [nueva])
+    assert disk_cache.stats()["evictions"] == 2
+    assert sum(os.path.getsize(disk_cache.path(key)) for key in keys[2:] + [nueva]) == 900
+
+
+def test_acierto_actualiza_mtime(disk_cache):
+    keys = _fill(disk_cache, 10)
+    before = os.path.getmtime(disk_cache.path(keys[0]))
+
+    assert disk_cache.get(keys[0]) == ENTRY
+    assert os.path.getmtime(disk_cache.path(keys[0])) > before
+
+    # La entrada leída pasa a ser la más reciente: se desalojan k1 y k2
+    disk_cache.set(DiskCache.key("nueva"), ENTRY)
+    assert disk_cache.get(keys[0]) == ENTRY
+    assert disk_cache.get(keys[1]) is None
+    assert disk_cache.get(keys[2]) is None
+
+
+def test_tee_completo_publica_la_entrada(disk_cache):
+    key = DiskCache.key("pdf")
+    assert b"".join(disk_cache.tee(key, [b"%PDF", b"-1.4"])) == b"%PDF-1.4"
+    assert disk_cache.get(key) == b"%PDF-1.4"
+    assert _files(disk_cache) == [key]
+
+
+def test_tee_interrumpido_no_deja_entrada(disk_cache):
+    key = DiskCache.key("pdf")
+
+    # Cliente desconectado: el servidor cierra el generador a medio camino
+    stream = disk_cache.tee(key, iter([b"uno", b"dos", b"tres"]))
+    assert next(stream) == b"uno"
+    stream.close()
+    assert disk_cache.get(key) is None
+    assert _files(disk_cache) == []
+
+    # Error al generar los fragmentos
+    def chunks():
+        yield b"uno"
+        raise RuntimeError("falló el render")
+
+    with pytest.raises(RuntimeError):
+        list(disk_cache.tee(key, chunks()))
+    assert disk_cache.get(key) is None
+    assert _files(disk_cache) == []
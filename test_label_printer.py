@@ -0,0 +1,86 @@
+"""
+Salida ZPL y EPL de las etiquetas comparada con archivos de referencia
+(test_golden/). Si el diseño cambia a propósito, regenerarlos con:
+
+    UPDATE_GOLDEN=1 python -m pytest -q test_label_printer.py
+"""
+import os
+
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ.setdefault("SECRET_KEY", "pruebas")
+
+import pytest
+
+from utils.barcode_generator import LOGO_PATH
+from utils.label_printer import ZPL_LOGO_NAME, generate_label_commands
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_golden")
+
+# Dos oficinas (dos separadores) y textos con caracteres que la impresora
+# interpreta: tildes, ^ ~ _ \ y comillas
+RECORDS = [
+    ("740800000001", "SILLA GIRATORIA DE METAL CON RUEDAS Y APOYABRAZOS", "SIGA", "DIRECCIÓN DE GESTIÓN PEDAGÓGICA"),
+    ("740800000002", "MONITOR 24\" ^LED~ MODELO_X \\ HDMI", "SOBRANTE", "DIRECCIÓN DE GESTIÓN PEDAGÓGICA"),
+    ("ABC-123", None, None, "ÁREA DE ABASTECIMIENTO"),
+    # En el código de barras (sin ^FB) la barra invertida va tal cual
+    ("AB\\C_1", "TECLADO", "SIGA", "ÁREA DE ABASTECIMIENTO"),
+]
+
+
+def _commands(label_format, **kwargs):
+    kwargs.setdefault("logo_path", None)
+    return b"".join(generate_label_commands(RECORDS, label_format, dpmm=8, **kwargs))
+
+
+@pytest.mark.parametrize("label_format", ["zpl", "epl"])
+def test_golden(label_format):
+    path = os.path.join(GOLDEN_DIR, f"labels.{label_format}")
+    output = _commands(label_format)
+    if os.environ.get("UPDATE_GOLDEN"):
+        with open(path, "wb") as f:
+            f.write(output)
+    with open(path, "rb") as f:
+        assert output == f.read()
+
+
+def test_una_etiqueta_por_fragmento():
+    chunks = list(generate_label_commands(RECORDS, "epl", logo_path=None, dpmm=8))
+    # 2 separadores + 4 etiquetas
+    assert len(chunks) == 6
+    assert all(chunk.endswith(b"P1\n") for chunk in chunks)
+
+
+@pytest.mark.skipif(not os.path.exists(LOGO_PATH), reason="sin logo")
+def test_logo_zpl_se_envia_una_vez():
+    output = _commands("zpl", logo_path=LOGO_PATH).decode("utf-8")
+    assert output.startswith(f"~DG{ZPL_LOGO_NAME},")
+    assert output.count("~DG") == 1
+    assert output.count(f"^XG{ZPL_LOGO_NAME}") == len(RECORDS)
+
+
+def test_codigo_de_barras_zpl():
+    output = _commands("zpl").decode("utf-8")
+    assert "^BCN,64,Y,N,N,A^FH^FDAB\\C_5F1^FS" in output
+
+
+def test_formato_invalido():
+    with pytest.raises(ValueError):
+        list(generate_label_commands(RECORDS, "pdf"))
+    with pytest.raises(ValueError):
+        list(generate_label_commands(RECORDS, "epl", dpmm=24))
+
+
+def test_opciones_sin_efecto_comparten_cache():
+    from controllers.barcode_controller import BarcodeController
+    from services.barcode_pdf_cache_service import BarcodePdfCacheService
+
+    def key(**data):
+        options = BarcodeController._output_options(data)
+        return BarcodePdfCacheService.key("selection", RECORDS, options, versioned=False)
+
+    # El perfil solo cambia el PDF raster; el modo, solo el PDF
+    assert key(render_mode="vector", render_profile="draft") == key(render_mode="vector")
+    assert key(output_format="zpl", render_mode="vector", render_profile="bilevel") == key(output_format="zpl")
+    assert key(render_profile="draft") != key()
+    with pytest.raises(ValueError):
+        key(output_format="epl", render_profile="nitido")
@@ -0,0 +1,354 @@
+"""
+Pruebas de los modelos sobre el backend SQLite (sin servidor MySQL).
+
+    python -m pytest -q test_models_sqlite.py
+"""
+import io
+import os
+
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ.setdefault("SECRET_KEY", "pruebas")
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from config import SQLITE_CONFIG
+from database.connection import get_connection, reset_pool
+from database.migrator import Migrator
+from models.bien_estado_model import BienEstadoModel
+from models.bien_model import BienModel
+from models.contador_model import ContadorModel
+from models.data_version_model import DataVersionModel
+from models.movimiento_model import MovimientoModel
+from services.count_service import CountService
+from services.import_service import ImportFormatError, ImportService
+from utils.cache import cache
+from utils.search import _text_branch
+
+FILTROS = {"search": None, "categoria": None, "estado": None, "ubicacion": None}
+
+
+@pytest.fixture(autouse=True)
+def base_vacia(tmp_path):
+    SQLITE_CONFIG["path"] = str(tmp_path / "inventario.sqlite3")
+    reset_pool()
+    cache.clear()
+    CountService._cache.clear()
+    DataVersionModel.forget()
+    with get_connection() as conn:
+        Migrator.upgrade(conn)
+        with conn.cursor() as cursor:
+            cursor.execute("INSERT INTO categorias (id, nombre) VALUES (1, 'MOBILIARIO'), (2, 'EQUIPO DE CÓMPUTO')")
+        conn.commit()
+    yield
+    reset_pool()
+
+
+def _bien(codigo, **data):
+    return {
+        "codigo_patrimonio": codigo,
+        "codigo_interno": "0001",
+        "detalle_bien": "SILLA GIRATORIA",
+        "descripcion": "SILLA GIRATORIA COLOR NEGRO",
+        "categoria_id": 1,
+        "marca": "GENÉRICO",
+        "estado": "BUENO",
+        "fecha_asignacion": "2024-03-01",
+        "ubicacion": "OFICINA DE LOGÍSTICA",
+        "responsable": "ANA QUISPE",
+        **data,
+    }
+
+
+def _drift():
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            return ContadorModel.reconcile(cursor)
+
+
+def test_create_y_listado():
+    assert BienModel.create(_bien("740800000001"))["success"]
+    assert BienModel.create(_bien("740800000002", estado="MALO", detalle_bien="IMPRESORA LÁSER"))["success"]
+
+    page = BienModel.get_paginated(1, 10, FILTROS)
+    assert page["pagination"]["total"] == 2
+    assert page["data"][0]["ubicacion_nombre"] == "OFICINA DE LOGÍSTICA"
+    assert page["data"][0]["categoria_nombre"] == "MOBILIARIO"
+
+    malos = BienModel.get_paginated(1, 10, {**FILTROS, "estado": "MALO"}, "exact")
+    assert [bien["detalle_bien"] for bien in malos["data"]] == ["IMPRESORA LÁSER"]
+
+    # 'estimate' no tiene EXPLAIN en SQLite: cae en 'cached'
+    assert BienModel.get_paginated(1, 10, FILTROS, "estimate")["pagination"]["total"] == 2
+
+    first = BienModel.get_by_cursor(None, 1, FILTROS)
+    second = BienModel.get_by_cursor(first["pagination"]["next_cursor"], 1, FILTROS)
+    assert first["data"][0]["id"] < second["data"][0]["id"]
+
+
+def _token(values):
+    from utils.pagination import encode_cursor
+    return encode_cursor(values)
+
+
+def test_cursor_invalido():
+    from utils.pagination import InvalidCursorError
+
+    for values in ([{"a": 1}], ["1"], [True], [1, 2]):
+        with pytest.raises(InvalidCursorError):
+            BienModel.get_by_cursor(_token(values), 10, FILTROS)
+    with pytest.raises(InvalidCursorError):
+        BienModel.get_by_cursor(None, 0, FILTROS)
+
+
+def test_cursor_barcode():
+    from app import app
+
+    oficinas = ["ALMACÉN", None, "OFICINA DE LOGÍSTICA"]
+    for i in range(7):
+        BienModel.create(_bien(f"7408000000{i:02d}", ubicacion=oficinas[i % 3]))
+    client = app.test_client()
+
+    # Recorrido completo por cursor: mismas filas y orden que por página
+    esperado = client.get("/barcode/bienes?per_page=50").get_json()["data"]
+    codigos, token = [], ""
+    while token is not None:
+        body = client.get("/barcode/bienes", query_string={"cursor": token, "per_page": 3}).get_json()
+        codigos += [bien["codigo_completo"] for bien in body["data"]]
+        token = body["pagination"]["next_cursor"]
+    assert codigos == [bien["codigo_completo"] for bien in esperado]
+    assert len(codigos) == 7
+
+    for values in ([{"a": 1}, "x", 1], ["x", "y", "1"], ["x", None, 1], ["x", "y"]):
+        response = client.get("/barcode/bienes", query_string={"cursor": _token(values)})
+        assert response.status_code == 400
+    assert client.get("/barcode/bienes?cursor=&per_page=0").status_code == 400
+
+
+def test_busqueda():
+    BienModel.create(_bien("740800000001"))
+    BienModel.create(_bien("740800000002", detalle_bien="IMPRESORA LÁSER", descripcion="IMPRESORA", marca="HP"))
+
+    def buscar(term):
+        page = BienModel.get_paginated(1, 10, {**FILTROS, "search": term})
+        return [bien["detalle_bien"] for bien in page["data"]]
+
+    assert buscar("impresora laser") == ["IMPRESORA LÁSER"]
+    assert buscar("impre") == ["IMPRESORA LÁSER"]
+    assert buscar("mpresora") == []
+    assert len(buscar("7408")) == 2
+    # Palabras más cortas que el mínimo de FULLTEXT: por LIKE
+    assert buscar("hp") == ["IMPRESORA LÁSER"]
+    assert buscar("impresora hp") == ["IMPRESORA LÁSER"]
+    assert buscar("silla hp") == []
+
+
+def test_busqueda_fulltext_con_palabras_cortas():
+    # En MySQL las palabras cortas se exigen con LIKE en la misma rama FULLTEXT
+    sql, params = _text_branch("search_text", "bien_busqueda", "impresora hp", fulltext=True)
+    assert "MATCH(search_text)" in sql and "LIKE" in sql
+    assert params == ["+IMPRESORA*", "+IMPRESORA*", "HP%", "% HP%"]
+
+    sql, params = _text_branch("search_text", "bien_busqueda", "hp", fulltext=True)
+    assert "MATCH" not in sql
+    assert params == ["HP%", "% HP%"]
+
+
+def test_update_destroy_y_contadores():
+    BienModel.create(_bien("740800000001"))
+    bien_id = BienModel.get_paginated(1, 10, FILTROS)["data"][0]["id"]
+
+    result = BienModel.update(bien_id, {**_bien("740800000001"), "estado": "REGULAR", "categoria_id": 2})
+    assert result["success"], result
+    assert result["data"]["estado"] == "REGULAR"
+
+    stats = BienModel.get_stats(True)
+    assert stats["total"] == 1 and stats["regulares"] == 1 and stats["buenos"] == 0
+    assert _drift() == []
+
+    BienModel.destroy(bien_id)
+    assert BienModel.get_stats()["total"] == 0
+    assert BienModel.get_paginated(1, 10, FILTROS)["pagination"]["total"] == 0
+    assert _drift() == []
+
+
+def test_movimientos():
+    BienModel.create_many([_bien(f"7408000000{i:02d}") for i in range(1, 6)])
+    ids = [bien["id"] for bien in BienModel.get_all()]
+    assert len(ids) == 5
+
+    assert MovimientoModel.create({"bien_id": ids[0], "tipo": "Traslado",
+                                   "ubicacion_actual": "DIRECCIÓN", "responsable": "LUIS ROJAS"})["success"]
+    assert BienModel.check_existence(BienModel.get_by_id(ids[0])["codigo_completo"])["ubicacion"] == "DIRECCIÓN"
+
+    result = MovimientoModel.create_bulk({"ubicacion_origen": "OFICINA DE LOGÍSTICA",
+                                          "ubicacion_destino": "ALMACÉN", "estado": "MALO"})
+    assert result["success"] and result["total"] == 4
+
+    almacen = BienModel.get_paginated(1, 10, {**FILTROS, "ubicacion": "ALMACÉN"})
+    assert almacen["pagination"]["total"] == 4
+    assert len(MovimientoModel.get_by_bien_id(ids[1])) == 2
+    assert len(list(MovimientoModel.stream_all(batch_size=2))) == 10
+    assert _drift() == []
+
+    # bien_ids debe ser una lista de enteros: "12" no mueve los bienes 1 y 2
+    for bien_ids in ("12", [1, "2"], [True], {"1": 1}):
+        result = MovimientoModel.create_bulk({"bien_ids": bien_ids, "ubicacion_destino": "ALMACÉN"})
+        assert result["status"] == 400, bien_ids
+
+
+def test_app_sin_servidor():
+    from app import app
+    from services.jwt_service import JWTService
+
+    BienModel.create(_bien("740800000001"))
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {JWTService.create_token({'id': 1, 'role_id': 1})}"}
+
+    response = client.get("/bienes/?page=1&per_page=5", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["pagination"]["total"] == 1
+    slowest = response.headers["Server-Timing"].split("db-slowest;", 1)[1]
+    assert 'desc="SELECT' in slowest
+    assert "740800000001" not in response.headers["Server-Timing"]
+
+    assert client.get("/bienes/stats", headers=headers).get_json()["total"] == 1
+    assert client.get("/bienes/?stream=ndjson", headers=headers).get_data(as_text=True).count("\n") == 1
+    assert client.get("/reportes/movements-chart").status_code == 200
+    assert client.get("/barcode/offices").status_code == 200
+
+    stats = client.get("/bienes/stats?cache=1", headers=headers).get_json()
+    assert stats["cache"]["namespaces"]["oficinas"]["misses"] >= 1
+
+
+def test_cache_sigue_escrituras_de_otros_workers():
+    BienModel.create(_bien("740800000001"))
+    assert BienEstadoModel.get_offices() == ["OFICINA DE LOGÍSTICA"]
+
+    # Escritura hecha por otro worker: aquí no se llama a invalidate()
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("UPDATE bien_estado_actual SET ubicacion_actual = 'ALMACÉN'")
+            DataVersionModel.bump(cursor)
+        conn.commit()
+    # La versión leída se reutiliza hasta CURRENT_TTL
+    assert BienEstadoModel.get_offices() == ["OFICINA DE LOGÍSTICA"]
+    DataVersionModel.forget()
+    assert BienEstadoModel.get_offices() == ["ALMACÉN"]
+
+
+def test_cache_sin_base_usa_la_ultima_version(monkeypatch):
+    import models.data_version_model as data_version_model
+
+    # La versión recordada vence de inmediato
+    monkeypatch.setattr(DataVersionModel, "CURRENT_TTL", 0)
+    BienModel.create(_bien("740800000001"))
+    assert BienEstadoModel.get_offices() == ["OFICINA DE LOGÍSTICA"]
+
+    def sin_base():
+        raise OSError("MySQL no responde")
+
+    # Sin base: el acierto del caché se sirve igual, con la última versión
+    hits = cache.stats()["namespaces"]["oficinas"]["hits"]
+    monkeypatch.setattr(data_version_model, "get_connection", sin_base)
+    assert BienEstadoModel.get_offices() == ["OFICINA DE LOGÍSTICA"]
+    assert cache.stats()["namespaces"]["oficinas"]["hits"] == hits + 1
+
+
+def test_create_many_ids_y_duplicados():
+    BienModel.create(_bien("740800000001"))
+    ids = BienModel.create_many([_bien(f"7408000000{i:02d}", detalle_bien=f"BIEN {i}") for i in range(1, 4)])
+    assert ids[0] is None
+    for bien_id, i in zip(ids[1:], (2, 3)):
+        assert BienModel.get_by_id(bien_id)["detalle_bien"] == f"BIEN {i}"
+    assert BienModel.get_stats(True)["total"] == 3
+    assert _drift() == []
+
+
+def test_importar_csv_windows_1252():
+    # Excel en español: ';' y Windows-1252 (no es UTF-8 válido)
+    content = "codigo_patrimonio;detalle_bien;ubicacion\n740800000001;CAÑÓN MULTIMEDIA;DIRECCIÓN\n"
+    file = FileStorage(io.BytesIO(content.encode("cp1252")), filename="bienes.csv")
+    report = ImportService.import_file(file)
+    assert report["insertadas"] == 1, report
+    assert BienModel.get_all()[0]["detalle_bien"] == "CAÑÓN MULTIMEDIA"
+
+    # Ni UTF-8 ni Windows-1252: error de formato antes de guardar nada
+    file = FileStorage(io.BytesIO(b"codigo_patrimonio;detalle_bien\n1;\x81\n"), filename="bienes.csv")
+    with pytest.raises(ImportFormatError):
+        ImportService.import_file(file)
+
+
+def test_migracion_llena_tablas_derivadas(capsys):
+    BienModel.create_many([_bien(f"7408000000{i:02d}", marca="HP") for i in range(1, 4)])
+    BienModel.create(_bien("740800000004", categoria_id=None, detalle_bien="CÁMARA (SONY)"))
+    BienModel.destroy(BienModel.check_existence("7408000000040001")["id"])
+
+    def _busqueda():
+        with get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT bien_id, search_text FROM bien_busqueda ORDER BY bien_id")
+                return cursor.fetchall()
+
+    busqueda = _busqueda()
+
+    # Base existente en v001: sin tablas derivadas
+    with get_connection() as conn:
+        assert [m.version for m in Migrator.downgrade(conn, "v001")] == ["v005", "v004", "v003", "v002"]
+        Migrator.upgrade(conn)
+    cache.clear()
+
+    # El llenado fijo de v002 coincide con el de los modelos actuales
+    assert _busqueda() == busqueda
+
+    assert BienModel.get_paginated(1, 10, {**FILTROS, "ubicacion": "OFICINA DE LOGÍSTICA"})["pagination"]["total"] == 3
+    assert BienModel.get_paginated(1, 10, {**FILTROS, "search": "hp"})["pagination"]["total"] == 3
+    assert _drift() == []
+
+    # El esquema base no se revierte: se informa y queda aplicado
+    with get_connection() as conn:
+        assert len(Migrator.downgrade(conn, "v000")) == 4
+        assert "no se puede revertir" in capsys.readouterr().out
+        assert [m.version for m, applied in Migrator.status(conn) if applied] == ["v001"]
+
+
+def test_version_de_datos_repartida():
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            before = DataVersionModel.get(cursor)
+            for _ in range(40):
+                DataVersionModel.bump(cursor)
+            assert DataVersionModel.get(cursor) == before + 40
+            cursor.execute("SELECT COUNT(*) AS filas FROM data_version_slots")
+            assert 1 < cursor.fetchone()["filas"] <= DataVersionModel.SLOTS
+        conn.commit()
+
+
+def test_contadores_repartidos():
+    for i in range(1, 31):
+        assert BienModel.create(_bien(f"7408000000{i:02d}"))["success"]
+    assert BienModel.get_stats(True)["total"] == 30
+
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS filas FROM bien_contadores WHERE dimension = 'total'")
+            assert 1 < cursor.fetchone()["filas"] <= ContadorModel.SLOTS
+            assert ContadorModel.get(cursor, ["total"]) == {"total": {"": 30}}
+
+            # reconcile junta las filas de cada contador en el slot 0
+            assert ContadorModel.reconcile(cursor) == []
+            cursor.execute("SELECT slot, total FROM bien_contadores WHERE dimension = 'total'")
+            assert cursor.fetchall() == [{"slot": 0, "total": 30}]
+        conn.commit()
+    assert BienModel.get_stats(True)["total"] == 30
+
+
+def test_count_invalido():
+    from app import app
+    from services.jwt_service import JWTService
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {JWTService.create_token({'id': 1, 'role_id': 1})}"}
+    assert client.get("/bienes/?page=1&count=exacto", headers=headers).status_code == 400
+    assert client.get("/barcode/bienes?count=exacto").status_code == 400
+    assert client.get("/bienes/?page=1&count=EXACT", headers=headers).get_json()["pagination"]["count_mode"] == "exact"
@@ -3,10 +3,22 @@ from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 from barcode import Code128
 from barcode.writer import ImageWriter
+from reportlab.pdfbase.pdfmetrics import getAscent, getDescent, stringWidth
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, landscape
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import BARCODE_CONFIG, LABEL_CACHE_CONFIG
+from utils.cache import DiskCache
+from utils.pdf_stream import StreamingPDFWriter
+import functools
+import itertools
+import multiprocessing
 import platform
 import os
+import tempfile
+import threading
 
 # Configuración
 OUTPUT_DIR = "assets/generated_barcodes"
@@ -21,11 +33,37 @@ BORDER_COLOR = "black"
 MARGIN = 6
 LOGO_RATIO_W = 0.22
 LOGO_RATIO_H = 0.32
-
-
+LABEL_TITLE = "INVENTARIO DRE HUÁNUCO - 2025"
+LOGO_PATH = "utils/logo.png"
+RENDER_MODES = ("raster", "vector")
+# Perfiles del modo raster: "standard" (RGB a 300 DPI), "bilevel" (1 bit
+# por píxel, para imprimir) y "draft" (RGB a DRAFT_DPI, vista previa)
+RENDER_PROFILES = ("standard", "bilevel", "draft")
+DRAFT_DPI = 150
+# Bytes por fragmento al enviar el PDF (stream_barcodes_pdf)
+SPOOL_READ_SIZE = 64 * 1024
+
+# Forma parte de la clave del caché de etiquetas: incrementarla al cambiar
+# el diseño invalida todas las etiquetas guardadas
+LABEL_LAYOUT_VERSION = 1
+
+# Geometría del código de barras base, en mm (la que usa ImageWriter con
+# sus opciones por defecto): zona de silencio, ancho de módulo, alto de
+# barras, márgenes, distancia y tamaño (pt) del texto legible
+BARCODE_QUIET_ZONE_MM = 6.5
+BARCODE_MODULE_MM = 0.2
+BARCODE_HEIGHT_MM = 15.0
+BARCODE_MARGIN_MM = 1.0
+BARCODE_TEXT_DISTANCE_MM = 5.0
+BARCODE_FONT_PT = 10
+BARCODE_RASTER_DPI = 600
+
+
+@functools.lru_cache(maxsize=None)
 def get_font(size: int = 25, bold: bool = False):
     """
     Retorna una fuente TrueType compatible según el sistema operativo.
+    Se carga una sola vez por proceso (tamaño, negrita).
     """
     system = platform.system()
 
@@ -53,15 +91,26 @@ def get_font(size: int = 25, bold: bool = False):
         return ImageFont.load_default()
 
 
+@functools.lru_cache(maxsize=8192)
+def _text_length(text, font):
+    """Ancho del texto en píxeles (memoizado: los detalles se repiten mucho)."""
+    return font.getlength(text)
+
+
 def wrap_text(draw, text, font, max_width):
     """Divide el texto en múltiples líneas sin que exceda el ancho máximo."""
+    return _wrap(text, max_width, lambda line: _text_length(line, font))
+
+
+def _wrap(text, max_width, width_of):
+    """wrap_text con una función de medida cualquiera (PIL o reportlab)."""
     words = text.split()
     lines = []
     current = ""
 
     for word in words:
         test_line = f"{current} {word}".strip()
-        width = draw.textlength(test_line, font=font)
+        width = width_of(test_line)
         if width <= max_width:
             current = test_line
         else:
@@ -90,23 +139,19 @@ def _create_canvas():
 
 
 def _generate_base_barcode(codigo: str):
-    """Genera el código de barras base."""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    sanitized = codigo.replace('/', '_').replace('\\', '_')
-    tmp_path = os.path.join(OUTPUT_DIR, f"{sanitized}_temp")
-    
+    """
+    Genera el código de barras base directamente en memoria (sin archivos
+    temporales), así que etiquetas del mismo código pueden generarse en
+    paralelo.
+    """
     writer = ImageWriter()
     writer.dpi = 600
     writer.module_width = 0.30
     writer.write_text = False
     writer.quiet_zone = 1
 
-    Code128(codigo, writer=writer).save(tmp_path)
-
-    img = Image.open(tmp_path + ".png").convert("RGB")
-    os.remove(tmp_path + ".png")
-    return img
+    # render() retorna la imagen PIL que save() escribiría como PNG
+    return Code128(codigo, writer=writer).render().convert("RGB")
 
 
 def _resize_barcode(img):
@@ -121,16 +166,14 @@ def _resize_barcode(img):
 
 def _draw_centered_text(draw, text, y, font):
     """Dibuja texto centrado y retorna la siguiente posición Y."""
-    text_w = draw.textlength(text, font=font)
+    text_w = _text_length(text, font)
     draw.text(((TARGET_WIDTH - text_w) / 2, y), text, fill="black", font=font)
     return y + int(font.size * 1.2)
 
 
-def _add_logo(canvas_img, logo_path: str):
-    """Añade el logo en la esquina inferior izquierda."""
-    if not os.path.exists(logo_path):
-        return
-
+@functools.lru_cache(maxsize=8)
+def _scaled_logo(logo_path: str):
+    """Logo en RGBA redimensionado al tamaño de la etiqueta (una vez por proceso)."""
     logo = Image.open(logo_path).convert("RGBA")
 
     max_w = int(TARGET_WIDTH * LOGO_RATIO_W)
@@ -142,23 +185,74 @@ def _add_logo(canvas_img, logo_path: str):
     new_w = int(w * scale)
     new_h = int(h * scale)
 
-    logo = logo.resize((new_w, new_h), Image.Resampling.LANCZOS)
+    return logo.resize((new_w, new_h), Image.Resampling.LANCZOS)
 
-    x = int(TARGET_WIDTH * 0.05)
-    y = int(TARGET_HEIGHT * 0.9) - logo.height
 
-    canvas_img.paste(logo, (x, y), logo)
+def _logo_position(logo):
+    """Esquina superior izquierda del logo (abajo a la izquierda de la etiqueta)."""
+    return int(TARGET_WIDTH * 0.05), int(TARGET_HEIGHT * 0.9) - logo.height
 
 
-def _generate_separator_image(office_name: str):
-    """Genera imagen separadora para cambio de oficina."""
+@functools.lru_cache(maxsize=1)
+def _separator_base():
+    """Canvas del separador con su borde grueso, compuesto una sola vez."""
     img, draw = _create_canvas()
-    
+
     draw.rectangle(
         [MARGIN, MARGIN, TARGET_WIDTH - MARGIN, TARGET_HEIGHT - MARGIN], 
         outline="black", 
         width=10
     )
+    return img
+
+
+def _png_bytes(img, dpi=DPI):
+    """Codifica la imagen como PNG en memoria."""
+    buffer = BytesIO()
+    img.save(buffer, format="PNG", dpi=(dpi, dpi))
+    return buffer.getvalue()
+
+
+# Umbral de gris -> blanco y negro: texto y barras quedan sin bordes ruidosos
+_BILEVEL_LUT = [0] * 128 + [255] * 128
+
+
+def _apply_profile(img, profile, logo_box=None):
+    """
+    Etiqueta convertida al perfil de salida (ver RENDER_PROFILES).
+
+    En "bilevel" todo se umbraliza salvo el logo, que se trama
+    (Floyd-Steinberg) para conservar sus colores como grises.
+    """
+    if profile == "bilevel":
+        bilevel = img.convert("L").point(_BILEVEL_LUT, "1")
+        if logo_box:
+            bilevel.paste(img.crop(logo_box).convert("1"), logo_box[:2])
+        return bilevel
+    if profile == "draft":
+        return img.reduce(DPI // DRAFT_DPI)
+    return img
+
+
+def _profile_png(img, profile, logo_box=None):
+    """PNG de la etiqueta en el perfil pedido (1 bit por píxel en "bilevel")."""
+    return _png_bytes(_apply_profile(img, profile, logo_box), DRAFT_DPI if profile == "draft" else DPI)
+
+
+def _png_reader(img):
+    """Codifica la imagen como PNG en memoria para reportlab."""
+    return ImageReader(BytesIO(_png_bytes(img)))
+
+
+def _generate_separator_image(office_name: str):
+    """Genera imagen separadora para cambio de oficina."""
+    return _png_reader(_render_separator(office_name))
+
+
+def _render_separator(office_name: str):
+    """Separador de oficina como imagen PIL."""
+    img = _separator_base().copy()
+    draw = ImageDraw.Draw(img)
     
     font_office = get_font(size=35, bold=True)
     
@@ -170,11 +264,104 @@ def _generate_separator_image(office_name: str):
     y = start_y
     for line in lines:
         y = _draw_centered_text(draw, line, y, font_office)
-        
-    buffer = BytesIO()
-    img.save(buffer, format="PNG", dpi=(DPI, DPI))
-    buffer.seek(0)
-    return ImageReader(buffer)
+
+    return img
+
+
+class LabelTemplate:
+    """
+    Partes fijas de una etiqueta: borde redondeado, título, línea de
+    "ÁREA / OFICINA" y logo, compuestas una sola vez. Cada etiqueta copia
+    el fondo y solo dibuja sus partes variables (detalle, código de barras
+    y tipo de registro).
+
+    La línea de ÁREA se desplaza según las líneas del detalle (0 a 2), así
+    que hay un fondo por cada caso, creado la primera vez que se usa.
+    """
+
+    def __init__(self, title: str = "", logo_path: str = None):
+        self.title = title
+        self.logo_path = logo_path
+        self.logo = _scaled_logo(logo_path) if logo_path and os.path.exists(logo_path) else None
+        self.font_title = get_font(size=25)
+        self.font_detalle = get_font(size=23, bold=True)
+        self.font_oficina = get_font(size=18)
+        self.font_tipo = get_font(size=32, bold=True)
+        self._backgrounds = {}
+
+    def _background(self, detalle_lines: int):
+        """(imagen, y del detalle, y del código de barras) para `detalle_lines` líneas."""
+        background = self._backgrounds.get(detalle_lines)
+        if background is None:
+            img, draw = _create_canvas()
+
+            y = 20
+            if self.title:
+                y = _draw_centered_text(draw, self.title, y, self.font_title)
+            y_detalle = y
+            y += detalle_lines * int(self.font_detalle.size * 1.2)
+
+            y += 10
+            y = _draw_centered_text(
+                draw, "ÁREA / OFICINA: _______________________________________________", y, self.font_oficina)
+            y += 10
+
+            if self.logo:
+                img.paste(self.logo, _logo_position(self.logo), self.logo)
+
+            background = self._backgrounds[detalle_lines] = (img, y_detalle, y)
+        return background
+
+    def logo_box(self):
+        """Rectángulo (x0, y0, x1, y1) del logo, o None si no hay logo."""
+        if not self.logo:
+            return None
+        x, y = _logo_position(self.logo)
+        return (x, y, x + self.logo.width, y + self.logo.height)
+
+    def _covers_logo(self, box):
+        """True si el rectángulo `box` (x0, y0, x1, y1) se superpone al logo."""
+        x, y = _logo_position(self.logo)
+        return (box[0] < x + self.logo.width and x < box[2]
+                and box[1] < y + self.logo.height and y < box[3])
+
+    def render(self, codigo: str, detalle_bien: str = "", tipo_registro: str = ""):
+        """Etiqueta completa como imagen PIL."""
+        lines = []
+        if detalle_bien:
+            lines = wrap_text(None, detalle_bien, self.font_detalle, TARGET_WIDTH * 0.9)[:2]
+
+        background, y, y_barcode = self._background(len(lines))
+        canvas_img = background.copy()
+        draw = ImageDraw.Draw(canvas_img)
+
+        for line in lines:
+            y = _draw_centered_text(draw, line, y, self.font_detalle)
+
+        # Pegar barcode
+        barcode_img = _resize_barcode(_generate_base_barcode(codigo))
+        x = (TARGET_WIDTH - barcode_img.width) // 2
+        box = (x, y_barcode + 5, x + barcode_img.width, y_barcode + 5 + barcode_img.height)
+        canvas_img.paste(barcode_img, box[:2])
+
+        # El logo va encima del código de barras si este lo tapó
+        if self.logo and self._covers_logo(box):
+            canvas_img.paste(self.logo, _logo_position(self.logo), self.logo)
+
+        # Tipo de registro
+        if tipo_registro:
+            text_w = _text_length(tipo_registro, self.font_tipo)
+            x_tipo = TARGET_WIDTH - text_w - 30
+            y_tipo = TARGET_HEIGHT - self.font_tipo.size - 30
+            draw.text((x_tipo, y_tipo), tipo_registro, fill="black", font=self.font_tipo)
+
+        return canvas_img
+
+
+@functools.lru_cache(maxsize=16)
+def get_label_template(title: str = "", logo_path: str = None):
+    """Plantilla de etiqueta compartida por el proceso para (título, logo)."""
+    return LabelTemplate(title, logo_path)
 
 
 def generate_barcode(codigo: str, title: str = "", logo_path: str = None, 
@@ -194,73 +381,462 @@ def generate_barcode(codigo: str, title: str = "", logo_path: str = None,
     Returns:
         Ruta del archivo o ImageReader
     """
+    template = get_label_template(title, logo_path)
+
+    # Guardar o retornar
+    if not save_file:
+        png = _render_item(template, ("barcode", codigo, detalle_bien, tipo_registro))
+        return ImageReader(BytesIO(png))
+
+    canvas_img = template.render(codigo, detalle_bien, tipo_registro)
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    file_path = os.path.join(OUTPUT_DIR, f"{codigo}.png")
+    canvas_img.save(file_path, dpi=(DPI, DPI))
+    return file_path
+
+
+class VectorLabelRenderer:
+    """
+    Dibuja las etiquetas directamente con primitivas de reportlab, sin
+    rasterizar: barras del Code128 como rectángulos, borde con roundRect,
+    textos en Helvetica y el logo como imagen compartida.
+
+    Replica el diseño de LabelTemplate en su mismo sistema de coordenadas
+    (píxeles a 300 DPI, origen arriba a la izquierda) y lo escala al tamaño
+    de la celda. Las partes fijas (borde, título, línea de ÁREA y logo) se
+    definen una sola vez como Form XObjects del PDF y cada etiqueta solo las
+    referencia.
+    """
+
+    FONT = "Helvetica"
+    FONT_BOLD = "Helvetica-Bold"
+
+    def __init__(self, pdf, title: str = "", logo_path: str = None):
+        self.pdf = pdf
+        self.title = title
+        self.logo_path = logo_path if logo_path and os.path.exists(logo_path) else None
+        self.logo_size = _scaled_logo(self.logo_path).size if self.logo_path else None
+        self._forms = set()
+
+    # --- Coordenadas y texto ---------------------------------------------
+
+    @staticmethod
+    def _pdf_y(y):
+        """Y de la etiqueta (hacia abajo) -> Y de reportlab (hacia arriba)."""
+        return TARGET_HEIGHT - y
+
+    def _text_top(self, text, x, y, font, size):
+        """drawString con `y` en el borde superior del texto (como PIL)."""
+        self.pdf.setFont(font, size)
+        self.pdf.drawString(x, self._pdf_y(y + getAscent(font, size)), text)
+
+    def _centered_text(self, text, y, font, size):
+        """Texto centrado; retorna la siguiente posición Y (como _draw_centered_text)."""
+        self._text_top(text, (TARGET_WIDTH - stringWidth(text, font, size)) / 2, y, font, size)
+        return y + int(size * 1.2)
+
+    def _wrap(self, text, font, size, max_width):
+        return _wrap(text, max_width, lambda line: stringWidth(line, font, size))
+
+    def _border(self):
+        self.pdf.setLineWidth(BORDER_WIDTH)
+        self.pdf.roundRect(MARGIN, MARGIN, TARGET_WIDTH - 2 * MARGIN, TARGET_HEIGHT - 2 * MARGIN,
+                           BORDER_RADIUS, stroke=1, fill=0)
+
+    # --- Partes fijas como Form XObjects ---------------------------------
+
+    def _form(self, name, draw):
+        """Define el form `name` la primera vez que se usa y lo dibuja."""
+        if name not in self._forms:
+            self.pdf.beginForm(name, 0, 0, TARGET_WIDTH, TARGET_HEIGHT)
+            draw()
+            self.pdf.endForm()
+            self._forms.add(name)
+        self.pdf.doForm(name)
+
+    def _draw_logo(self):
+        x, y = _logo_position(_scaled_logo(self.logo_path))
+        w, h = self.logo_size
+        self.pdf.drawImage(self.logo_path, x, self._pdf_y(y + h), width=w, height=h, mask='auto')
+
+    def _background(self, detalle_lines):
+        """Fondo para `detalle_lines` líneas de detalle: (nombre del form, y del detalle, y del código)."""
+        y = 20
+        if self.title:
+            y += int(25 * 1.2)
+        y_detalle = y
+        y += detalle_lines * int(23 * 1.2) + 10
+        y_area = y
+        y += int(18 * 1.2) + 10
+
+        def draw():
+            self._border()
+            if self.title:
+                self._centered_text(self.title, 20, self.FONT, 25)
+            self._centered_text("ÁREA / OFICINA: _______________________________________________",
+                                y_area, self.FONT, 18)
+            if self.logo_path:
+                self._form("logo", self._draw_logo)
+
+        return f"fondo_{detalle_lines}", draw, y_detalle, y
+
+    # --- Código de barras ------------------------------------------------
+
+    def _barcode(self, codigo, y_top):
+        """Barras y texto legible del Code128, con el tamaño de _resize_barcode."""
+        modules = Code128(codigo).build()[0]
+        text_mm = BARCODE_FONT_PT * 25.4 / 72
+        width_mm = 2 * BARCODE_QUIET_ZONE_MM + len(modules) * BARCODE_MODULE_MM
+        height_mm = (2 * BARCODE_MARGIN_MM + BARCODE_HEIGHT_MM
+                     + text_mm / 2 + BARCODE_TEXT_DISTANCE_MM)
+
+        # Píxeles de etiqueta por mm: como thumbnail(), solo reduce
+        scale = min(BARCODE_RASTER_DPI / 25.4,
+                    int(TARGET_WIDTH * 0.95) / width_mm,
+                    int(TARGET_HEIGHT * 0.55) / height_mm)
+        x0 = (TARGET_WIDTH - width_mm * scale) / 2
+        bars_top = y_top + BARCODE_MARGIN_MM * scale
+        bars_height = BARCODE_HEIGHT_MM * scale
+
+        # Un rectángulo por cada racha de módulos negros
+        path = self.pdf.beginPath()
+        start = None
+        for i, module in enumerate(modules + "0"):
+            if module == "1" and start is None:
+                start = i
+            elif module != "1" and start is not None:
+                path.rect(x0 + (BARCODE_QUIET_ZONE_MM + start * BARCODE_MODULE_MM) * scale,
+                          self._pdf_y(bars_top + bars_height),
+                          (i - start) * BARCODE_MODULE_MM * scale, bars_height)
+                start = None
+        self.pdf.drawPath(path, stroke=0, fill=1)
+
+        # Texto legible centrado bajo las barras (ancla inferior, como ImageWriter)
+        size = text_mm * scale
+        text_bottom = bars_top + bars_height + BARCODE_TEXT_DISTANCE_MM * scale
+        self.pdf.setFont(self.FONT, size)
+        self.pdf.drawCentredString(TARGET_WIDTH / 2, self._pdf_y(text_bottom) - getDescent(self.FONT, size), codigo)
+
+    # --- Etiquetas -------------------------------------------------------
+
+    def _label(self, codigo, detalle_bien, tipo_registro):
+        lines = []
+        if detalle_bien:
+            lines = self._wrap(detalle_bien, self.FONT_BOLD, 23, TARGET_WIDTH * 0.9)[:2]
+
+        name, draw, y, y_barcode = self._background(len(lines))
+        self._form(name, draw)
 
-    # Canvas base
-    canvas_img, draw = _create_canvas()
+        for line in lines:
+            y = self._centered_text(line, y, self.FONT_BOLD, 23)
 
-    # Generar barcode
-    barcode_img = _resize_barcode(_generate_base_barcode(codigo))
+        self._barcode(codigo, y_barcode + 5)
 
-    # Fuentes
-    font_title = get_font(size=25)
-    font_detalle = get_font(size=23, bold=True)
-    font_oficina = get_font(size=18)
+        if tipo_registro:
+            text_w = stringWidth(tipo_registro, self.FONT_BOLD, 32)
+            self._text_top(tipo_registro, TARGET_WIDTH - text_w - 30, TARGET_HEIGHT - 32 - 30,
+                           self.FONT_BOLD, 32)
 
-    # Textos
-    y = 20
-    if title:
-        y = _draw_centered_text(draw, title, y, font_title)
+    def _separator(self, office_name):
+        def draw():
+            self._border()
+            self.pdf.setLineWidth(10)
+            self.pdf.rect(MARGIN, MARGIN, TARGET_WIDTH - 2 * MARGIN, TARGET_HEIGHT - 2 * MARGIN)
+        self._form("separador", draw)
 
-    if detalle_bien:
-        lines = wrap_text(draw, detalle_bien, font_detalle, TARGET_WIDTH * 0.9)[:2]
+        lines = self._wrap(f"ÁREA:\n{office_name}", self.FONT_BOLD, 35, TARGET_WIDTH * 0.8)
+        y = (TARGET_HEIGHT - len(lines) * 35 * 1.2) / 2
         for line in lines:
-            y = _draw_centered_text(draw, line, y, font_detalle)
+            y = self._centered_text(line, y, self.FONT_BOLD, 35)
+
+    def draw(self, item, x, y, width, height):
+        """Dibuja un item de _label_items en la celda (x, y, width, height) del PDF."""
+        self.pdf.saveState()
+        self.pdf.translate(x, y)
+        self.pdf.scale(width / TARGET_WIDTH, height / TARGET_HEIGHT)
+        self.pdf.setDash()
+        self.pdf.setStrokeColorRGB(0, 0, 0)
+        self.pdf.setFillColorRGB(0, 0, 0)
+        if item[0] == "separator":
+            self._separator(item[1])
+        else:
+            self._label(*item[1:])
+        self.pdf.restoreState()
+
+
+def _label_items(records):
+    """
+    Items a imprimir, en orden: ("separator", oficina) al cambiar de oficina
+    y ("barcode", codigo, detalle_bien, tipo_registro) por cada registro.
+    Generador: consume `records` a medida que se imprimen.
+    """
+    last_office = None
+
+    for record in records:
+        if len(record) == 4:
+            codigo, detalle_bien, tipo_registro, oficina = record
+        else:
+            codigo, detalle_bien, tipo_registro = record
+            oficina = "DESCONOCIDO"
 
-    y += 10
-    y = _draw_centered_text(
-        draw, "ÁREA / OFICINA: _______________________________________________", y, font_oficina)
-    y += 10
+        # Insertar separador si cambia la oficina
+        if last_office != oficina:
+            yield ("separator", oficina)
 
-    # Pegar barcode
-    x = (TARGET_WIDTH - barcode_img.width) // 2
-    canvas_img.paste(barcode_img, (x, y + 5))
+        yield ("barcode", codigo, detalle_bien, tipo_registro)
+        last_office = oficina
 
-    # Logo
-    if logo_path and os.path.exists(logo_path):
-        _add_logo(canvas_img, logo_path)
 
-    # Tipo de registro
-    if tipo_registro:
-        font_tipo = get_font(size=32, bold=True)
-        text_w = draw.textlength(tipo_registro, font=font_tipo)
-        x_tipo = TARGET_WIDTH - text_w - 30
-        y_tipo = TARGET_HEIGHT - font_tipo.size - 30
-        draw.text((x_tipo, y_tipo), tipo_registro, fill="black", font=font_tipo)
+label_cache = DiskCache(**LABEL_CACHE_CONFIG)
 
-    # Guardar o retornar
-    if not save_file:
-        buffer = BytesIO()
-        canvas_img.save(buffer, format="PNG", dpi=(DPI, DPI))
-        buffer.seek(0)
-        return ImageReader(buffer)
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    file_path = os.path.join(OUTPUT_DIR, f"{codigo}.png")
-    canvas_img.save(file_path, dpi=(DPI, DPI))
-    return file_path
+def _render_item(template, item, profile="standard"):
+    """
+    PNG de un item de _label_items en el perfil `profile`, desde el caché
+    de etiquetas si ya se renderizó antes con el mismo contenido y diseño.
+    """
+    key = DiskCache.key(LABEL_LAYOUT_VERSION, template.title, template.logo_path, profile, *item)
+    png = label_cache.get(key)
+    if png is not None:
+        return png
+
+    if item[0] == "separator":
+        png = _profile_png(_render_separator(item[1]), profile)
+    else:
+        _, codigo, detalle_bien, tipo_registro = item
+        img = template.render(codigo, detalle_bien=detalle_bien, tipo_registro=tipo_registro)
+        png = _profile_png(img, profile, template.logo_box())
+    label_cache.set(key, png)
+    return png
+
+
+def _render_chunk(items, title, logo_path, profile="standard"):
+    """Tarea del pool: renderiza un bloque de items con la plantilla del proceso."""
+    template = get_label_template(title, logo_path)
+    return [_render_item(template, item, profile) for item in items]
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    """
+    Pool de procesos de renderizado del proceso actual, creado al primer uso.
+
+    Usa 'spawn': los procesos no heredan los hilos ni las conexiones del
+    worker de gunicorn que los crea.
+    """
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                _executor_pid = pid
+    return _executor
+
+
+def _reset_executor(executor):
+    """
+    Descarta `executor` si se rompió (un proceso murió), para que el
+    próximo renderizado cree otro. Un pool sano se conserva: lo comparten
+    los hilos de las peticiones y de los trabajos del worker, y cerrarlo
+    cancelaría sus tareas en curso.
+    """
+    global _executor
+    if not getattr(executor, "_broken", False):
+        return
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    # Roto, sus tareas ya fallaron: no hay nada que cancelar
+    executor.shutdown(wait=False)
+
+
+def _chunks(items, chunk_size):
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _render_parallel(executor, chunks, pending, title, logo_path, workers, profile="standard"):
+    """
+    Reparte los bloques entre los procesos de `executor` y retorna los PNG en el
+    orden original. Mantiene a lo sumo 2 bloques por proceso en curso, para
+    no acumular en memoria el PDF renderizado.
+
+    Cada bloque entra en `pending` (del llamador) antes de enviarse al pool
+    y sale al entregar sus PNG: si el pool falla, `pending` tiene todos los
+    bloques tomados de `chunks` que aún no se entregaron.
+    """
+    for chunk in chunks:
+        task = [chunk, None]
+        pending.append(task)
+        task[1] = executor.submit(_render_chunk, chunk, title, logo_path, profile)
+        if len(pending) >= workers * 2:
+            pngs = pending[0][1].result()
+            pending.popleft()
+            yield pngs
+    while pending:
+        pngs = pending[0][1].result()
+        pending.popleft()
+        yield pngs
+
+
+def render_labels(items, title=LABEL_TITLE, logo_path=None, workers=None, profile="standard"):
+    """
+    PNG (bytes) de cada item de _label_items, en el mismo orden y en el
+    perfil `profile`. `items` puede ser cualquier iterable: se consume de
+    a bloques.
+
+    Con más de un worker (BARCODE_WORKERS; 0 = uno por CPU) se renderiza en
+    paralelo; si el pool no está disponible o falla, se continúa en serie
+    desde el primer item pendiente.
+    """
+    if workers is None:
+        workers = BARCODE_CONFIG['workers'] or os.cpu_count() or 1
+    chunk_size = max(1, BARCODE_CONFIG['chunk_size'])
+
+    items = iter(items)
+    if workers > 1:
+        # Un trabajo de un solo bloque no justifica el pool
+        first = list(itertools.islice(items, chunk_size + 1))
+        items = itertools.chain(first, items)
+        if len(first) > chunk_size:
+            chunks = _chunks(items, chunk_size)
+            pending = deque()
+            executor = None
+            try:
+                executor = _get_executor(workers)
+                for pngs in _render_parallel(executor, chunks, pending, title, logo_path, workers, profile):
+                    yield from pngs
+                return
+            except (OSError, BrokenProcessPool, CancelledError, RuntimeError) as e:
+                # CancelledError / RuntimeError: otro hilo cerró el pool compartido
+                print("⚠️ Renderizado en paralelo no disponible, se continúa en serie:", e)
+                if executor is not None:
+                    _reset_executor(executor)
+                items = itertools.chain.from_iterable(
+                    itertools.chain([chunk for chunk, _ in pending], chunks))
+
+    template = get_label_template(title, logo_path)
+    for item in items:
+        yield _render_item(template, item, profile)
+
+
+def _lookahead(items, distance):
+    """
+    (i, item, existe el item i + distance, existe el item i + 1), con i
+    desde 1, reteniendo a lo sumo `distance` items.
+    """
+    window = deque()
+    i = 0
+    for item in items:
+        window.append(item)
+        if len(window) > distance:
+            i += 1
+            yield i, window.popleft(), True, True
+    while window:
+        i += 1
+        item = window.popleft()
+        yield i, item, False, bool(window)
+
+
+class _RasterSheet:
+    """Hoja de etiquetas PNG escrita página por página (StreamingPDFWriter)."""
+
+    def __init__(self, fileobj, pagesize, label_width, label_height):
+        self.writer = StreamingPDFWriter(fileobj, pagesize)
+        self.label_width = label_width
+        self.label_height = label_height
+        self._start_page()
+
+    def _start_page(self):
+        # Líneas de corte grises y punteadas
+        self.ops = [b'0.6 0.6 0.6 RG 0.8 w [3 2] 0 d']
+        self.images = {}
+
+    def draw_label(self, png, x, y):
+        name = f'Im{len(self.images)}'
+        self.images[name] = self.writer.add_image(png)
+        self.ops.append(f'q {self.label_width:.2f} 0 0 {self.label_height:.2f} {x:.2f} {y:.2f} cm /{name} Do Q'.encode())
+
+    def line(self, x1, y1, x2, y2):
+        self.ops.append(f'{x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S'.encode())
+
+    def show_page(self):
+        self.writer.add_page(b'\n'.join(self.ops), self.images)
+        self._start_page()
+
+    def save(self):
+        self.show_page()
+        self.writer.close()
+
+
+class _VectorSheet:
+    """Hoja de etiquetas vectoriales (reportlab + VectorLabelRenderer)."""
+
+    def __init__(self, fileobj, pagesize, label_width, label_height, logo_path):
+        self.pdf = canvas.Canvas(fileobj, pagesize=pagesize)
+        self.vector = VectorLabelRenderer(self.pdf, LABEL_TITLE, logo_path)
+        self.label_width = label_width
+        self.label_height = label_height
+        self._start_page()
+
+    def _start_page(self):
+        # Configurar líneas de corte
+        self.pdf.setStrokeColorRGB(0.6, 0.6, 0.6)
+        self.pdf.setLineWidth(0.8)
+        self.pdf.setDash(3, 2)
+
+    def draw_label(self, item, x, y):
+        self.vector.draw(item, x, y, self.label_width, self.label_height)
+
+    def line(self, x1, y1, x2, y2):
+        self.pdf.line(x1, y1, x2, y2)
+
+    def show_page(self):
+        self.pdf.showPage()
+        self._start_page()
+
+    def save(self):
+        self.pdf.save()
 
 
 def generate_barcodes_pdf(records, output_filename="codigos_barras.pdf", 
-                          progress_callback=None, selected_office=""):
+                          progress_callback=None, selected_office="", workers=None,
+                          render_mode="raster", total=None, render_profile="standard"):
     """
     Genera un PDF con múltiples códigos de barras organizados en formato A4 landscape.
+
+    Todo el camino es un flujo: los registros se consumen a medida que se
+    imprimen (pueden venir de un cursor del servidor), las etiquetas se
+    renderizan de a bloques y cada página se escribe al archivo al
+    completarse, así que la memoria no depende del número de etiquetas.
     
     Args:
-        records: Lista de tuplas (codigo, detalle_bien, tipo_registro, oficina)
+        records: Iterable de tuplas (codigo, detalle_bien, tipo_registro, oficina),
+            ordenado por oficina
         output_filename: Nombre del archivo de salida
         progress_callback: Función callback(current, total) para progreso
         selected_office: Oficina seleccionada (para el nombre del archivo)
+        workers: Procesos de renderizado (por defecto BARCODE_WORKERS; 1 = en serie)
+        render_mode: "raster" (imagen PNG a 300 DPI por etiqueta) o "vector"
+            (dibujo directo con reportlab: PDF más liviano y nítido)
+        total: Etiquetas a imprimir, separadores incluidos, si se conoce de
+            antemano (para el progreso). Con una lista se calcula; si no,
+            el progreso informa total=None hasta la última etiqueta, que
+            siempre se informa como (i, i).
+        render_profile: En modo raster, "standard", "bilevel" (1 bit por
+            píxel: PNG ~12 veces más chico, para imprimir) o "draft"
+            (150 DPI, para vista previa). Ver RENDER_PROFILES.
     
     Returns:
         Ruta del archivo PDF generado
@@ -274,7 +850,51 @@ def generate_barcodes_pdf(records, output_filename="codigos_barras.pdf",
     
     output_pdf = os.path.join(output_dir, output_filename)
 
-    pdf = canvas.Canvas(output_pdf, pagesize=landscape(A4))
+    with open(output_pdf, "wb") as output:
+        for _ in _write_pdf(records, output, progress_callback, workers, render_mode, total, render_profile):
+            pass
+    return output_pdf
+
+
+def stream_barcodes_pdf(records, workers=None, render_mode="raster", total=None,
+                        render_profile="standard"):
+    """
+    Genera el PDF de etiquetas como un flujo de fragmentos de bytes, para
+    enviarlo en la respuesta HTTP a medida que se escriben las páginas.
+
+    Sin archivos con nombre: cada página pasa por un buffer temporal propio
+    (SpooledTemporaryFile, en memoria hasta BARCODE_SPOOL_MAX_MB y luego en
+    disco) que se vacía al enviarla y se borra al terminar, aunque el
+    cliente se desconecte. En modo "vector" reportlab escribe el documento
+    completo al final, así que el buffer lo contiene entero.
+
+    Args: los de generate_barcodes_pdf.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=BARCODE_CONFIG['spool_max_size']) as spool:
+        pages = _write_pdf(records, spool, None, workers, render_mode, total, render_profile)
+        try:
+            for _ in pages:
+                spool.seek(0)
+                while True:
+                    data = spool.read(SPOOL_READ_SIZE)
+                    if not data:
+                        break
+                    yield data
+                spool.seek(0)
+                spool.truncate()
+        finally:
+            # Cliente desconectado: cerrar también el flujo de registros
+            pages.close()
+
+
+def _write_pdf(records, output, progress_callback, workers, render_mode, total, render_profile):
+    """
+    Escribe el PDF de etiquetas en `output` (objeto con write). Generador:
+    cede el control después de cada página escrita y al terminar.
+    """
+    if total is None and isinstance(records, (list, tuple)):
+        total = sum(1 for _ in _label_items(records))
+
     page_width, page_height = landscape(A4)
 
     cm = 28.35
@@ -300,69 +920,42 @@ def generate_barcodes_pdf(records, output_filename="codigos_barras.pdf",
     y_start = page_height - PAGE_MARGIN_Y - label_height
     x, y = x_start, y_start
 
-    # Configurar líneas de corte
-    pdf.setStrokeColorRGB(0.6, 0.6, 0.6)
-    pdf.setLineWidth(0.8)
-    pdf.setDash(3, 2)
-
     # Procesar registros con separadores
-    processed_items = []
-    last_office = None
-    
-    for record in records:
-        if len(record) == 4:
-            codigo, detalle_bien, tipo_registro, oficina = record
-        else:
-            codigo, detalle_bien, tipo_registro = record
-            oficina = "DESCONOCIDO"
-
-        # Insertar separador si cambia la oficina
-        if last_office != oficina:
-            processed_items.append({"type": "separator", "office": oficina})
-        
-        processed_items.append({
-            "type": "barcode",
-            "codigo": codigo,
-            "detalle_bien": detalle_bien,
-            "tipo_registro": tipo_registro,
-            "oficina": oficina
-        })
-        last_office = oficina
+    processed_items = _label_items(records)
 
     # Logo path (ajustar según tu estructura)
-    logo_path = "utils/logo.png"
+    logo_path = LOGO_PATH
     if not os.path.exists(logo_path):
         logo_path = None
 
-    # Generar etiquetas
-    for i, item in enumerate(processed_items, 1):
-        if item["type"] == "separator":
-            img = _generate_separator_image(item["office"])
-        else:
-            img = generate_barcode(
-                item['codigo'],
-                title="INVENTARIO DRE HUÁNUCO - 2025",
-                detalle_bien=item['detalle_bien'],
-                logo_path=logo_path,
-                tipo_registro=item['tipo_registro']
-            )
-
+    if render_mode == "vector":
+        sheet = _VectorSheet(output, (page_width, page_height), label_width, label_height, logo_path)
+        labels = processed_items
+    else:
+        sheet = _RasterSheet(output, (page_width, page_height), label_width, label_height)
+        # Generar etiquetas (en paralelo si hay varios procesos disponibles)
+        labels = render_labels(processed_items, LABEL_TITLE, logo_path, workers, render_profile)
+
+    # Se mira `cols` etiquetas adelante: la línea de corte inferior solo
+    # se dibuja si hay una etiqueta debajo
+    for i, label, has_below, has_next in _lookahead(labels, cols):
         # Dibujar la etiqueta
-        pdf.drawImage(img, x, y, width=label_width, height=label_height)
+        sheet.draw_label(label, x, y)
 
         # Líneas de corte
         col_actual = (i - 1) % cols + 1
         if col_actual < cols:
             line_x = x + label_width + GAP_X / 2
-            pdf.line(line_x, y, line_x, y + label_height)
+            sheet.line(line_x, y, line_x, y + label_height)
 
         row_actual = ((i - 1) // cols) % rows + 1
-        if row_actual < rows and i + cols <= len(processed_items):
+        if row_actual < rows and has_below:
             line_y = y - GAP_Y / 2
-            pdf.line(x, line_y, x + label_width, line_y)
+            sheet.line(x, line_y, x + label_width, line_y)
 
         if progress_callback:
-            progress_callback(i, len(processed_items))
+            # La última etiqueta cierra el progreso aunque el total fuera estimado
+            progress_callback(i, total if has_next else i)
 
         # Avance
         x += label_width + GAP_X
@@ -373,12 +966,10 @@ def generate_barcodes_pdf(records, output_filename="codigos_barras.pdf",
             y -= label_height + GAP_Y
 
         # Nueva página
-        if i % (cols * rows) == 0 and i < len(processed_items):
-            pdf.showPage()
-            pdf.setStrokeColorRGB(0.6, 0.6, 0.6)
-            pdf.setLineWidth(0.8)
-            pdf.setDash(3, 2)
+        if i % (cols * rows) == 0 and has_next:
+            sheet.show_page()
+            yield
             x, y = x_start, page_height - PAGE_MARGIN_Y - label_height
 
-    pdf.save()
-    return output_pdf
+    sheet.save()
+    yield
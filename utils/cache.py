@@ -0,0 +1,301 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from config import CACHE_CONFIG
+
+
+class TTLCache:
+    """
+    Caché en memoria con expiración (TTL) y desalojo LRU por tamaño.
+
+    Las claves son tuplas cuyo primer elemento es el namespace, lo que
+    permite invalidar todas las entradas de un mismo listado a la vez.
+    Los valores se comparten entre peticiones: tratarlos como solo lectura.
+    """
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, namespace, field):
+        stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+        stats[field] += 1
+
+    def get(self, key):
+        """Retorna (True, valor) si hay una entrada vigente, si no (False, None)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self._count(key[0], "hits")
+                return True, entry[1]
+            if entry is not None:
+                del self._data[key]
+            self._count(key[0], "misses")
+            return False, None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, *namespaces):
+        with self._lock:
+            for key in [key for key in self._data if key[0] in namespaces]:
+                del self._data[key]
+            for namespace in namespaces:
+                self._count(namespace, "invalidations")
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "namespaces": {name: dict(values) for name, values in self._stats.items()}
+            }
+
+
+cache = TTLCache(**CACHE_CONFIG)
+
+
+def cached(namespace, ttl=None, version=None):
+    """
+    Decorador read-through: la primera llamada consulta la base de datos y
+    las siguientes (mismos argumentos) se sirven desde memoria hasta que
+    expire el TTL o se invalide el namespace.
+
+    invalidate() solo alcanza al worker que escribe. Con `version` (función
+    sin argumentos, p. ej. DataVersionModel.current) su resultado entra en
+    la clave: tras una escritura en cualquier worker la versión cambia y
+    las entradas anteriores dejan de usarse sin esperar el TTL.
+    """
+    def wrapper(func):
+        @functools.wraps(func)
+        def decorated(*args, **kwargs):
+            key = (namespace, args, tuple(sorted(kwargs.items())))
+            if version is not None:
+                key += (version(),)
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            cache.set(key, value, ttl)
+            return value
+        return decorated
+    return wrapper
+
+
+def invalidate(*namespaces):
+    """Hook para las rutas de escritura: descarta las entradas de esos namespaces."""
+    cache.invalidate(*namespaces)
+
+
+class DiskCache:
+    """
+    Caché en disco direccionado por contenido, compartido entre procesos
+    (workers de gunicorn y del pool de renderizado).
+
+    Cada entrada es un archivo cuyo nombre es el sha256 de la clave. Se
+    escribe en un temporal del mismo directorio y se publica con
+    os.replace, así que un lector nunca ve un archivo a medias. El orden
+    LRU es el mtime: cada acierto lo actualiza y, al superar `max_bytes`,
+    se borran los más antiguos hasta bajar al 90 %.
+    """
+
+    def __init__(self, directory, max_bytes, prune_every=200):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._bytes = None  # estimación local; None = aún no se recorrió el directorio
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(*parts):
+        """Clave estable (sha256) a partir de valores serializables a JSON."""
+        raw = json.dumps(parts, ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _count(self, field, amount=1):
+        with self._lock:
+            self._stats[field] += amount
+
+    def open_entry(self, key):
+        """
+        Archivo de la entrada abierto en modo binario, o None. Sigue siendo
+        legible aunque otro proceso la desaloje mientras se lee.
+        """
+        if not self.enabled:
+            return None
+        path = self.path(key)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self._count("misses")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count("hits")
+        return f
+
+    def get(self, key):
+        """Contenido de la entrada (bytes) o None."""
+        f = self.open_entry(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def _temp_file(self, key):
+        """(archivo, ruta) temporal junto a la entrada, para publicarlo con os.replace."""
+        directory = os.path.dirname(self.path(key))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        return os.fdopen(fd, 'wb'), tmp_path
+
+    def _written(self, size):
+        with self._lock:
+            self._stats["writes"] += 1
+            self._writes += 1
+            if self._bytes is not None:
+                self._bytes += size
+            due = self._bytes is None or self._bytes > self.max_bytes or self._writes >= self.prune_every
+        if due:
+            self.prune()
+
+    def set(self, key, data):
+        if not self.enabled:
+            return
+        try:
+            f, tmp_path = self._temp_file(key)
+            with f:
+                f.write(data)
+            os.replace(tmp_path, self.path(key))
+        except OSError as e:
+            print("⚠️ No se pudo escribir en el caché de disco:", e)
+            return
+        self._written(len(data))
+
+    def tee(self, key, chunks):
+        """
+        Reenvía los fragmentos de bytes de `chunks` y a la vez los guarda
+        como la entrada `key`. La entrada se publica solo si el flujo se
+        consume completo: uno interrumpido (cliente desconectado) se descarta.
+        """
+        if not self.enabled:
+            yield from chunks
+            return
+        try:
+            f, tmp_path = self._temp_file(key)
+        except OSError as e:
+            print("⚠️ No se pudo escribir en el caché de disco:", e)
+            yield from chunks
+            return
+
+        size = 0
+        try:
+            for chunk in chunks:
+                if f is not None:
+                    try:
+                        f.write(chunk)
+                        size += len(chunk)
+                    except OSError as e:
+                        print("⚠️ No se pudo escribir en el caché de disco:", e)
+                        f.close()
+                        f = None
+                yield chunk
+            if f is not None:
+                f.close()
+                f = None
+                try:
+                    os.replace(tmp_path, self.path(key))
+                    tmp_path = None
+                except OSError as e:
+                    print("⚠️ No se pudo escribir en el caché de disco:", e)
+                else:
+                    self._written(size)
+        finally:
+            if f is not None:
+                f.close()
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _entries(self):
+        """(mtime, tamaño, ruta) de cada entrada."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # otro proceso la desalojó
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def prune(self):
+        """Desaloja las entradas menos usadas si se supera el límite."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    evicted += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+        with self._lock:
+            self._bytes = total
+            self._writes = 0
+            self._stats["evictions"] += evicted
+        return evicted
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "directory": self.directory, "max_bytes": self.max_bytes,
+                    "bytes": self._bytes}
@@ -0,0 +1,234 @@
+"""
+Etiquetas como comandos para impresoras térmicas (ZPL de Zebra y EPL2).
+
+Mismo flujo de items que el PDF (ver barcode_generator._label_items): un
+separador al cambiar de oficina y una etiqueta por registro, del mismo
+tamaño (5.94 x 3 cm). La impresora dibuja texto, bordes y el código de
+barras con sus propias fuentes, así que cada etiqueta son unos cientos de
+bytes de texto en lugar de una imagen a 300 DPI.
+
+Las medidas se escriben en mm y se convierten a puntos según la
+resolución de la impresora (`dpmm`: 8 = 203 DPI, 12 = 300 DPI).
+"""
+import functools
+import os
+import textwrap
+
+from barcode import Code128
+from PIL import Image, ImageOps
+
+from config import BARCODE_CONFIG
+from utils.barcode_generator import (
+    HEIGHT_CM, LABEL_TITLE, LOGO_PATH, LOGO_RATIO_H, LOGO_RATIO_W, WIDTH_CM, _label_items
+)
+
+LABEL_FORMATS = ("zpl", "epl")
+
+LABEL_W_MM = WIDTH_CM * 10
+LABEL_H_MM = HEIGHT_CM * 10
+# Espacio entre etiquetas del rollo (EPL lo necesita en cada etiqueta)
+LABEL_GAP_MM = 3
+
+# El código de barras queda entre el logo y el margen derecho
+BARCODE_SIDE_MM = 17
+BARCODE_HEIGHT_MM = 8
+MAX_MODULE_DOTS = 3
+
+ZPL_LOGO_NAME = "R:DRELOGO.GRF"
+
+# Fuentes de EPL2 (ancho, alto en puntos, espacio incluido) por resolución
+EPL_FONTS = {
+    8: {1: (10, 12), 2: (12, 16), 3: (14, 20), 4: (16, 24)},
+    12: {1: (14, 20), 2: (18, 28), 3: (22, 36), 4: (26, 44)},
+}
+
+
+def _dots(mm, dpmm):
+    return int(round(mm * dpmm))
+
+
+def _barcode_modules(codigo):
+    """Ancho en módulos del Code128 (el mismo cálculo de subconjuntos que la imagen)."""
+    return len(Code128(codigo).build()[0])
+
+
+def _barcode_geometry(codigo, dpmm):
+    """(x, ancho de módulo) del código de barras centrado en la etiqueta."""
+    width = _dots(LABEL_W_MM, dpmm)
+    available = width - 2 * _dots(BARCODE_SIDE_MM, dpmm)
+    modules = _barcode_modules(codigo)
+    module = max(1, min(MAX_MODULE_DOTS, available // modules))
+    return max(0, (width - modules * module) // 2), module
+
+
+# --- ZPL -------------------------------------------------------------------
+
+def _zpl_hex(text):
+    """Dato para ^FH^FD: '^', '~' y '_' como hexadecimal."""
+    text = (text or "").replace("_", "_5F")
+    return text.replace("^", "_5E").replace("~", "_7E")
+
+
+def _zpl_text(text):
+    """
+    Texto para ^FH^FD dentro de ^FB: además, la barra invertida duplicada
+    (en ^FB '\\&' es salto de línea).
+    """
+    return _zpl_hex((text or "").replace("\\", "\\\\"))
+
+
+def _zpl_block(x, y, width, lines, align, size, *texts):
+    """
+    Bloque de texto (^FB) de `lines` líneas con la fuente escalable 0. Cada
+    texto empieza en una línea nueva; la impresora ajusta el resto.
+    """
+    text = "\\&".join(_zpl_text(text) for text in texts)
+    return f"^FO{x},{y}^FB{width},{lines},0,{align}^A0N,{size},{size}^FH^FD{text}^FS"
+
+
+@functools.lru_cache(maxsize=8)
+def _zpl_logo(logo_path, dpmm):
+    """
+    ~DG con el logo en 1 bit (tramado) para guardarlo una vez en la
+    impresora y repetirlo con ^XG. Retorna (comando, ancho, alto).
+    """
+    logo = Image.open(logo_path).convert("RGBA")
+    background = Image.new("RGBA", logo.size, "white")
+    logo = Image.alpha_composite(background, logo).convert("L")
+
+    max_w = _dots(LABEL_W_MM * LOGO_RATIO_W, dpmm)
+    max_h = _dots(LABEL_H_MM * LOGO_RATIO_H, dpmm)
+    scale = min(max_w / logo.width, max_h / logo.height)
+    logo = logo.resize((int(logo.width * scale), int(logo.height * scale)), Image.Resampling.LANCZOS)
+
+    # En ZPL un bit en 1 imprime: invertir antes de pasar a 1 bit deja el
+    # relleno de cada fila en blanco
+    bits = ImageOps.invert(logo).convert("1")
+    data = bits.tobytes()
+    row_bytes = (bits.width + 7) // 8
+    command = f"~DG{ZPL_LOGO_NAME},{len(data)},{row_bytes},{data.hex().upper()}\n"
+    return command, bits.width, bits.height
+
+
+def _zpl_label(item, title, logo, dpmm):
+    width, height = _dots(LABEL_W_MM, dpmm), _dots(LABEL_H_MM, dpmm)
+    d = functools.partial(_dots, dpmm=dpmm)
+    lines = ["^XA", "^CI28", f"^PW{width}", f"^LL{height}", "^LH0,0"]
+
+    if item[0] == "separator":
+        border = d(0.8)
+        lines.append(f"^FO{d(0.5)},{d(0.5)}^GB{width - 2 * d(0.5)},{height - 2 * d(0.5)},{border}^FS")
+        size = d(3)
+        lines.append(_zpl_block(d(3), (height - 3 * size) // 2, width - 2 * d(3), 3, "C", size,
+                                "ÁREA:", item[1]))
+    else:
+        _, codigo, detalle_bien, tipo_registro = item
+        lines.append(f"^FO{d(0.5)},{d(0.5)}^GB{width - 2 * d(0.5)},{height - 2 * d(0.5)},{d(0.25)},B,2^FS")
+        if title:
+            lines.append(_zpl_block(0, d(1.5), width, 1, "C", d(2.2), title))
+        if detalle_bien:
+            lines.append(_zpl_block(d(2.5), d(4), width - 2 * d(2.5), 2, "C", d(2.2), detalle_bien))
+        lines.append(_zpl_block(d(3), d(9.2), width, 1, "L", d(1.6), "ÁREA / OFICINA:"))
+        lines.append(f"^FO{d(19)},{d(10.6)}^GB{width - d(19) - d(3)},0,1^FS")
+
+        x, module = _barcode_geometry(codigo, dpmm)
+        lines.append(f"^FO{x},{d(11.5)}^BY{module},2^BCN,{d(BARCODE_HEIGHT_MM)},Y,N,N,A"
+                     f"^FH^FD{_zpl_hex(codigo)}^FS")
+
+        if logo:
+            _, _, logo_h = logo
+            lines.append(f"^FO{d(3)},{d(27) - logo_h}^XG{ZPL_LOGO_NAME},1,1^FS")
+        if tipo_registro:
+            size = d(3.2)
+            lines.append(_zpl_block(0, height - d(1.5) - size, width - d(3), 1, "R", size, tipo_registro))
+
+    lines.append("^XZ")
+    return "\n".join(lines) + "\n"
+
+
+# --- EPL2 ------------------------------------------------------------------
+
+def _epl_text(text):
+    return (text or "").replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _epl_centered(y, font, text, dpmm, width):
+    char_w, _ = EPL_FONTS[dpmm][font]
+    x = max(0, (width - len(text) * char_w) // 2)
+    return f'A{x},{y},0,{font},1,1,N,"{_epl_text(text)}"'
+
+
+def _epl_label(item, title, dpmm):
+    width, height = _dots(LABEL_W_MM, dpmm), _dots(LABEL_H_MM, dpmm)
+    d = functools.partial(_dots, dpmm=dpmm)
+    fonts = EPL_FONTS[dpmm]
+    lines = ["N", f"q{width}", f"Q{height},{d(LABEL_GAP_MM)}", "I8,A,001"]
+
+    if item[0] == "separator":
+        lines.append(f"X{d(0.5)},{d(0.5)},{d(0.8)},{width - d(0.5)},{height - d(0.5)}")
+        chars = (width - 2 * d(3)) // fonts[4][0]
+        text = ["ÁREA:"] + textwrap.wrap(item[1], chars)[:2]
+        line_h = fonts[4][1] + d(0.5)
+        y = (height - len(text) * line_h) // 2
+        for line in text:
+            lines.append(_epl_centered(y, 4, line, dpmm, width))
+            y += line_h
+    else:
+        _, codigo, detalle_bien, tipo_registro = item
+        lines.append(f"X{d(0.5)},{d(0.5)},{d(0.25)},{width - d(0.5)},{height - d(0.5)}")
+        if title:
+            lines.append(_epl_centered(d(1.5), 2, title, dpmm, width))
+        chars = (width - 2 * d(2.5)) // fonts[2][0]
+        y = d(4)
+        for line in textwrap.wrap(detalle_bien or "", chars)[:2]:
+            lines.append(_epl_centered(y, 2, line, dpmm, width))
+            y += fonts[2][1] + d(0.3)
+        area = "ÁREA / OFICINA:"
+        lines.append(f'A{d(3)},{d(9.2)},0,1,1,1,N,"{_epl_text(area)}"')
+        line_x = d(3) + len(area) * fonts[1][0] + d(1)
+        lines.append(f"LO{line_x},{d(10.6)},{width - line_x - d(3)},1")
+
+        # En Code128 el ancho de barra ancha no se usa, pero debe ser >= 2
+        x, module = _barcode_geometry(codigo, dpmm)
+        lines.append(f'B{x},{d(11.5)},0,1,{module},{module * 2},{d(BARCODE_HEIGHT_MM)},B,"{_epl_text(codigo)}"')
+
+        if tipo_registro:
+            char_w, char_h = fonts[4]
+            x = max(0, width - d(3) - len(tipo_registro) * char_w)
+            lines.append(f'A{x},{height - d(1.5) - char_h},0,4,1,1,N,"{_epl_text(tipo_registro)}"')
+
+    lines.append("P1")
+    return "\n".join(lines) + "\n"
+
+
+def generate_label_commands(records, label_format="zpl", title=LABEL_TITLE, logo_path=LOGO_PATH,
+                            dpmm=None):
+    """
+    Genera los comandos de impresora para `records` como un flujo de
+    fragmentos de bytes, una etiqueta por fragmento.
+
+    Args:
+        records: Iterable de tuplas (codigo, detalle_bien, tipo_registro, oficina),
+            ordenado por oficina
+        label_format: "zpl" (UTF-8, ^CI28) o "epl" (EPL2, Windows-1252)
+        title: Título superior de cada etiqueta
+        logo_path: Logo (solo ZPL: se envía una vez con ~DG y cada etiqueta
+            lo repite con ^XG); None para omitirlo
+        dpmm: Puntos por mm de la impresora (por defecto LABEL_PRINTER_DPMM)
+    """
+    if label_format not in LABEL_FORMATS:
+        raise ValueError(f"Formato de etiqueta no soportado: {label_format}")
+    dpmm = dpmm or BARCODE_CONFIG['printer_dpmm']
+    if label_format == "epl" and dpmm not in EPL_FONTS:
+        raise ValueError(f"EPL admite {', '.join(map(str, EPL_FONTS))} puntos por mm")
+
+    if label_format == "epl":
+        for item in _label_items(records):
+            yield _epl_label(item, title, dpmm).encode("cp1252", errors="replace")
+        return
+
+    logo = _zpl_logo(logo_path, dpmm) if logo_path and os.path.exists(logo_path) else None
+    if logo:
+        yield logo[0].encode("ascii")
+    for item in _label_items(records):
+        yield _zpl_label(item, title, logo, dpmm).encode("utf-8")
@@ -0,0 +1,78 @@
+import base64
+import json
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no es válido para este listado."""
+
+
+def encode_cursor(values):
+    """Codifica la clave de orden de la última fila como token opaco."""
+    raw = json.dumps(list(values), separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, types):
+    """
+    Decodifica un token generado por `encode_cursor`.
+
+    `types` es el tipo de cada valor de la clave de orden, p. ej.
+    (str, str, int). Retorna None para un cursor vacío (primera página) y
+    lanza InvalidCursorError si el token no tiene esos valores.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError("Cursor inválido") from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursorError("Cursor inválido")
+    for value, expected in zip(values, types):
+        # bool es subclase de int: true/false no son ids
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise InvalidCursorError("Cursor inválido")
+    return values
+
+
+def cursor_limit(per_page):
+    """LIMIT de una página por cursor: `per_page` + 1, para saber si hay más."""
+    if per_page is None or per_page <= 0:
+        raise InvalidCursorError("per_page debe ser mayor que 0")
+    return per_page + 1
+
+
+def keyset_condition(columns, values):
+    """
+    Construye la condición "fila posterior a `values`" para un orden
+    ascendente sobre `columns`:
+
+        c1 > v1 OR (c1 = v1 AND (c2 > v2 OR (c2 = v2 AND c3 > v3)))
+
+    Retorna (sql, params).
+    """
+    column, rest = columns[0], columns[1:]
+    value = values[0]
+    if not rest:
+        return f"{column} > %s", [value]
+
+    inner_sql, inner_params = keyset_condition(rest, values[1:])
+    sql = f"({column} > %s OR ({column} = %s AND {inner_sql}))"
+    return sql, [value, value] + inner_params
+
+
+def cursor_page(rows, per_page, key):
+    """
+    Recorta las `per_page + 1` filas leídas y arma la respuesta paginada.
+
+    `key` extrae de una fila los valores de la clave de orden.
+    """
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = encode_cursor(key(rows[-1])) if has_more and rows else None
+    return rows, {
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
@@ -0,0 +1,132 @@
+"""
+Escritor de PDF incremental para las hojas de etiquetas.
+
+reportlab (canvas.Canvas) conserva todo el documento en memoria hasta
+save(): con miles de etiquetas rasterizadas son cientos de MB. Este
+escritor envía cada imagen y cada página al archivo en cuanto están listas
+y solo retiene los offsets de la tabla xref (8 bytes por objeto), así que
+la memoria no depende del número de etiquetas.
+
+Las imágenes PNG (gris o RGB, sin entrelazado) se incrustan sin
+recodificar: sus bloques IDAT ya son un flujo Flate con predictores PNG,
+que el PDF admite tal cual (/DecodeParms << /Predictor 15 >>).
+"""
+import struct
+import zlib
+from array import array
+from io import BytesIO
+
+from PIL import Image
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Tipo de color PNG -> (espacio de color PDF, componentes)
+_PNG_COLOR_TYPES = {0: ('/DeviceGray', 1), 2: ('/DeviceRGB', 3)}
+
+
+def _png_image(png):
+    """
+    (diccionario, datos) del XObject de imagen para un PNG. Si el PNG no
+    se puede incrustar directamente (paleta, alfa, entrelazado) se
+    decodifica y se comprime de nuevo.
+    """
+    if png[:8] == PNG_SIGNATURE:
+        pos = 8
+        header, idat = None, []
+        while pos + 8 <= len(png):
+            length, kind = struct.unpack('>I4s', png[pos:pos + 8])
+            data = png[pos + 8:pos + 8 + length]
+            if kind == b'IHDR':
+                header = struct.unpack('>IIBBBBB', data)
+            elif kind == b'IDAT':
+                idat.append(data)
+            elif kind == b'IEND':
+                break
+            pos += 12 + length
+
+        if header is not None:
+            width, height, bits, color_type, _, _, interlace = header
+            if color_type in _PNG_COLOR_TYPES and not interlace and bits in (1, 8):
+                color_space, colors = _PNG_COLOR_TYPES[color_type]
+                params = (f'/DecodeParms << /Predictor 15 /Colors {colors} '
+                          f'/BitsPerComponent {bits} /Columns {width} >>')
+                return (f'/Width {width} /Height {height} /ColorSpace {color_space} '
+                        f'/BitsPerComponent {bits} /Filter /FlateDecode {params}'), b''.join(idat)
+
+    img = Image.open(BytesIO(png))
+    img = img.convert('L' if img.mode in ('1', 'L') else 'RGB')
+    color_space = '/DeviceGray' if img.mode == 'L' else '/DeviceRGB'
+    return (f'/Width {img.width} /Height {img.height} /ColorSpace {color_space} '
+            f'/BitsPerComponent 8 /Filter /FlateDecode'), zlib.compress(img.tobytes())
+
+
+class StreamingPDFWriter:
+    """
+    PDF escrito de forma incremental en `fileobj` (cualquier objeto con
+    write): add_image() por cada imagen, add_page() al completar cada
+    página y close() al final.
+    """
+
+    _CATALOG = 1
+    _PAGES = 2
+
+    def __init__(self, fileobj, pagesize):
+        self.fileobj = fileobj
+        self.width, self.height = pagesize
+        self._offset = 0
+        self._offsets = array('Q', [0, 0])  # catálogo y árbol de páginas se escriben al final
+        self._pages = array('L')
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _write(self, data):
+        self.fileobj.write(data)
+        self._offset += len(data)
+
+    def _object(self, body, stream=None, number=None):
+        """Escribe un objeto (con su stream opcional) y retorna su número."""
+        if number is None:
+            self._offsets.append(self._offset)
+            number = len(self._offsets)
+        else:
+            self._offsets[number - 1] = self._offset
+        self._write(f'{number} 0 obj\n'.encode())
+        if stream is None:
+            self._write(f'{body}\nendobj\n'.encode())
+        else:
+            self._write(f'<< {body} /Length {len(stream)} >>\nstream\n'.encode())
+            self._write(stream)
+            self._write(b'\nendstream\nendobj\n')
+        return number
+
+    def add_image(self, png):
+        """Incrusta una imagen PNG y retorna el número de su XObject."""
+        params, data = _png_image(png)
+        return self._object(f'/Type /XObject /Subtype /Image {params}', data)
+
+    def add_page(self, content, images):
+        """
+        Escribe una página con su contenido (operadores PDF) y las imágenes
+        que usa: {nombre: número de objeto}.
+        """
+        stream = zlib.compress(content)
+        content_number = self._object('/Filter /FlateDecode', stream)
+        xobjects = ' '.join(f'/{name} {number} 0 R' for name, number in images.items())
+        page = self._object(
+            f'<< /Type /Page /Parent {self._PAGES} 0 R '
+            f'/MediaBox [0 0 {self.width:.2f} {self.height:.2f}] '
+            f'/Resources << /XObject << {xobjects} >> >> '
+            f'/Contents {content_number} 0 R >>')
+        self._pages.append(page)
+
+    def close(self):
+        """Escribe el árbol de páginas, el catálogo, la tabla xref y el trailer."""
+        kids = ' '.join(f'{page} 0 R' for page in self._pages)
+        self._object(f'<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>', number=self._PAGES)
+        self._object(f'<< /Type /Catalog /Pages {self._PAGES} 0 R >>', number=self._CATALOG)
+
+        xref_offset = self._offset
+        self._write(f'xref\n0 {len(self._offsets) + 1}\n0000000000 65535 f \n'.encode())
+        for offset in self._offsets:
+            self._write(f'{offset:010d} 00000 n \n'.encode())
+        self._write(f'trailer\n<< /Size {len(self._offsets) + 1} /Root {self._CATALOG} 0 R >>\n'
+                    f'startxref\n{xref_offset}\n%%EOF\n'.encode())
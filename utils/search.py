@@ -0,0 +1,164 @@
+import re
+import unicodedata
+
+from database.backends import get_backend
+
+# Campos de `bienes` que alimentan `bien_busqueda.search_text`
+SEARCH_FIELDS = (
+    'codigo_completo',
+    'codigo_patrimonio',
+    'codigo_interno',
+    'detalle_bien',
+    'descripcion',
+    'marca',
+    'modelo',
+)
+
+# innodb_ft_min_token_size por defecto: InnoDB ignora términos más cortos,
+# que se buscan con LIKE (marcas como "HP" o "LG")
+FT_MIN_TOKEN = 3
+
+_NON_WORD = re.compile(r'[^0-9A-Z]+')
+
+
+def normalize(text):
+    """Mayúsculas, sin tildes ni signos: 'Cámara (Sony)' -> 'CAMARA SONY'."""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    folded = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD.sub(' ', folded.upper()).strip()
+
+
+def tokens(text):
+    return normalize(text).split()
+
+
+def build_search_text(bien):
+    """Texto normalizado que se guarda en `bien_busqueda.search_text`."""
+    seen = []
+    for field in SEARCH_FIELDS:
+        for token in tokens(bien.get(field)):
+            if token not in seen:
+                seen.append(token)
+    return ' '.join(seen)
+
+
+def boolean_query(term):
+    """
+    Convierte la búsqueda del usuario en una consulta FULLTEXT en modo
+    booleano: todas las palabras son obligatorias y se buscan por prefijo.
+
+    Retorna None si ninguna palabra alcanza FT_MIN_TOKEN caracteres.
+    """
+    words = search_words(term)
+    if not words:
+        return None
+    return ' '.join(f'+{word}*' for word in words)
+
+
+def search_words(term):
+    """Palabras del término que entran en FULLTEXT (al menos FT_MIN_TOKEN caracteres)."""
+    return [word for word in tokens(term) if len(word) >= FT_MIN_TOKEN]
+
+
+def short_words(term):
+    """Palabras del término más cortas que FT_MIN_TOKEN (solo por LIKE)."""
+    return [word for word in tokens(term) if len(word) < FT_MIN_TOKEN]
+
+
+def _like_conditions(column, words):
+    """
+    Condiciones equivalentes a `+palabra*`: cada palabra debe aparecer como
+    prefijo de alguna palabra de `column`. Las palabras ya vienen
+    normalizadas (solo letras y dígitos): no hay que escapar nada.
+    """
+    conditions = ' AND '.join(f"(UPPER({column}) LIKE %s OR UPPER({column}) LIKE %s)" for _ in words)
+    params = []
+    for word in words:
+        params.extend([f"{word}%", f"% {word}%"])
+    return conditions, params
+
+
+def _text_branch(column, table, term, fulltext):
+    """
+    Rama (sql, params) de búsqueda por palabras sobre `column`: FULLTEXT
+    para las palabras largas y LIKE para las cortas (o para todas, sin
+    FULLTEXT). None si el término no tiene palabras.
+    """
+    long_words, short = search_words(term), short_words(term)
+    if fulltext and long_words:
+        ft_query = boolean_query(term)
+        sql = f"""
+            SELECT bien_id, MATCH({column}) AGAINST (%s IN BOOLEAN MODE) AS score
+            FROM {table}
+            WHERE MATCH({column}) AGAINST (%s IN BOOLEAN MODE)
+        """
+        params = [ft_query, ft_query]
+        if short:
+            conditions, like_params = _like_conditions(column, short)
+            sql += f" AND {conditions}"
+            params.extend(like_params)
+        return sql, params
+
+    words = long_words + short
+    if not words:
+        return None
+    conditions, params = _like_conditions(column, words)
+    return f"SELECT bien_id, 1 AS score FROM {table} WHERE {conditions}", params
+
+
+def code_prefix(term):
+    """Patrón LIKE de prefijo para buscar por código (usa el índice)."""
+    code = (term or '').strip()
+    if not code or ' ' in code:
+        return None
+    escaped = code.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"{escaped}%"
+
+
+def search_subquery(term, include_location=False):
+    """
+    Subconsulta (bien_id, score) con los bienes que coinciden con `term`.
+
+    Cada rama usa su propio índice: FULLTEXT sobre `bien_busqueda`, prefijo
+    sobre `codigo_completo` y, opcionalmente, FULLTEXT sobre la ubicación
+    actual. Un código que coincide por prefijo se ordena primero. Las
+    palabras cortas para FULLTEXT se exigen con LIKE dentro de la misma
+    rama; si el término solo tiene palabras cortas, o el backend no tiene
+    FULLTEXT (SQLite), las ramas de texto usan LIKE por palabra.
+
+    Retorna (sql, params). Si el término no tiene nada buscable, la
+    subconsulta no devuelve filas.
+    """
+    backend = get_backend()
+    branches = []
+    params = []
+
+    tables = [('search_text', 'bien_busqueda')]
+    if include_location:
+        tables.append(('ubicacion_actual', 'bien_estado_actual'))
+    for column, table in tables:
+        branch = _text_branch(column, table, term, backend.SUPPORTS_FULLTEXT)
+        if branch:
+            branches.append(branch[0])
+            params.extend(branch[1])
+
+    prefix = code_prefix(term)
+    if prefix:
+        branches.append(f"""
+            SELECT id AS bien_id, 1000 AS score
+            FROM bienes
+            WHERE codigo_completo LIKE %s{backend.LIKE_ESCAPE}
+        """)
+        params.append(prefix)
+
+    if not branches:
+        return "SELECT bien_id, 0 AS score FROM bien_busqueda WHERE 1 = 0", []
+
+    sql = f"""
+        SELECT bien_id, MAX(score) AS score
+        FROM ({' UNION ALL '.join(branches)}) coincidencias
+        GROUP BY bien_id
+    """
+    return sql, params
@@ -0,0 +1,106 @@
+import functools
+import itertools
+import unicodedata
+from urllib.parse import quote
+
+from flask import Response, current_app, stream_with_context
+
+# Formatos aceptados en `?stream=`
+STREAM_FORMATS = {
+    '1': 'json',
+    'json': 'json',
+    'ndjson': 'ndjson',
+}
+
+# Bytes aproximados que se acumulan antes de enviar un fragmento
+_CHUNK_SIZE = 64 * 1024
+
+
+def parse_stream_format(value):
+    """'json' (arreglo), 'ndjson' (una fila por línea) o None si no se pidió streaming."""
+    return STREAM_FORMATS.get((value or '').strip().lower())
+
+
+def _chunks(pieces):
+    """Agrupa las piezas en fragmentos de ~_CHUNK_SIZE; la primera sale sola."""
+    pieces = iter(pieces)
+    first = next(pieces, None)
+    if first is not None:
+        yield first
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= _CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _json_array(rows, dumps):
+    yield '['
+    first = True
+    for row in rows:
+        yield dumps(row) if first else ',' + dumps(row)
+        first = False
+    yield ']\n'
+
+
+def _ndjson(rows, dumps):
+    for row in rows:
+        yield dumps(row) + '\n'
+
+
+def _prime(iterable):
+    """
+    Lee el primer elemento aquí: un error de conexión, de SQL o de
+    generación responde 500 en lugar de cortar un 200 ya iniciado.
+    """
+    iterator = iter(iterable)
+    first = next(iterator, None)
+    if first is None:
+        return iterator
+    return itertools.chain([first], iterator)
+
+
+def stream_rows(rows, fmt='json'):
+    """
+    Respuesta HTTP que serializa `rows` (un iterable, normalmente
+    `stream_query`) a medida que se envía, sin armar el JSON completo.
+
+    Usa el mismo serializador que `jsonify` (fechas, Decimal, ...), de modo
+    que el formato 'json' produce el mismo arreglo que antes.
+    """
+    rows = _prime(rows)
+
+    dumps = functools.partial(current_app.json.dumps, separators=(',', ':'))
+    if fmt == 'ndjson':
+        body, mimetype = _ndjson(rows, dumps), 'application/x-ndjson'
+    else:
+        body, mimetype = _json_array(rows, dumps), 'application/json'
+
+    response = Response(stream_with_context(_chunks(body)), mimetype=mimetype)
+    # Evitar que un proxy (nginx) acumule la respuesta antes de reenviarla
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def stream_download(chunks, download_name, mimetype='application/octet-stream'):
+    """
+    Descarga (attachment) cuyo contenido son los fragmentos de bytes de
+    `chunks`, enviados a medida que se producen: sin archivo intermedio.
+    """
+    response = Response(stream_with_context(_prime(chunks)), mimetype=mimetype)
+    try:
+        download_name.encode('ascii')
+        names = {'filename': download_name}
+    except UnicodeEncodeError:
+        # Como send_file: nombre ASCII aproximado y el original en filename*
+        ascii_name = unicodedata.normalize('NFKD', download_name).encode('ascii', 'ignore').decode('ascii')
+        names = {'filename': ascii_name, 'filename*': f"UTF-8''{quote(download_name, safe='')}"}
+    response.headers.set('Content-Disposition', 'attachment', **names)
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response